@@ -0,0 +1,51 @@
+"""Add unique constraint on members_companies (member_id, company_id)
+
+Revision ID: 3d9a7b2c6e10
+Revises: 8c1f2d3e4a5b
+Create Date: 2026-10-17 10:02:47.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9a7b2c6e10'
+down_revision: Union[str, Sequence[str], None] = '8c1f2d3e4a5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Remover vínculos duplicados (mantém o mais antigo) antes de criar o índice único
+    op.execute("""
+        DELETE FROM members_companies a
+        USING members_companies b
+        WHERE a.member_id = b.member_id
+          AND a.company_id = b.company_id
+          AND a.id > b.id
+    """)
+    # CREATE INDEX CONCURRENTLY não bloqueia escritas na tabela de vínculos, mas não pode rodar
+    # dentro de transação. Se o build falhar (ex.: vínculo repetido gravado durante a migration),
+    # o índice fica INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_members_companies_member_id_company_id',
+            'members_companies',
+            ['member_id', 'company_id'],
+            unique=True,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+    # Promove o índice a constraint única sem varrer a tabela de novo
+    op.execute(
+        "ALTER TABLE members_companies ADD CONSTRAINT uq_members_companies_member_id_company_id "
+        "UNIQUE USING INDEX uq_members_companies_member_id_company_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE members_companies DROP CONSTRAINT IF EXISTS uq_members_companies_member_id_company_id")
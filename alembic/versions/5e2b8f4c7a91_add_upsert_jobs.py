@@ -0,0 +1,49 @@
+"""Add upsert_jobs table for background populate-data jobs
+
+Revision ID: 5e2b8f4c7a91
+Revises: 3d9a7b2c6e10
+Create Date: 2026-10-17 13:20:11.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2b8f4c7a91'
+down_revision: Union[str, Sequence[str], None] = '3d9a7b2c6e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('upsert_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('status', sa.Enum('queued', 'running', 'completed', 'failed', name='upsertjobstatusenum'), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('total_chunks', sa.Integer(), nullable=False),
+        sa.Column('processed_chunks', sa.Integer(), nullable=False),
+        sa.Column('failed_chunks', sa.Integer(), nullable=False),
+        sa.Column('created_count', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('updated_count', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('errors', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('company_ids', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_upsert_jobs_status'), 'upsert_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_upsert_jobs_status'), table_name='upsert_jobs')
+    op.drop_table('upsert_jobs')
+    sa.Enum(name='upsertjobstatusenum').drop(op.get_bind(), checkfirst=True)
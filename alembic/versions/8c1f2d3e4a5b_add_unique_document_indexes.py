@@ -0,0 +1,149 @@
+"""Add unique indexes on member/company documents and market segmentation name
+
+Also adds a unique constraint on additional_infos.member_id (one-to-one with members).
+
+Revision ID: 8c1f2d3e4a5b
+Revises: 46a0acb9e67e
+Create Date: 2026-10-17 09:12:31.418207
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f2d3e4a5b'
+down_revision: Union[str, Sequence[str], None] = '46a0acb9e67e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# (tabela, coluna única, referências (tabela, FK) que passam a apontar para a linha mantida)
+UNIQUE_KEYS = [
+    ('market_segmentation', 'name', [('companies', 'market_segmentation_id')]),
+    ('companies', 'document', [('members_companies', 'company_id'), ('performance', 'company_id')]),
+    ('members', 'document', [
+        ('contact_channels', 'member_id'),
+        ('additional_infos', 'member_id'),
+        ('performance_events', 'member_id'),
+        ('members_companies', 'member_id'),
+    ]),
+]
+
+# Tabelas com no máximo uma linha por pai (relacionamento `uselist=False`) e as colunas
+# combinadas ao reduzir as linhas repetidas a uma
+ONE_PER_PARENT = {'additional_infos': ['hobby', 'role_duration', 'children_count']}
+
+# Placeholders gravados antes da normalização de CPF/CNPJ (ex.: valor padrão do Swagger)
+DOCUMENT_PLACEHOLDERS = "('', 'string', '0')"
+
+
+def _merge_duplicates(table: str, key: str, references) -> None:
+    """
+    Mantém a linha mais antiga (menor id) de cada valor repetido, repontando as referências
+    das duplicadas para ela, e remove as duplicadas.
+    """
+    bind = op.get_bind()
+    duplicates = f"""
+        SELECT id, keep_id FROM (
+            SELECT id, min(id) OVER (PARTITION BY {key}) AS keep_id FROM {table} WHERE {key} IS NOT NULL
+        ) ranked
+        WHERE id <> keep_id
+    """
+    groups = bind.execute(sa.text(f"""
+        SELECT {key} AS value, keep_id, array_agg(id ORDER BY id) AS ids
+        FROM ({duplicates}) d JOIN {table} t USING (id)
+        GROUP BY {key}, keep_id ORDER BY keep_id
+    """)).all()
+    for ref_table, column in references:
+        if ref_table in ONE_PER_PARENT:
+            _collapse_to_one_per_parent(ref_table, column, ONE_PER_PARENT[ref_table], duplicates)
+    if not groups:
+        return
+    for group in groups:
+        logger.warning("%s.%s = %r repetido: ids %s mesclados no id %s", table, key, group.value, group.ids, group.keep_id)
+
+    for ref_table, column in references:
+        bind.execute(sa.text(f"""
+            UPDATE {ref_table} r SET {column} = d.keep_id
+            FROM ({duplicates}) d
+            WHERE r.{column} = d.id
+        """))
+    bind.execute(sa.text(f"DELETE FROM {table} t USING ({duplicates}) d WHERE t.id = d.id"))
+
+
+def _collapse_to_one_per_parent(table: str, column: str, columns, duplicates: str) -> None:
+    """
+    Deixa uma linha de `table` por pai, considerando o pai que será mantido na mescla: fica a
+    linha do próprio pai mantido (ou a de menor id), completada com os valores não nulos das
+    demais, e as outras são removidas. Cobre também pais que já tinham várias linhas.
+    """
+    bind = op.get_bind()
+    ranked = f"""
+        SELECT r.id, coalesce(d.keep_id, r.{column}) AS parent_id,
+               row_number() OVER (
+                   PARTITION BY coalesce(d.keep_id, r.{column}) ORDER BY d.keep_id IS NOT NULL, r.id
+               ) AS position
+        FROM {table} r LEFT JOIN ({duplicates}) d ON d.id = r.{column}
+        WHERE r.{column} IS NOT NULL
+    """
+    merged_values = ", ".join(
+        f"(array_agg(t.{name} ORDER BY ranked.position) FILTER (WHERE t.{name} IS NOT NULL))[1] AS {name}"
+        for name in columns
+    )
+    bind.execute(sa.text(f"""
+        UPDATE {table} t SET {", ".join(f"{name} = merged.{name}" for name in columns)}
+        FROM ({ranked}) kept, (
+            SELECT ranked.parent_id, {merged_values}
+            FROM ({ranked}) ranked JOIN {table} t USING (id)
+            GROUP BY ranked.parent_id HAVING count(*) > 1
+        ) merged
+        WHERE t.id = kept.id AND kept.position = 1 AND kept.parent_id = merged.parent_id
+    """))
+    removed = bind.execute(sa.text(f"""
+        DELETE FROM {table} t USING ({ranked}) ranked WHERE t.id = ranked.id AND ranked.position > 1
+    """)).rowcount
+    if removed:
+        logger.warning("%s: %s linhas repetidas por %s combinadas em uma", table, removed, column)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Até aqui a unicidade era verificada só na aplicação (sujeita a corrida): antes de criar
+    # os índices, placeholders viram NULL e as linhas repetidas são mescladas na mais antiga.
+    # Vínculos members_companies repetidos pela mescla são removidos pela migration seguinte.
+    for table in ('members', 'companies'):
+        op.execute(f"UPDATE {table} SET document = NULL WHERE lower(btrim(document)) IN {DOCUMENT_PLACEHOLDERS}")
+        op.execute(f"UPDATE {table} SET document = btrim(document) WHERE document <> btrim(document)")
+    for table, key, references in UNIQUE_KEYS:
+        _merge_duplicates(table, key, references)
+
+    # Índices únicos usados como alvo do INSERT ... ON CONFLICT
+    # Documentos nulos continuam permitidos (NULL não conflita no PostgreSQL)
+    # CREATE INDEX CONCURRENTLY não bloqueia escritas, mas não pode rodar dentro de transação.
+    # Se um build concorrente falhar (ex.: duplicata gravada durante a migration), o índice fica
+    # INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        for table, key, _ in UNIQUE_KEYS:
+            op.create_index(op.f(f'ix_{table}_{key}'), table, [key], unique=True,
+                            if_not_exists=True, postgresql_concurrently=True)
+        # Uma linha de additional_infos por membro, garantida pelo banco
+        op.create_index('uq_additional_infos_member_id', 'additional_infos', ['member_id'], unique=True,
+                        if_not_exists=True, postgresql_concurrently=True)
+    op.execute(
+        "ALTER TABLE additional_infos ADD CONSTRAINT uq_additional_infos_member_id "
+        "UNIQUE USING INDEX uq_additional_infos_member_id"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE additional_infos DROP CONSTRAINT IF EXISTS uq_additional_infos_member_id")
+    with op.get_context().autocommit_block():
+        for table, key, _ in reversed(UNIQUE_KEYS):
+            op.drop_index(op.f(f'ix_{table}_{key}'), table_name=table, if_exists=True,
+                          postgresql_concurrently=True)
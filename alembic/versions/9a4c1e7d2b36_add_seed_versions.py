@@ -0,0 +1,33 @@
+"""Add seed_versions table for version-stamped seeds
+
+Revision ID: 9a4c1e7d2b36
+Revises: 5e2b8f4c7a91
+Create Date: 2026-10-17 13:41:37.618024
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4c1e7d2b36'
+down_revision: Union[str, Sequence[str], None] = '5e2b8f4c7a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('seed_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('applied_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('seed_versions')
@@ -0,0 +1,36 @@
+"""Add content hash to addresses for reuse of identical addresses
+
+Revision ID: a5d2e9c41f37
+Revises: f3b7d1c8e925
+Create Date: 2026-10-17 18:42:07.215904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d2e9c41f37'
+down_revision: Union[str, Sequence[str], None] = 'f3b7d1c8e925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Endereços já existentes ficam sem hash (NULL não conflita) e não são reutilizados
+    op.add_column('addresses', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    # Índice único usado como alvo do INSERT ... ON CONFLICT; CONCURRENTLY não bloqueia escritas
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_addresses_content_hash'), 'addresses', ['content_hash'], unique=True,
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_addresses_content_hash'), table_name='addresses', if_exists=True,
+                      postgresql_concurrently=True)
+    op.drop_column('addresses', 'content_hash')
@@ -0,0 +1,50 @@
+"""Add pg_trgm index on members.name and b-tree indexes on status/profile_id
+
+Revision ID: b7e3d5f1a2c4
+Revises: 9a4c1e7d2b36
+Create Date: 2026-10-17 13:58:02.774310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3d5f1a2c4'
+down_revision: Union[str, Sequence[str], None] = '9a4c1e7d2b36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # CREATE INDEX CONCURRENTLY não bloqueia escritas em members, mas não pode rodar dentro de
+    # transação. Se um build concorrente falhar, o índice fica INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        # GIN com trigramas atende ILIKE 'prefixo%' e o operador de similaridade (%)
+        op.create_index(
+            'ix_members_name_trgm',
+            'members',
+            ['name'],
+            postgresql_using='gin',
+            postgresql_ops={'name': 'gin_trgm_ops'},
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(op.f('ix_members_status'), 'members', ['status'], unique=False,
+                        if_not_exists=True, postgresql_concurrently=True)
+        op.create_index(op.f('ix_members_profile_id'), 'members', ['profile_id'], unique=False,
+                        if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_members_profile_id'), table_name='members', if_exists=True,
+                      postgresql_concurrently=True)
+        op.drop_index(op.f('ix_members_status'), table_name='members', if_exists=True,
+                      postgresql_concurrently=True)
+        op.drop_index('ix_members_name_trgm', table_name='members', if_exists=True,
+                      postgresql_concurrently=True)
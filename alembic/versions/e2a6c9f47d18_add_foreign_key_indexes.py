@@ -0,0 +1,45 @@
+"""Add indexes on foreign keys used by relationship loads and joins
+
+Revision ID: e2a6c9f47d18
+Revises: b7e3d5f1a2c4
+Create Date: 2026-10-17 15:21:40.118027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c9f47d18'
+down_revision: Union[str, Sequence[str], None] = 'b7e3d5f1a2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nome, tabela, colunas). members.status/profile_id, members.document,
+# members_companies (member_id, company_id) e additional_infos.member_id (constraint única)
+# já são indexados por migrations anteriores.
+INDEXES = [
+    ('ix_companies_name', 'companies', ['name']),
+    ('ix_contact_channels_member_id', 'contact_channels', ['member_id']),
+    ('ix_members_companies_company_id', 'members_companies', ['company_id']),
+    ('ix_performance_company_id', 'performance', ['company_id']),
+    ('ix_performance_events_member_id_performance_id', 'performance_events', ['member_id', 'performance_id']),
+    ('ix_performance_events_performance_id', 'performance_events', ['performance_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CREATE INDEX CONCURRENTLY não bloqueia escritas, mas não pode rodar dentro de transação.
+    # Se um build concorrente falhar, o índice fica INVALID: remova-o antes de rodar de novo.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
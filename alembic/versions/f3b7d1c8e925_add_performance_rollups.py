@@ -0,0 +1,68 @@
+"""Add performance_rollups summary table for analytics rollups
+
+Revision ID: f3b7d1c8e925
+Revises: e2a6c9f47d18
+Create Date: 2026-10-17 16:05:12.402318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d1c8e925'
+down_revision: Union[str, Sequence[str], None] = 'e2a6c9f47d18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('performance_rollups',
+        sa.Column('dimension', sa.Enum('member', 'company', name='performancerollupdimensionenum'), nullable=False),
+        sa.Column('grain', sa.Enum('day', 'month', name='performancerollupgrainenum'), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('count_closed_deals', sa.BigInteger(), nullable=False),
+        sa.Column('value_closed_deals', sa.BigInteger(), nullable=False),
+        sa.Column('referrals', sa.BigInteger(), nullable=False),
+        sa.Column('value_referrals', sa.BigInteger(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('dimension', 'grain', 'period_start', 'entity_id')
+    )
+    op.create_index(
+        'ix_performance_rollups_entity',
+        'performance_rollups',
+        ['dimension', 'entity_id', 'grain', 'period_start'],
+        unique=False
+    )
+    # A atualização incremental lê apenas os eventos recentes; o ranking por segmentação filtra empresas
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f('ix_performance_events_created_at'),
+            'performance_events',
+            ['created_at'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            op.f('ix_companies_market_segmentation_id'),
+            'companies',
+            ['market_segmentation_id'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_companies_market_segmentation_id'), table_name='companies')
+    op.drop_index(op.f('ix_performance_events_created_at'), table_name='performance_events')
+    op.drop_index('ix_performance_rollups_entity', table_name='performance_rollups')
+    op.drop_table('performance_rollups')
+    sa.Enum(name='performancerollupgrainenum').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='performancerollupdimensionenum').drop(op.get_bind(), checkfirst=True)
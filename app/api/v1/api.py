@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import members
+from app.api.v1.endpoints import members, performance
 
 api_router = APIRouter()
 
@@ -7,3 +7,8 @@ api_router.include_router(
     members.router,
     prefix="/members"
 )
+
+api_router.include_router(
+    performance.router,
+    prefix="/performance"
+)
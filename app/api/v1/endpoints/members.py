@@ -1,20 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.database import get_db
 from app.controllers.member_controller import MemberController
+from app.services.member_count_service import CountModeEnum
+from app.services.member_export_service import ExportFormatEnum
+from app.services.member_import_service import ImportEntityEnum
+from app.services.upsert_normalizer import MergePolicyEnum
+from app.core.config import settings
+from app.models.member import MemberStatusEnum
 from app.dto.member_dto import (
     MemberResponseDTO,
-    MemberListResponseDTO
+    MemberListResponseDTO,
+    MemberCompleteResponseDTO,
+    MemberCompleteListResponseDTO,
+    MemberSearchDTO,
+    MemberSearchResponseDTO,
+    NameMatchEnum
 )
 from app.dto.upsert_data_dto import (
     UpsertDataRequestDTO,
-    UpsertDataResponseDTO
+    UpsertDataResponseDTO,
+    ImportResponseDTO,
+    UpsertJobCreateResponseDTO,
+    UpsertJobStatusDTO
 )
 from app.dto.market_segmentation_dto import (
     MarketSegmentationCreateRequestDTO,
     MarketSegmentationCreateResponseDTO
 )
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 router = APIRouter()
 
@@ -22,41 +37,150 @@ router = APIRouter()
 @router.put("/populate-data", response_model=UpsertDataResponseDTO, tags=["Data Management"])
 async def upsert_data(
     request_data: UpsertDataRequestDTO,
-    db: Session = Depends(get_db)
+    merge_policy: Optional[MergePolicyEnum] = Query(None, description="Como combinar membros/empresas repetidos no payload: last_wins, first_wins ou coalesce (padrão em Settings)"),
+    db: AsyncSession = Depends(get_db)
 ) -> UpsertDataResponseDTO:
     """
     Endpoint para criar ou atualizar dados do sistema.
     Suporta upsert de: profiles, market_segmentations, companies, members, performances.
-    Campos únicos duplicados são ignorados.
+    Membros com o mesmo CPF e empresas com o mesmo CNPJ (ou nome, sem CNPJ) são combinados
+    em um único registro antes da gravação; as duplicatas são reportadas em `errors`.
     """
     controller = MemberController(db)
-    return await controller.upsert_data(request_data)
+    return await controller.upsert_data(request_data, merge_policy)
 
 
-@router.get("/", response_model=MemberListResponseDTO, tags=["Members"])
+@router.post("/populate-data/jobs", response_model=UpsertJobCreateResponseDTO, status_code=202, tags=["Data Management"])
+async def create_upsert_job(
+    request_data: UpsertDataRequestDTO,
+    chunk_size: Optional[int] = Query(None, ge=1, le=50000, description="Registros por chunk (padrão em Settings)"),
+    db: AsyncSession = Depends(get_db)
+) -> UpsertJobCreateResponseDTO:
+    """
+    Versão assíncrona do populate-data para payloads grandes.
+    Retorna o ID do job imediatamente; os workers processam o payload em chunks.
+    Acompanhe o progresso em `status_url`.
+    """
+    controller = MemberController(db)
+    return await controller.create_upsert_job(request_data, chunk_size)
+
+
+@router.get("/populate-data/jobs/{job_id}", response_model=UpsertJobStatusDTO, tags=["Data Management"])
+async def get_upsert_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db)
+) -> UpsertJobStatusDTO:
+    """
+    Retorna o status, progresso, contadores e erros de um job do populate-data.
+    """
+    controller = MemberController(db)
+    return await controller.get_upsert_job(job_id)
+
+
+@router.post("/import", response_model=ImportResponseDTO, tags=["Data Management"])
+async def import_ndjson(
+    request: Request,
+    entity: ImportEntityEnum = Query(..., description="Tipo dos registros do arquivo: members ou companies"),
+    chunk_size: int = Query(settings.import_chunk_size, ge=1, le=50000, description="Linhas aplicadas por transação")
+) -> ImportResponseDTO:
+    """
+    Importa um arquivo NDJSON (um MemberUpsertDTO ou CompanyUpsertDTO por linha) em streaming.
+    Cada chunk é gravado em sua própria transação curta; a resposta traz os totais e as
+    primeiras mensagens de erro. Linhas inválidas são reportadas e não interrompem a importação.
+    """
+    return await MemberController.import_ndjson(request.stream(), entity, chunk_size)
+
+
+@router.get("/", response_model=MemberListResponseDTO, responses={304: {"description": "Página não modificada"}}, tags=["Members"])
 async def list_members(
     skip: int = Query(0, ge=0, description="Número de registros para pular"),
     limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
-    db: Session = Depends(get_db)
-) -> MemberListResponseDTO:
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (next_cursor); quando informado, skip é ignorado"),
+    count_mode: Optional[CountModeEnum] = Query(None, description="Estratégia do total: exact, cached ou estimated (padrão em Settings)"),
+    if_none_match: Optional[str] = Header(None, description="ETag de uma resposta anterior; retorna 304 se a página não mudou"),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Lista todos os membros com paginação.
+    Use `next_cursor` da resposta no parâmetro `cursor` para paginação por keyset,
+    cujo custo não cresce com a profundidade da página.
+    Responde com `ETag`; reenvie-o em `If-None-Match` para receber `304 Not Modified` quando nada mudou.
+    """
+    controller = MemberController(db)
+    return await controller.list_members(skip, limit, cursor, count_mode, if_none_match)
+
+
+@router.get("/search", response_model=MemberSearchResponseDTO, tags=["Members"])
+async def search_members(
+    name: Optional[str] = Query(None, description="Termo de busca no nome"),
+    match: NameMatchEnum = Query(NameMatchEnum.prefix, description="prefix (nome começa com o termo) ou fuzzy (similaridade, ordenado por relevância)"),
+    status: Optional[MemberStatusEnum] = Query(None, description="Filtrar por status"),
+    profile_id: Optional[int] = Query(None, description="Filtrar por perfil"),
+    limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (next_cursor)"),
+    db: AsyncSession = Depends(get_db)
+) -> MemberSearchResponseDTO:
+    """
+    Busca membros por nome (índice de trigramas) combinada com filtros de status e perfil.
+    A paginação é por cursor (keyset); use `next_cursor` da resposta para a próxima página.
+    """
+    controller = MemberController(db)
+    search = MemberSearchDTO(name=name, match=match, status=status, profile_id=profile_id, limit=limit)
+    return await controller.search_members(search, cursor)
+
+
+@router.get("/export", response_class=StreamingResponse, tags=["Members"])
+async def export_members(
+    export_format: ExportFormatEnum = Query(ExportFormatEnum.ndjson, alias="format", description="Formato: ndjson ou csv"),
+    status: Optional[MemberStatusEnum] = Query(None, description="Filtrar por status"),
+    profile_id: Optional[int] = Query(None, description="Filtrar por perfil")
+) -> StreamingResponse:
+    """
+    Exporta todos os membros em streaming (NDJSON ou CSV), lendo por cursor no servidor.
+    O uso de memória não cresce com o tamanho da base.
+    """
+    return MemberController.export_members(export_format, status, profile_id)
+
+
+@router.get("/complete", response_model=MemberCompleteListResponseDTO, tags=["Members"])
+async def get_complete_members(
+    ids: str = Query(..., description="IDs dos membros separados por vírgula (ex.: 1,2,3)"),
+    db: AsyncSession = Depends(get_db)
+) -> MemberCompleteListResponseDTO:
+    """
+    Busca vários membros completos (endereço, perfil, contatos, informações adicionais,
+    empresas com segmentação e performance, eventos de performance) em número fixo de queries.
+    """
+    controller = MemberController(db)
+    return await controller.get_complete_members(ids)
+
+
+@router.get("/{member_id}/complete", response_model=MemberCompleteResponseDTO, tags=["Members"])
+async def get_complete_member(
+    member_id: int,
+    db: AsyncSession = Depends(get_db)
+) -> MemberCompleteResponseDTO:
+    """
+    Busca um membro pelo ID com todos os relacionamentos carregados.
     """
     controller = MemberController(db)
-    result = await controller.list_members(skip, limit)
-    return MemberListResponseDTO(**result)
+    return await controller.get_complete_member(member_id)
 
 
-@router.get("/{member_id}", response_model=MemberResponseDTO, tags=["Members"])
+@router.get("/{member_id}", response_model=MemberResponseDTO, responses={304: {"description": "Membro não modificado"}}, tags=["Members"])
 async def get_member(
     member_id: int,
-    db: Session = Depends(get_db)
-) -> MemberResponseDTO:
+    if_none_match: Optional[str] = Header(None, description="ETag de uma resposta anterior; retorna 304 se o membro não mudou"),
+    if_modified_since: Optional[str] = Header(None, description="Last-Modified de uma resposta anterior (ignorado com If-None-Match)"),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Busca um membro pelo ID.
+    Responde com `ETag` e `Last-Modified`; com `If-None-Match` ou `If-Modified-Since`
+    retorna `304 Not Modified` quando o membro não mudou.
     """
     controller = MemberController(db)
-    return await controller.get_member(member_id)
+    return await controller.get_member(member_id, if_none_match, if_modified_since)
 
 
  
@@ -65,7 +189,7 @@ async def get_member(
 @router.delete("/{member_id}", response_model=Dict[str, str], tags=["Members"])
 async def delete_member(
     member_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, str]:
     """
     Remove um membro.
@@ -79,7 +203,7 @@ async def delete_member(
 @router.post("/market-segmentations/bulk", response_model=MarketSegmentationCreateResponseDTO, tags=["Market Segmentations"])
 async def create_multiple_market_segmentations(
     request_data: MarketSegmentationCreateRequestDTO,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> MarketSegmentationCreateResponseDTO:
     """
     Cria múltiplas segmentações de mercado em lote.
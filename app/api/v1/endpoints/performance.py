@@ -0,0 +1,77 @@
+from datetime import date
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.db.database import get_db
+from app.controllers.performance_controller import PerformanceController
+from app.dto.performance_dto import (
+    RollupDimensionEnum,
+    RollupMetricEnum,
+    PerformanceRollupResponseDTO,
+    PerformanceRollupRefreshResponseDTO,
+    PerformanceEventBatchDTO,
+    PerformanceEventBatchResponseDTO,
+    PerformanceCounterReconcileResponseDTO
+)
+
+router = APIRouter()
+
+
+@router.post("/events", response_model=PerformanceEventBatchResponseDTO, tags=["Performance"])
+async def ingest_events(
+    batch: PerformanceEventBatchDTO,
+    db: AsyncSession = Depends(get_db)
+) -> PerformanceEventBatchResponseDTO:
+    """
+    Registra um lote de eventos de performance (referral e transaction), de até
+    PERFORMANCE_EVENT_BATCH_MAX_SIZE eventos, e soma os valores aos contadores das performances.
+    Eventos com performance ou membro inexistentes são rejeitados e listados em `errors`.
+    """
+    controller = PerformanceController(db)
+    return await controller.ingest_events(batch)
+
+
+@router.post("/counters/reconcile", response_model=PerformanceCounterReconcileResponseDTO, tags=["Performance"])
+async def reconcile_counters(
+    dry_run: bool = Query(False, description="Apenas reportar as divergências, sem corrigir"),
+    limit: int = Query(100, ge=0, le=10000, description="Máximo de divergências listadas na resposta"),
+    db: AsyncSession = Depends(get_db)
+) -> PerformanceCounterReconcileResponseDTO:
+    """
+    Recalcula os contadores das performances (negócios fechados e indicações recebidas) a partir de
+    performance_events e corrige os divergentes. Também roda periodicamente se
+    PERFORMANCE_COUNTER_RECONCILE_INTERVAL > 0.
+    """
+    controller = PerformanceController(db)
+    return await controller.reconcile_counters(dry_run, limit)
+
+
+@router.post("/rollups/refresh", response_model=PerformanceRollupRefreshResponseDTO, tags=["Performance"])
+async def refresh_rollups(
+    full: bool = Query(False, description="Reconstruir todos os totais em vez de apenas os dias recentes"),
+    db: AsyncSession = Depends(get_db)
+) -> PerformanceRollupRefreshResponseDTO:
+    """
+    Recalcula os totais de performance a partir de performance_events.
+    Também roda periodicamente (PERFORMANCE_ROLLUP_REFRESH_INTERVAL); leituras não são bloqueadas.
+    """
+    controller = PerformanceController(db)
+    return await controller.refresh_rollups(full)
+
+
+@router.get("/rollups/{dimension}", response_model=PerformanceRollupResponseDTO, tags=["Performance"])
+async def get_rollups(
+    dimension: RollupDimensionEnum,
+    start_date: Optional[date] = Query(None, description="Início do período (inclusivo, UTC)"),
+    end_date: Optional[date] = Query(None, description="Fim do período (inclusivo, UTC)"),
+    order_by: RollupMetricEnum = Query(RollupMetricEnum.value_closed_deals, description="Métrica da ordenação (decrescente)"),
+    limit: int = Query(100, ge=1, le=1000, description="Número máximo de registros"),
+    id: Optional[int] = Query(None, description="Restringir a um membro, empresa ou segmentação"),
+    db: AsyncSession = Depends(get_db)
+) -> PerformanceRollupResponseDTO:
+    """
+    Totais de negócios fechados e indicações por membro, empresa ou segmentação de mercado,
+    no período informado. Os dados vêm de totais diários e mensais pré-agregados, atualizados periodicamente.
+    """
+    controller = PerformanceController(db)
+    return await controller.get_rollups(dimension, start_date, end_date, order_by, limit, id)
@@ -1,11 +1,36 @@
-from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from typing import Dict, Any, List
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Any, AsyncIterator, List, Optional
 from app.services.member_service import MemberService
-from app.dto.member_dto import MemberResponseDTO, MemberCreateDTO, MemberUpdateDTO
+from app.services.member_count_service import CountModeEnum
+from app.services.member_import_service import MemberImportService, ImportEntityEnum
+from app.services.upsert_job_service import UpsertJobService, upsert_job_pool
+from app.services.upsert_normalizer import MergePolicyEnum
+from app.core.config import settings
+from app.services.member_export_service import MemberExportService, ExportFormatEnum, EXPORT_MEDIA_TYPES
+from app.db.database import AsyncSessionLocal
+from app.models.member import MemberStatusEnum
+from app.core.pagination import encode_cursor, decode_cursor, decode_score_cursor
+from app.core.http_cache import conditional_response, make_etag
+from app.core.serialization import dump_json
+from app.services.member_response_cache import MemberResponseCache
+from app.dto.member_dto import (
+    MemberResponseDTO,
+    MemberCreateDTO,
+    MemberUpdateDTO,
+    MemberCompleteResponseDTO,
+    MemberCompleteListResponseDTO,
+    MemberSearchDTO,
+    MemberSearchResponseDTO,
+    NameMatchEnum
+)
 from app.dto.upsert_data_dto import (
     UpsertDataRequestDTO,
-    UpsertDataResponseDTO
+    UpsertDataResponseDTO,
+    ImportResponseDTO,
+    UpsertJobCreateResponseDTO,
+    UpsertJobStatusDTO
 )
 from app.dto.market_segmentation_dto import (
     MarketSegmentationCreateDTO, 
@@ -20,8 +45,11 @@ from app.dto.market_segmentation_dto import (
 class MemberController:
     """Controller responsável por gerenciar as operações relacionadas aos membros."""
     
-    def __init__(self, db: Session):
+    MAX_COMPLETE_IDS = 200
+    
+    def __init__(self, db: AsyncSession):
         self.member_service = MemberService(db)
+        self.job_service = UpsertJobService(db)
     
     async def populate_data(self) -> Dict[str, Any]:
         """
@@ -42,14 +70,48 @@ class MemberController:
                 detail=f"Erro ao popular dados: {str(e)}"
             )
     
-    async def get_member(self, member_id: int) -> MemberResponseDTO:
-        """Busca um membro pelo ID."""
+    async def get_member(self, member_id: int, if_none_match: Optional[str] = None,
+                         if_modified_since: Optional[str] = None) -> Response:
+        """
+        Busca um membro pelo ID. O ETag e o Last-Modified vêm de `updated_at` (ou `created_at`);
+        se o cliente já tem a versão atual, responde 304 sem serializar o membro.
+        """
+        cache = MemberResponseCache()
+        key = ("member", member_id)
+        cached = cache.get(key)
+        if cached:
+            return conditional_response(*cached, if_none_match, if_modified_since)
+        
         try:
             member = await self.member_service.get_member_by_id(member_id)
             if not member:
                 raise HTTPException(status_code=404, detail="Membro não encontrado")
             
-            return MemberResponseDTO.from_orm(member)
+            last_modified = member.updated_at or member.created_at
+            etag = make_etag(member.id, last_modified)
+            not_modified = conditional_response(None, etag, last_modified, if_none_match, if_modified_since)
+            if not_modified:
+                return not_modified
+            
+            body = MemberResponseDTO.from_orm(member).model_dump_json().encode("utf-8")
+            cache.put(key, (body, etag, last_modified))
+            return conditional_response(body, etag, last_modified, None, None)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao buscar membro: {str(e)}"
+            )
+    
+    async def get_complete_member(self, member_id: int) -> MemberCompleteResponseDTO:
+        """Busca um membro pelo ID com endereço, perfil, contatos, empresas e performance."""
+        try:
+            member = await self.member_service.get_complete_member(member_id)
+            if not member:
+                raise HTTPException(status_code=404, detail="Membro não encontrado")
+            
+            return MemberCompleteResponseDTO.from_orm(member)
         except HTTPException:
             raise
         except Exception as e:
@@ -58,6 +120,32 @@ class MemberController:
                 detail=f"Erro ao buscar membro: {str(e)}"
             )
     
+    async def get_complete_members(self, ids: str) -> MemberCompleteListResponseDTO:
+        """Busca membros completos em lote a partir de IDs separados por vírgula."""
+        try:
+            member_ids = [int(member_id) for member_id in ids.split(",") if member_id.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="IDs inválidos: informe inteiros separados por vírgula")
+        
+        if not member_ids:
+            raise HTTPException(status_code=400, detail="Informe ao menos um ID")
+        if len(member_ids) > self.MAX_COMPLETE_IDS:
+            raise HTTPException(status_code=400, detail=f"Máximo de {self.MAX_COMPLETE_IDS} IDs por requisição")
+        
+        try:
+            members = await self.member_service.get_complete_members(member_ids)
+            found_ids = {member.id for member in members}
+            
+            return MemberCompleteListResponseDTO(
+                members=[MemberCompleteResponseDTO.from_orm(member) for member in members],
+                not_found=[member_id for member_id in dict.fromkeys(member_ids) if member_id not in found_ids]
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao buscar membros: {str(e)}"
+            )
+    
     async def create_member(self, member_data: MemberCreateDTO) -> MemberResponseDTO:
         """Cria um novo membro."""
         try:
@@ -101,30 +189,107 @@ class MemberController:
                 detail=f"Erro ao remover membro: {str(e)}"
             )
     
-    async def list_members(self, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
-        """Lista membros com paginação."""
+    async def list_members(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                           count_mode: Optional[CountModeEnum] = None,
+                           if_none_match: Optional[str] = None) -> Response:
+        """
+        Lista membros com paginação por offset ou por cursor (keyset).
+        O ETag combina o total, o cursor seguinte e a versão (`updated_at`) de cada membro da página.
+        """
         try:
-            members, total = await self.member_service.list_members(skip, limit)
+            after_id = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        skip = 0 if cursor else skip
+        cache = MemberResponseCache()
+        key = ("members", skip, limit, after_id, count_mode)
+        cached = cache.get(key)
+        if cached:
+            return conditional_response(*cached, if_none_match, None)
+        
+        try:
+            members, total, next_after_id, count_mode = await self.member_service.list_members(
+                skip, limit, after_id, count_mode
+            )
+            next_cursor = encode_cursor(next_after_id)
             
-            return {
-                "members": [MemberResponseDTO.from_orm(member) for member in members],
+            etag = make_etag(
+                total, next_cursor, count_mode.value,
+                *(f"{member.id}:{member.updated_at or member.created_at}" for member in members)
+            )
+            not_modified = conditional_response(None, etag, None, if_none_match, None)
+            if not_modified:
+                return not_modified
+            
+            # Linhas serializadas direto para JSON, no formato de MemberListResponseDTO, sem validação por membro
+            body = dump_json({
+                "members": [member._asdict() for member in members],
                 "total": total,
                 "skip": skip,
-                "limit": limit
-            }
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "count_mode": count_mode
+            })
+            cache.put(key, (body, etag, None))
+            return conditional_response(body, etag, None, None, None)
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Erro ao listar membros: {str(e)}"
             )
     
-    async def upsert_data(self, request_data: UpsertDataRequestDTO) -> UpsertDataResponseDTO:
+    async def search_members(self, search: MemberSearchDTO, cursor: Optional[str] = None) -> MemberSearchResponseDTO:
+        """Busca membros por nome e filtros com paginação por cursor."""
+        fuzzy = bool(search.name and search.name.strip()) and search.match == NameMatchEnum.fuzzy
+        try:
+            after_id, after_score = (None, None)
+            if cursor:
+                after_id, after_score = decode_score_cursor(cursor) if fuzzy else (decode_cursor(cursor), None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        try:
+            members, next_position = await self.member_service.search_members(search, after_id, after_score)
+            
+            return MemberSearchResponseDTO(
+                members=[MemberResponseDTO.from_orm(member) for member in members],
+                limit=search.limit,
+                match=search.match,
+                next_cursor=encode_cursor(*next_position) if next_position else None
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao buscar membros: {str(e)}"
+            )
+    
+    @staticmethod
+    def export_members(export_format: ExportFormatEnum, status: Optional[MemberStatusEnum] = None,
+                       profile_id: Optional[int] = None) -> StreamingResponse:
+        """
+        Exporta os membros em NDJSON ou CSV via streaming.
+        A sessão é aberta dentro do gerador para continuar válida enquanto a resposta é enviada.
+        """
+        async def content():
+            async with AsyncSessionLocal() as db:
+                async for chunk in MemberExportService(db).export(export_format, status, profile_id):
+                    yield chunk
+        
+        return StreamingResponse(
+            content(),
+            media_type=EXPORT_MEDIA_TYPES[export_format],
+            headers={"Content-Disposition": f'attachment; filename="members.{export_format.value}"'}
+        )
+    
+    async def upsert_data(self, request_data: UpsertDataRequestDTO,
+                          merge_policy: Optional[MergePolicyEnum] = None) -> UpsertDataResponseDTO:
         """
         Cria ou atualiza dados do sistema.
         Suporta upsert de todas as tabelas relacionadas.
         """
         try:
-            result = await self.member_service.upsert_data(request_data)
+            result = await self.member_service.upsert_data(request_data, merge_policy)
             
             return UpsertDataResponseDTO(
                 message="Dados processados com sucesso!",
@@ -141,12 +306,81 @@ class MemberController:
                 detail=f"Erro ao processar dados: {str(e)}"
             )
     
+    async def create_upsert_job(self, request_data: UpsertDataRequestDTO, chunk_size: Optional[int] = None) -> UpsertJobCreateResponseDTO:
+        """Enfileira o payload do populate-data como job e retorna o ID sem esperar o processamento."""
+        try:
+            job = await self.job_service.create_job(request_data, chunk_size)
+            upsert_job_pool.notify()
+            
+            return UpsertJobCreateResponseDTO(
+                job_id=job.id,
+                status=job.status.value,
+                total_chunks=job.total_chunks,
+                status_url=f"{settings.api_v1_str}/members/populate-data/jobs/{job.id}"
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao criar job: {str(e)}"
+            )
+    
+    async def get_upsert_job(self, job_id: str) -> UpsertJobStatusDTO:
+        """Retorna o progresso, os contadores e os erros de um job do populate-data."""
+        try:
+            job = await self.job_service.get_job(job_id)
+            if not job:
+                raise HTTPException(status_code=404, detail="Job não encontrado")
+            
+            return UpsertJobStatusDTO(
+                id=job.id,
+                status=job.status.value,
+                chunk_size=job.chunk_size,
+                total_chunks=job.total_chunks,
+                processed_chunks=job.processed_chunks,
+                failed_chunks=job.failed_chunks,
+                progress=job.processed_chunks / job.total_chunks if job.total_chunks else 1.0,
+                created_count=job.created_count,
+                updated_count=job.updated_count,
+                errors=job.errors,
+                created_at=job.created_at,
+                started_at=job.started_at,
+                finished_at=job.finished_at,
+                updated_at=job.updated_at
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao buscar job: {str(e)}"
+            )
+    
+    @staticmethod
+    async def import_ndjson(stream: AsyncIterator[bytes], entity: ImportEntityEnum, chunk_size: int) -> ImportResponseDTO:
+        """
+        Importa um corpo NDJSON de membros ou empresas em chunks transacionais.
+        Cada chunk abre sua própria sessão, sem prender uma conexão durante o upload.
+        """
+        try:
+            result = await MemberImportService(AsyncSessionLocal).import_ndjson(stream, entity, chunk_size)
+            
+            return ImportResponseDTO(
+                message="Importação concluída!" if not result["failed_chunks"] else "Importação concluída com falhas",
+                status="success" if not result["failed_chunks"] else "partial",
+                **result
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao importar dados: {str(e)}"
+            )
+    
     # ==================== MARKET SEGMENTATIONS ====================
     
     async def list_market_segmentations(self) -> MarketSegmentationListResponseDTO:
         """Lista todas as segmentações de mercado."""
         try:
-            segmentations = self.member_service.list_market_segmentations()
+            segmentations = await self.member_service.list_market_segmentations()
             
             return MarketSegmentationListResponseDTO(
                 message="Segmentações de mercado listadas com sucesso!",
@@ -163,7 +397,7 @@ class MemberController:
     async def get_market_segmentation(self, segmentation_id: int) -> MarketSegmentationResponseDTO:
         """Busca uma segmentação de mercado por ID."""
         try:
-            segmentation = self.member_service.get_market_segmentation(segmentation_id)
+            segmentation = await self.member_service.get_market_segmentation(segmentation_id)
             if not segmentation:
                 raise HTTPException(status_code=404, detail="Segmentação de mercado não encontrada")
             
@@ -179,7 +413,7 @@ class MemberController:
     async def create_market_segmentation(self, segmentation_data: MarketSegmentationCreateDTO) -> MarketSegmentationResponseDTO:
         """Cria uma nova segmentação de mercado."""
         try:
-            segmentation = self.member_service.create_market_segmentation(segmentation_data)
+            segmentation = await self.member_service.create_market_segmentation(segmentation_data)
             return MarketSegmentationResponseDTO.from_orm(segmentation)
         except ValueError as e:
             raise HTTPException(
@@ -195,7 +429,7 @@ class MemberController:
     async def create_multiple_market_segmentations(self, request_data: MarketSegmentationCreateRequestDTO) -> MarketSegmentationCreateResponseDTO:
         """Cria múltiplas segmentações de mercado."""
         try:
-            result = self.member_service.create_multiple_market_segmentations(request_data.market_segmentations)
+            result = await self.member_service.create_multiple_market_segmentations(request_data.market_segmentations)
             
             return MarketSegmentationCreateResponseDTO(
                 message="Segmentações de mercado processadas com sucesso!",
@@ -213,7 +447,7 @@ class MemberController:
     async def update_market_segmentation(self, segmentation_id: int, segmentation_data: MarketSegmentationUpdateDTO) -> MarketSegmentationResponseDTO:
         """Atualiza uma segmentação de mercado."""
         try:
-            segmentation = self.member_service.update_market_segmentation(segmentation_id, segmentation_data)
+            segmentation = await self.member_service.update_market_segmentation(segmentation_id, segmentation_data)
             if not segmentation:
                 raise HTTPException(status_code=404, detail="Segmentação de mercado não encontrada")
             
@@ -234,7 +468,7 @@ class MemberController:
     async def delete_market_segmentation(self, segmentation_id: int) -> Dict[str, str]:
         """Remove uma segmentação de mercado."""
         try:
-            success = self.member_service.delete_market_segmentation(segmentation_id)
+            success = await self.member_service.delete_market_segmentation(segmentation_id)
             if not success:
                 raise HTTPException(status_code=404, detail="Segmentação de mercado não encontrada")
             
@@ -0,0 +1,104 @@
+import time
+from datetime import date, datetime, timezone
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.config import settings
+from app.services.performance_counter_service import PerformanceCounterService
+from app.services.performance_event_service import PerformanceEventService
+from app.services.performance_rollup_service import PerformanceRollupService
+from app.dto.performance_dto import (
+    RollupDimensionEnum,
+    RollupMetricEnum,
+    PerformanceRollupItemDTO,
+    PerformanceRollupResponseDTO,
+    PerformanceRollupRefreshResponseDTO,
+    PerformanceEventBatchDTO,
+    PerformanceEventBatchResponseDTO,
+    PerformanceCounterDriftDTO,
+    PerformanceCounterReconcileResponseDTO
+)
+
+
+class PerformanceController:
+    """Controller responsável pelas consultas de performance de membros e empresas."""
+
+    def __init__(self, db: AsyncSession):
+        self.rollup_service = PerformanceRollupService(db)
+        self.event_service = PerformanceEventService(db)
+        self.counter_service = PerformanceCounterService(db)
+
+    async def get_rollups(self, dimension: RollupDimensionEnum, start_date: Optional[date], end_date: Optional[date],
+                          order_by: RollupMetricEnum, limit: int,
+                          entity_id: Optional[int] = None) -> PerformanceRollupResponseDTO:
+        """Totais de performance no período agrupados por membro, empresa ou segmentação."""
+        if start_date and end_date and start_date > end_date:
+            raise HTTPException(status_code=400, detail="start_date deve ser anterior ou igual a end_date")
+
+        try:
+            items = await self.rollup_service.rollup(dimension, start_date, end_date, order_by, limit, entity_id)
+            return PerformanceRollupResponseDTO(
+                dimension=dimension,
+                start_date=start_date,
+                end_date=end_date,
+                order_by=order_by,
+                items=[PerformanceRollupItemDTO(**item) for item in items]
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao consultar performance: {str(e)}"
+            )
+
+    async def refresh_rollups(self, full: bool = False) -> PerformanceRollupRefreshResponseDTO:
+        """Atualiza os totais de performance a partir dos eventos."""
+        try:
+            started = time.perf_counter()
+            result = await self.rollup_service.refresh(full)
+            return PerformanceRollupRefreshResponseDTO(
+                **result,
+                refreshed_at=datetime.now(timezone.utc),
+                duration_ms=round((time.perf_counter() - started) * 1000, 2)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao atualizar performance: {str(e)}"
+            )
+
+    async def ingest_events(self, batch: PerformanceEventBatchDTO) -> PerformanceEventBatchResponseDTO:
+        """Registra um lote de eventos de performance e atualiza os contadores das performances."""
+        if len(batch.events) > settings.performance_event_batch_max_size:
+            raise HTTPException(
+                status_code=413,
+                detail=f"O lote aceita no máximo {settings.performance_event_batch_max_size} eventos"
+            )
+
+        try:
+            started = time.perf_counter()
+            result = await self.event_service.ingest(batch.events)
+            return PerformanceEventBatchResponseDTO(
+                **result,
+                duration_ms=round((time.perf_counter() - started) * 1000, 2)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao registrar eventos de performance: {str(e)}"
+            )
+
+    async def reconcile_counters(self, dry_run: bool = False, limit: int = 100) -> PerformanceCounterReconcileResponseDTO:
+        """Recalcula os contadores das performances a partir dos eventos e reporta as divergências."""
+        try:
+            started = time.perf_counter()
+            result = await self.counter_service.reconcile(dry_run, limit)
+            result["items"] = [PerformanceCounterDriftDTO(**item) for item in result["items"]]
+            return PerformanceCounterReconcileResponseDTO(
+                **result,
+                duration_ms=round((time.perf_counter() - started) * 1000, 2)
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Erro ao reconciliar contadores de performance: {str(e)}"
+            )
@@ -0,0 +1,64 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Response
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def make_etag(*parts: object) -> str:
+    """ETag fraco a partir das versões (IDs e timestamps) dos dados da resposta."""
+    digest = hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8"), digest_size=12)
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Compara o If-None-Match com o ETag (comparação fraca, aceita lista e `*`)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified_since(if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """True se o recurso não mudou desde If-Modified-Since (resolução de segundos, como no header)."""
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """
+    Headers de validação da resposta. `no-cache` permite guardar a resposta,
+    mas exige revalidação (If-None-Match) a cada uso.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def conditional_response(body: Optional[bytes], etag: str, last_modified: Optional[datetime],
+                         if_none_match: Optional[str], if_modified_since: Optional[str]) -> Optional[Response]:
+    """
+    Retorna `304 Not Modified` se o cliente já tem a versão atual, senão a resposta JSON com `body`
+    (ou None quando `body` ainda não foi serializado). If-Modified-Since só vale sem If-None-Match.
+    """
+    headers = validator_headers(etag, last_modified)
+    if if_none_match:
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    elif not_modified_since(if_modified_since, last_modified):
+        return Response(status_code=304, headers=headers)
+    if body is None:
+        return None
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
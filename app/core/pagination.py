@@ -0,0 +1,39 @@
+import base64
+import json
+from typing import Optional, Tuple
+
+
+def encode_cursor(last_id: Optional[int], score: Optional[float] = None) -> Optional[str]:
+    """
+    Gera o cursor opaco (base64) a partir do último ID retornado.
+    Listagens ordenadas por relevância também guardam o score do último registro.
+    """
+    if last_id is None:
+        return None
+    data = {"id": last_id} if score is None else {"id": last_id, "score": score}
+    payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decodifica o cursor opaco e retorna o ID a partir do qual a próxima página começa."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        last_id = int(payload["id"])
+    except Exception:
+        raise ValueError("Cursor inválido")
+    if last_id < 0:
+        raise ValueError("Cursor inválido")
+    return last_id
+
+
+def decode_score_cursor(cursor: str) -> Tuple[int, float]:
+    """Decodifica um cursor de listagem por relevância e retorna (último ID, último score)."""
+    last_id = decode_cursor(cursor)
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score = float(json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["score"])
+    except Exception:
+        raise ValueError("Cursor inválido")
+    return last_id, score
@@ -0,0 +1,13 @@
+from typing import Any
+from pydantic import TypeAdapter
+
+# Serializador do pydantic-core sem validação: converte datas, enums e decimais como o response_model faria
+_json_adapter = TypeAdapter(Any)
+
+
+def dump_json(payload: Any) -> bytes:
+    """
+    Serializa dicts, listas e valores simples direto para bytes JSON, no mesmo formato
+    de `model_dump_json`, sem construir nem validar modelos.
+    """
+    return _json_adapter.dump_json(payload)
@@ -1,17 +1,104 @@
-from sqlalchemy import create_engine
+from uuid import uuid4
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics
 
-engine = create_engine(settings.database_url)
+
+def _pool_options() -> dict:
+    """Opções de pool comuns aos engines síncrono e assíncrono."""
+    if settings.db_pgbouncer_mode:
+        # O PgBouncer já faz o pooling; manter conexões locais só duplica o limite
+        return {"poolclass": NullPool, "pool_pre_ping": settings.db_pool_pre_ping}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping
+    }
+
+
+def _startup_statement_timeout() -> bool:
+    """
+    Se o statement_timeout vai como parâmetro de startup da conexão. Atrás do PgBouncer não:
+    ele recusa parâmetros de startup desconhecidos (ver `_set_local_statement_timeout`).
+    """
+    return settings.db_statement_timeout > 0 and not settings.db_pgbouncer_mode
+
+
+def _sync_connect_args() -> dict:
+    """Argumentos de conexão do psycopg2."""
+    if _startup_statement_timeout():
+        return {"options": f"-c statement_timeout={settings.db_statement_timeout}"}
+    return {}
+
+
+def _async_connect_args() -> dict:
+    """Argumentos de conexão do asyncpg."""
+    connect_args = {}
+    if _startup_statement_timeout():
+        connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout)}
+    if settings.db_pgbouncer_mode:
+        # Prepared statements não sobrevivem à troca de conexão do transaction pooling.
+        # O dialeto ainda prepara cada statement com nome: nomes únicos evitam o erro
+        # "prepared statement ... already exists" em outra conexão do servidor.
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    return connect_args
+
+
+def _set_local_statement_timeout(sync_engine) -> None:
+    """
+    No modo PgBouncer, aplica o statement_timeout com `SET LOCAL` no início de cada transação.
+    Um `SET` de sessão ao conectar valeria só para a conexão do servidor usada naquele momento,
+    já que o transaction pooling troca de conexão a cada transação.
+    """
+    if not settings.db_pgbouncer_mode or settings.db_statement_timeout <= 0:
+        return
+
+    @event.listens_for(sync_engine, "begin")
+    def set_statement_timeout(connection):
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(settings.db_statement_timeout)}")
+
+
+# Engine síncrono (psycopg2): usado por migrações, seeds e scripts
+engine = create_engine(
+    settings.database_url,
+    connect_args=_sync_connect_args(),
+    **_pool_options()
+)
+_set_local_statement_timeout(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono (asyncpg): usado pela API para não bloquear o event loop
+async_engine = create_async_engine(
+    settings.async_database_url,
+    connect_args=_async_connect_args(),
+    **_pool_options()
+)
+_set_local_statement_timeout(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Métricas do pool usado pela API (checkout e conexões em uso)
+pool_metrics = PoolMetrics()
+pool_metrics.attach(async_engine.sync_engine)
+
 Base = declarative_base()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        # Obtém a conexão logo no início; a espera pelo pool é medida no evento de checkout
+        with pool_metrics.measure_checkout():
+            await db.connection()
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,100 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Checkout medido na task atual: início e tempo gasto abrindo conexões novas.
+# Os eventos do pool async rodam em um greenlet que herda o contexto da task.
+_pending_checkout: ContextVar[Optional[dict]] = ContextVar("pending_checkout", default=None)
+
+
+class PoolMetrics:
+    """Métricas do pool de conexões de um engine (por processo/worker)."""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self._pool = None
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.connects = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def attach(self, engine: Engine) -> None:
+        """Registra os eventos do pool para contar conexões em uso."""
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        self._pool = engine.pool
+
+    @contextmanager
+    def measure_checkout(self) -> Iterator[None]:
+        """
+        Mede a espera pelo pool no próximo checkout feito dentro do bloco. O tempo termina no
+        evento `checkout`, antes do BEGIN e do `SET LOCAL` da transação, e desconta a abertura
+        de conexões novas (registrada no evento `connect`). O pre-ping, quando habilitado, roda
+        antes do evento e continua incluído (um round trip).
+        """
+        token = _pending_checkout.set({"started": time.perf_counter(), "connect": 0.0})
+        try:
+            yield
+        finally:
+            _pending_checkout.reset(token)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        pending = _pending_checkout.get()
+        if pending is not None:
+            # `starttime` é marcado pelo pool logo antes de abrir a conexão
+            pending["connect"] += max(time.time() - connection_record.starttime, 0.0)
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        pending = _pending_checkout.get()
+        if pending is not None and "waited" not in pending:
+            pending["waited"] = True
+            self.record_wait(max(time.perf_counter() - pending["started"] - pending["connect"], 0.0))
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def record_wait(self, seconds: float) -> None:
+        """Registra o tempo gasto esperando uma conexão do pool."""
+        with self._lock:
+            self._waits.append(seconds)
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna as métricas atuais do pool."""
+        with self._lock:
+            waits = sorted(self._waits)
+            samples = len(waits)
+            return {
+                "pid": os.getpid(),
+                "pool": self._pool.status() if self._pool is not None else None,
+                "in_use": self.in_use,
+                "peak_in_use": self.peak_in_use,
+                "checkouts": self.checkouts,
+                "connects": self.connects,
+                "checkout_wait_ms": {
+                    "samples": samples,
+                    "mean": round(sum(waits) / samples * 1000, 2) if samples else 0.0,
+                    "p95": round(waits[min(int(samples * 0.95), samples - 1)] * 1000, 2) if samples else 0.0,
+                    "max": round(self.max_wait * 1000, 2),
+                    "total": round(self.total_wait * 1000, 2)
+                }
+            }
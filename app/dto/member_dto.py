@@ -1,7 +1,13 @@
+import enum
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Optional, List
 from datetime import date, datetime
 from app.models.member import MemberStatusEnum
+from app.models.address import StateEnum
+from app.models.profile import ProfileTypeEnum
+from app.models.contact_channel import ContactChannelTypeEnum
+from app.models.performance_event import PerformanceEventTypeEnum
+from app.dto.market_segmentation_dto import MarketSegmentationResponseDTO
 
 
 class MemberBaseDTO(BaseModel):
@@ -71,10 +77,11 @@ class MemberUpdateDTO(BaseModel):
 class MemberResponseDTO(BaseModel):
     """DTO para resposta de membros."""
     id: int
-    name: str
+    # Nome e CPF podem faltar em membros gravados pelo populate-data (placeholders viram NULL)
+    name: Optional[str]
     position: Optional[str]
     biography: Optional[str]
-    document: str
+    document: Optional[str]
     photo_url: Optional[str]
     address_id: Optional[int]
     status: MemberStatusEnum
@@ -93,12 +100,134 @@ class MemberListResponseDTO(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco da próxima página (None na última)")
+    count_mode: Optional[str] = Field(None, description="Estratégia usada no total: exact, cached ou estimated")
+
+
+class AddressResponseDTO(BaseModel):
+    """DTO para resposta de endereços."""
+    id: int
+    street: str
+    number: Optional[str]
+    complement: Optional[str]
+    neighborhood: Optional[str]
+    city: str
+    state: StateEnum
+    country: str
+    postal_code: str
+    
+    class Config:
+        from_attributes = True
+
+
+class ProfileResponseDTO(BaseModel):
+    """DTO para resposta de perfis."""
+    id: int
+    type: ProfileTypeEnum
+    description: Optional[str]
+    plan_price: Optional[int]
+    active: Optional[bool]
+    
+    class Config:
+        from_attributes = True
+
+
+class ContactChannelResponseDTO(BaseModel):
+    """DTO para resposta de canais de contato."""
+    id: int
+    type: ContactChannelTypeEnum
+    content: Optional[str]
+    
+    class Config:
+        from_attributes = True
+
+
+class AdditionalInfoResponseDTO(BaseModel):
+    """DTO para resposta de informações adicionais."""
+    id: int
+    hobby: Optional[str]
+    role_duration: Optional[int]
+    children_count: Optional[int]
+    
+    class Config:
+        from_attributes = True
+
+
+class PerformanceResponseDTO(BaseModel):
+    """DTO para resposta de performance de empresas."""
+    id: int
+    count_closed_deals: Optional[int]
+    value_closed_deals: Optional[int]
+    referrals_received: Optional[int]
+    total_value_per_referral: Optional[int]
+    referrals_given: Optional[int]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    
+    class Config:
+        from_attributes = True
+
+
+class PerformanceEventResponseDTO(BaseModel):
+    """DTO para resposta de eventos de performance."""
+    id: int
+    performance_id: Optional[int]
+    type: PerformanceEventTypeEnum
+    value: Optional[int]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class CompanyCompleteResponseDTO(BaseModel):
+    """DTO para resposta de empresas com segmentação, endereço e performance."""
+    id: int
+    name: Optional[str]
+    document: Optional[str]
+    founded_year: Optional[date]
+    address: Optional[AddressResponseDTO]
+    market_segmentation: Optional[MarketSegmentationResponseDTO]
+    performances: List[PerformanceResponseDTO]
+    
+    class Config:
+        from_attributes = True
+
+
+class MemberCompleteResponseDTO(MemberResponseDTO):
+    """DTO para resposta de membros com todos os relacionamentos carregados."""
+    address: Optional[AddressResponseDTO]
+    profile: Optional[ProfileResponseDTO]
+    contact_channels: List[ContactChannelResponseDTO]
+    additional_info: Optional[AdditionalInfoResponseDTO]
+    companies: List[CompanyCompleteResponseDTO]
+    performance_events: List[PerformanceEventResponseDTO]
+
+
+class MemberCompleteListResponseDTO(BaseModel):
+    """DTO para resposta da busca de membros completos em lote."""
+    members: List[MemberCompleteResponseDTO]
+    not_found: List[int] = Field(default_factory=list, description="IDs solicitados que não existem")
+
+
+class NameMatchEnum(str, enum.Enum):
+    prefix = "prefix"  # nome começa com o termo (ILIKE 'termo%')
+    fuzzy = "fuzzy"    # similaridade de trigramas, ordenado por relevância
 
 
 class MemberSearchDTO(BaseModel):
     """DTO para busca de membros."""
     name: Optional[str] = Field(None, description="Nome do membro")
+    match: NameMatchEnum = Field(NameMatchEnum.prefix, description="Modo de comparação do nome: prefix ou fuzzy")
     status: Optional[MemberStatusEnum] = Field(None, description="Status do membro")
     profile_id: Optional[int] = Field(None, description="ID do perfil")
     skip: int = Field(0, ge=0, description="Número de registros para pular")
     limit: int = Field(100, ge=1, le=1000, description="Número máximo de registros")
+
+
+class MemberSearchResponseDTO(BaseModel):
+    """DTO para resposta da busca de membros."""
+    members: list[MemberResponseDTO]
+    limit: int
+    match: NameMatchEnum
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco da próxima página (None na última)")
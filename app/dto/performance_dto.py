@@ -0,0 +1,90 @@
+import enum
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import date, datetime
+from app.models.performance_event import PerformanceEventTypeEnum
+
+
+class RollupDimensionEnum(str, enum.Enum):
+    members = "members"
+    companies = "companies"
+    market_segmentations = "market-segmentations"
+
+
+class RollupMetricEnum(str, enum.Enum):
+    count_closed_deals = "count_closed_deals"
+    value_closed_deals = "value_closed_deals"
+    referrals = "referrals"
+    total_value_per_referral = "total_value_per_referral"
+
+
+class PerformanceRollupItemDTO(BaseModel):
+    """DTO para os totais de performance de um membro, empresa ou segmentação no período."""
+    id: int = Field(..., description="ID do membro, empresa ou segmentação")
+    name: Optional[str] = Field(None, description="Nome do membro, empresa ou segmentação")
+    count_closed_deals: int = Field(..., description="Quantidade de negócios fechados (eventos transaction)")
+    value_closed_deals: int = Field(..., description="Valor dos negócios fechados")
+    referrals_given: Optional[int] = Field(None, description="Indicações feitas pelo membro (apenas em members)")
+    referrals_received: Optional[int] = Field(None, description="Indicações recebidas (apenas em companies e market-segmentations)")
+    total_value_per_referral: int = Field(..., description="Valor total das indicações")
+
+
+class PerformanceRollupResponseDTO(BaseModel):
+    """DTO para resposta dos totais de performance agregados."""
+    dimension: RollupDimensionEnum = Field(..., description="Agrupamento dos totais")
+    start_date: Optional[date] = Field(None, description="Início do período (inclusivo, UTC)")
+    end_date: Optional[date] = Field(None, description="Fim do período (inclusivo, UTC)")
+    order_by: RollupMetricEnum = Field(..., description="Métrica usada na ordenação (decrescente)")
+    items: List[PerformanceRollupItemDTO] = Field(..., description="Totais por membro, empresa ou segmentação")
+
+
+class PerformanceRollupRefreshResponseDTO(BaseModel):
+    """DTO para resposta da atualização dos totais de performance."""
+    refreshed: bool = Field(..., description="False se outra atualização já estava em andamento")
+    full: bool = Field(..., description="True se todos os totais foram reconstruídos")
+    since: Optional[date] = Field(None, description="Primeiro dia recalculado na atualização incremental")
+    refreshed_at: datetime = Field(..., description="Momento da atualização")
+    duration_ms: float = Field(..., description="Duração da atualização em milissegundos")
+
+
+class PerformanceEventCreateDTO(BaseModel):
+    """DTO para um evento de performance recebido na ingestão em lote."""
+    performance_id: int = Field(..., description="ID da performance da empresa que recebeu o negócio ou a indicação")
+    type: PerformanceEventTypeEnum = Field(..., description="referral (indicação) ou transaction (negócio fechado)")
+    value: Optional[int] = Field(None, description="Valor do negócio ou da indicação")
+    member_id: Optional[int] = Field(None, description="Membro que fez a indicação (obrigatório em referral)")
+    event_id: Optional[int] = Field(None, description="ID do evento no sistema de origem")
+
+
+class PerformanceEventBatchDTO(BaseModel):
+    """DTO para um lote de eventos de performance."""
+    events: List[PerformanceEventCreateDTO] = Field(..., min_length=1, description="Eventos do lote")
+
+
+class PerformanceEventBatchResponseDTO(BaseModel):
+    """DTO para resposta da ingestão de um lote de eventos de performance."""
+    received: int = Field(..., description="Eventos recebidos no lote")
+    inserted: int = Field(..., description="Eventos gravados")
+    rejected: int = Field(..., description="Eventos rejeitados por referências inválidas")
+    updated_performances: int = Field(..., description="Performances com contadores atualizados")
+    errors: List[str] = Field(default_factory=list, description="Motivo de cada evento rejeitado")
+    duration_ms: float = Field(..., description="Duração da ingestão em milissegundos")
+
+
+class PerformanceCounterDriftDTO(BaseModel):
+    """DTO para um contador de performance divergente dos eventos."""
+    performance_id: int = Field(..., description="ID da performance")
+    field: str = Field(..., description="Contador divergente")
+    stored: int = Field(..., description="Valor gravado (nulo conta como zero)")
+    expected: int = Field(..., description="Valor calculado a partir de performance_events")
+
+
+class PerformanceCounterReconcileResponseDTO(BaseModel):
+    """DTO para resposta da reconciliação dos contadores de performance."""
+    reconciled: bool = Field(..., description="False se outra reconciliação já estava em andamento")
+    dry_run: bool = Field(..., description="True se as divergências foram apenas reportadas")
+    checked: int = Field(..., description="Performances verificadas")
+    drifted: int = Field(..., description="Performances com algum contador divergente")
+    fixed: int = Field(..., description="Performances corrigidas")
+    items: List[PerformanceCounterDriftDTO] = Field(default_factory=list, description="Contadores divergentes (até limit)")
+    duration_ms: float = Field(..., description="Duração da reconciliação em milissegundos")
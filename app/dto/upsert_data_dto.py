@@ -7,6 +7,13 @@ from app.models.contact_channel import ContactChannelTypeEnum
 from app.models.profile import ProfileTypeEnum
 
 
+def _has_values(model: Optional[BaseModel], exclude: frozenset = frozenset()) -> bool:
+    """Se algum campo informado (`model_fields_set`) tem valor, sem serializar o modelo."""
+    return model is not None and any(
+        getattr(model, name) for name in model.model_fields_set if name not in exclude
+    )
+
+
 class AddressUpsertDTO(BaseModel):
     """DTO para upsert de endereço."""
     street: Optional[str] = Field(None, description="Rua")
@@ -48,10 +55,10 @@ class CompanyUpsertDTO(BaseModel):
 
 class PerformanceUpsertDTO(BaseModel):
     """DTO para upsert de performance."""
-    count_closed_deals: Optional[int] = Field(None, description="Quantidade de negócios fechados")
-    value_closed_deals: Optional[int] = Field(None, description="Valor dos negócios fechados")
-    referrals_received: Optional[int] = Field(None, description="Quantidade de indicações recebidas")
-    total_value_per_referral: Optional[int] = Field(None, description="Valor total por indicações")
+    count_closed_deals: Optional[int] = Field(None, description="Quantidade de negócios fechados (derivado dos eventos de performance; sobrescrito pela reconciliação)")
+    value_closed_deals: Optional[int] = Field(None, description="Valor dos negócios fechados (derivado dos eventos de performance; sobrescrito pela reconciliação)")
+    referrals_received: Optional[int] = Field(None, description="Quantidade de indicações recebidas (derivado dos eventos de performance; sobrescrito pela reconciliação)")
+    total_value_per_referral: Optional[int] = Field(None, description="Valor total por indicações (derivado dos eventos de performance; sobrescrito pela reconciliação)")
     referrals_given: Optional[int] = Field(None, description="Quantidade de indicações fornecidas")
 
 
@@ -84,15 +91,18 @@ class UpsertDataRequestDTO(BaseModel):
     performances: Optional[List[PerformanceUpsertDTO]] = Field(None, description="Performances")
     
     def get_non_empty_objects(self) -> dict:
-        """Retorna apenas objetos que possuem pelo menos um campo populado."""
+        """
+        Retorna apenas objetos que possuem pelo menos um campo populado.
+        O upsert em si usa `upsert_normalizer.normalize_payload`, que faz este filtro
+        junto com a montagem das linhas.
+        """
         result = {}
         
         # Companies - filtrar objetos não vazios
         if self.companies:
             non_empty_companies = [
-                comp for comp in self.companies 
-                if any(comp.dict(exclude_unset=True, exclude={'address'}).values()) or 
-                   (comp.address and any(comp.address.dict(exclude_unset=True).values()))
+                comp for comp in self.companies
+                if _has_values(comp, {'address'}) or _has_values(comp.address)
             ]
             if non_empty_companies:
                 result["companies"] = non_empty_companies
@@ -100,23 +110,18 @@ class UpsertDataRequestDTO(BaseModel):
         # Members - filtrar objetos não vazios
         if self.members:
             non_empty_members = [
-                member for member in self.members 
-                if any(member.dict(exclude_unset=True, exclude={'address', 'contact_channels', 'additional_info'}).values()) or
-                   (member.address and any(member.address.dict(exclude_unset=True).values())) or
-                   (member.contact_channels and any(
-                       any(ch.dict(exclude_unset=True).values()) for ch in member.contact_channels
-                   )) or
-                   (member.additional_info and any(member.additional_info.dict(exclude_unset=True).values()))
+                member for member in self.members
+                if _has_values(member, {'address', 'contact_channels', 'additional_info'}) or
+                   _has_values(member.address) or
+                   any(_has_values(ch) for ch in member.contact_channels or []) or
+                   _has_values(member.additional_info)
             ]
             if non_empty_members:
                 result["members"] = non_empty_members
         
         # Performances - filtrar objetos não vazios
         if self.performances:
-            non_empty_perfs = [
-                perf for perf in self.performances 
-                if any(perf.dict(exclude_unset=True).values())
-            ]
+            non_empty_perfs = [perf for perf in self.performances if _has_values(perf)]
             if non_empty_perfs:
                 result["performances"] = non_empty_perfs
         
@@ -132,3 +137,46 @@ class UpsertDataResponseDTO(BaseModel):
     updated_count: dict
     errors: List[str] = []
     created_member_ids: List[int] = Field(default_factory=list, description="IDs dos membros criados")
+
+
+class ImportResponseDTO(BaseModel):
+    """DTO para resposta da importação NDJSON em streaming."""
+    message: str
+    status: str
+    entity: str
+    chunk_size: int
+    lines: int
+    records: int = Field(..., description="Registros válidos")
+    invalid: int = Field(..., description="Linhas rejeitadas na validação")
+    created: int
+    updated: int
+    chunks: int = Field(..., description="Chunks lidos, cada um gravado em sua própria transação")
+    failed_chunks: int
+    error_count: int = Field(..., description="Total de erros, inclusive os que não couberam em errors")
+    errors: List[str] = Field(default_factory=list, description="Primeiras mensagens de erro (limitadas)")
+
+
+class UpsertJobCreateResponseDTO(BaseModel):
+    """DTO para resposta da criação de um job do populate-data."""
+    job_id: str
+    status: str
+    total_chunks: int
+    status_url: str
+
+
+class UpsertJobStatusDTO(BaseModel):
+    """DTO com o progresso de um job do populate-data."""
+    id: str
+    status: str
+    chunk_size: int
+    total_chunks: int
+    processed_chunks: int
+    failed_chunks: int
+    progress: float = Field(..., description="Fração de chunks processados (0 a 1)")
+    created_count: dict
+    updated_count: dict
+    errors: List[str] = []
+    created_at: Optional[datetime]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    updated_at: Optional[datetime]
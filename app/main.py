@@ -2,6 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.db.database import pool_metrics, AsyncSessionLocal
+from app.seeds.profiles_seed import seed_profiles
+from app.services.upsert_job_service import upsert_job_pool
+from app.services.performance_rollup_service import performance_rollup_refresher
+from app.services.performance_counter_service import performance_counter_reconciler
 
 app = FastAPI(
     title=settings.project_name,
@@ -21,6 +26,52 @@ app.add_middleware(
 app.include_router(api_router, prefix=settings.api_v1_str)
 
 
+@app.on_event("startup")
+async def apply_seeds():
+    """Aplica o seed de profiles se o conteúdo mudou; nos demais startups custa uma consulta."""
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(seed_profiles)
+
+
+@app.on_event("startup")
+async def start_upsert_job_workers():
+    """Inicia os workers dos jobs assíncronos do populate-data."""
+    if settings.upsert_job_workers > 0:
+        upsert_job_pool.start()
+
+
+@app.on_event("shutdown")
+async def stop_upsert_job_workers():
+    """Interrompe os workers; jobs em andamento são retomados por outro worker."""
+    await upsert_job_pool.stop()
+
+
+@app.on_event("startup")
+async def start_performance_rollup_refresher():
+    """Inicia a atualização periódica dos totais de performance."""
+    if settings.performance_rollup_refresh_interval > 0:
+        performance_rollup_refresher.start()
+
+
+@app.on_event("shutdown")
+async def stop_performance_rollup_refresher():
+    """Interrompe a atualização periódica dos totais de performance."""
+    await performance_rollup_refresher.stop()
+
+
+@app.on_event("startup")
+async def start_performance_counter_reconciler():
+    """Inicia a reconciliação periódica dos contadores de performance."""
+    if settings.performance_counter_reconcile_interval > 0:
+        performance_counter_reconciler.start()
+
+
+@app.on_event("shutdown")
+async def stop_performance_counter_reconciler():
+    """Interrompe a reconciliação periódica dos contadores de performance."""
+    await performance_counter_reconciler.stop()
+
+
 @app.get("/")
 async def root():
     """Endpoint raiz da API."""
@@ -38,3 +89,14 @@ async def health_check():
         "status": "healthy",
         "service": "member-book-service"
     }
+
+
+@app.get("/health/db-pool")
+async def db_pool_health():
+    """Métricas do pool de conexões deste worker (espera no checkout e conexões em uso)."""
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pgbouncer_mode": settings.db_pgbouncer_mode,
+        **pool_metrics.snapshot()
+    }
@@ -8,6 +8,9 @@ from .performance import Performance
 from .performance_event import PerformanceEvent
 from .profile import Profile
 from .additional_info import AdditionalInfo
+from .upsert_job import UpsertJob
+from .seed_version import SeedVersion
+from .performance_rollup import PerformanceRollup
 
 __all__ = [
     "Address",
@@ -19,5 +22,8 @@ __all__ = [
     "Performance",
     "PerformanceEvent",
     "Profile",
-    "AdditionalInfo"
+    "AdditionalInfo",
+    "UpsertJob",
+    "SeedVersion",
+    "PerformanceRollup"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.database import Base
@@ -6,6 +6,9 @@ from app.db.database import Base
 
 class AdditionalInfo(Base):
     __tablename__ = "additional_infos"
+    __table_args__ = (
+        UniqueConstraint("member_id", name="uq_additional_infos_member_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     member_id = Column(Integer, ForeignKey("members.id"))
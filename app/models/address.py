@@ -47,6 +47,8 @@ class Address(Base):
     state = Column(Enum(StateEnum), nullable=False)
     country = Column(String, nullable=False, default="Brazil")
     postal_code = Column(String, nullable=False)
+    # Hash do conteúdo normalizado (upsert_normalizer.address_hash); endereços iguais são reutilizados
+    content_hash = Column(String(64), unique=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -8,10 +8,10 @@ class Company(Base):
     __tablename__ = "companies"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String)
-    market_segmentation_id = Column(Integer, ForeignKey("market_segmentation.id"))
+    name = Column(String, index=True)
+    market_segmentation_id = Column(Integer, ForeignKey("market_segmentation.id"), index=True)
     address_id = Column(Integer, ForeignKey("addresses.id"))
-    document = Column(String)  # CNPJ
+    document = Column(String, unique=True, index=True)  # CNPJ
     founded_year = Column(Date)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -21,7 +21,7 @@ class ContactChannel(Base):
     id = Column(Integer, primary_key=True, index=True)
     type = Column(ENUM(ContactChannelTypeEnum), nullable=False)
     content = Column(String)
-    member_id = Column(Integer, ForeignKey("members.id"))
+    member_id = Column(Integer, ForeignKey("members.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import relationship
@@ -15,17 +15,21 @@ class MemberStatusEnum(str, enum.Enum):
 
 class Member(Base):
     __tablename__ = "members"
+    __table_args__ = (
+        # Busca por prefixo e por similaridade no nome (extensão pg_trgm)
+        Index("ix_members_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String)
     position = Column(String)
     biography = Column(String)
-    document = Column(String)  # CPF
+    document = Column(String, unique=True, index=True)  # CPF
     photo_url = Column(String)
     address_id = Column(Integer, ForeignKey("addresses.id"))
-    status = Column(ENUM(MemberStatusEnum))
+    status = Column(ENUM(MemberStatusEnum), index=True)
     expired_at = Column(Date)  # Data de expiração do acesso - apenas para o perfil standalone_profile
-    profile_id = Column(Integer, ForeignKey("profiles.id"))
+    profile_id = Column(Integer, ForeignKey("profiles.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -36,3 +40,8 @@ class Member(Base):
     additional_info = relationship("AdditionalInfo", back_populates="member", uselist=False)
     performance_events = relationship("PerformanceEvent", back_populates="member")
     member_companies = relationship("MemberCompany", back_populates="member")
+
+    @property
+    def companies(self):
+        """Empresas vinculadas ao membro (via members_companies)."""
+        return [member_company.company for member_company in self.member_companies]
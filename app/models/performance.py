@@ -13,7 +13,7 @@ class Performance(Base):
     referrals_received = Column(Integer)  # Quantidade de indicações recebidas
     total_value_per_referral = Column(Integer)  # Valor total por indicações
     referrals_given = Column(Integer)  # Quantidade de indicações fornecidas
-    company_id = Column(Integer, ForeignKey("companies.id"))
+    company_id = Column(Integer, ForeignKey("companies.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.dialects.postgresql import ENUM
 from sqlalchemy.orm import relationship
@@ -13,14 +13,17 @@ class PerformanceEventTypeEnum(str, enum.Enum):
 
 class PerformanceEvent(Base):
     __tablename__ = "performance_events"
+    __table_args__ = (
+        Index("ix_performance_events_member_id_performance_id", "member_id", "performance_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    performance_id = Column(Integer, ForeignKey("performance.id"))
+    performance_id = Column(Integer, ForeignKey("performance.id"), index=True)
     event_id = Column(Integer, autoincrement=True)
     type = Column(ENUM(PerformanceEventTypeEnum), nullable=False)
     value = Column(Integer)
     member_id = Column(Integer, ForeignKey("members.id"))  # Opcional caso seja uma transação
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     # Relationships
     performance = relationship("Performance", back_populates="performance_events")
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, BigInteger, Date, DateTime, Index
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import ENUM
+from app.db.database import Base
+import enum
+
+
+class PerformanceRollupDimensionEnum(str, enum.Enum):
+    member = "member"
+    company = "company"
+
+
+class PerformanceRollupGrainEnum(str, enum.Enum):
+    day = "day"
+    month = "month"
+
+
+class PerformanceRollup(Base):
+    """Totais de performance_events pré-agregados por dia e por mês, mantidos pelo PerformanceRollupService."""
+    __tablename__ = "performance_rollups"
+    __table_args__ = (
+        Index("ix_performance_rollups_entity", "dimension", "entity_id", "grain", "period_start"),
+    )
+
+    dimension = Column(ENUM(PerformanceRollupDimensionEnum), primary_key=True)
+    grain = Column(ENUM(PerformanceRollupGrainEnum), primary_key=True)
+    period_start = Column(Date, primary_key=True)  # Dia (UTC) ou primeiro dia do mês
+    entity_id = Column(Integer, primary_key=True)  # ID do membro ou da empresa
+    count_closed_deals = Column(BigInteger, nullable=False, default=0)
+    value_closed_deals = Column(BigInteger, nullable=False, default=0)
+    referrals = Column(BigInteger, nullable=False, default=0)
+    value_referrals = Column(BigInteger, nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now())
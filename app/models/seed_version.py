@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class SeedVersion(Base):
+    __tablename__ = "seed_versions"
+
+    name = Column(String, primary_key=True)  # Nome do seed (ex.: profiles)
+    content_hash = Column(String(64), nullable=False)  # SHA-256 do conteúdo aplicado
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
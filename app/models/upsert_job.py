@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import ENUM, JSONB
+from app.db.database import Base
+import enum
+
+
+class UpsertJobStatusEnum(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class UpsertJob(Base):
+    __tablename__ = "upsert_jobs"
+
+    id = Column(String(36), primary_key=True)  # UUID
+    status = Column(ENUM(UpsertJobStatusEnum), nullable=False, default=UpsertJobStatusEnum.queued, index=True)
+    payload = Column(JSONB, nullable=False)  # UpsertDataRequestDTO já filtrado (apenas campos informados)
+    chunk_size = Column(Integer, nullable=False)
+    total_chunks = Column(Integer, nullable=False, default=0)
+    processed_chunks = Column(Integer, nullable=False, default=0)
+    failed_chunks = Column(Integer, nullable=False, default=0)
+    created_count = Column(JSONB, nullable=False, default=dict)
+    updated_count = Column(JSONB, nullable=False, default=dict)
+    errors = Column(JSONB, nullable=False, default=list)
+    company_ids = Column(JSONB, nullable=False, default=list)  # Empresas processadas, para vincular os membros
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())  # Heartbeat do worker
@@ -1,131 +1,111 @@
+import copy
+import hashlib
+import json
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.models.profile import Profile, ProfileTypeEnum
+from app.models.seed_version import SeedVersion
+from app.services.reference_cache import invalidate_reference_cache, PROFILES
 
-
-def seed_profiles(db: Session):
-    """Seed the profiles table with initial data."""
-    
-    profiles_data = [
-        {
-            "id": 1,
-            "type": ProfileTypeEnum.eternity,
-            "description": "Perfil Eternity - Acesso completo e vitalício",
-            "rule_activation": {
-                "unlimited_access": True,
-                "premium_features": True,
-                "priority_support": True
-            },
-            "plan_price": 0,  # Vitalício
-            "active": True
+PROFILES_DATA = [
+    {
+        "id": 1,
+        "type": ProfileTypeEnum.eternity,
+        "description": "Perfil Eternity - Acesso completo e vitalício",
+        "rule_activation": {
+            "unlimited_access": True,
+            "premium_features": True,
+            "priority_support": True
         },
-        {
-            "id": 2,
-            "type": ProfileTypeEnum.infinity,
-            "description": "Perfil Infinity - Acesso premium com recursos avançados",
-            "rule_activation": {
-                "unlimited_access": True,
-                "premium_features": True,
-                "priority_support": False,
-                "monthly_limit": 1000
-            },
-            "plan_price": 99,
-            "active": True
+        "plan_price": 0,  # Vitalício
+        "active": True
+    },
+    {
+        "id": 2,
+        "type": ProfileTypeEnum.infinity,
+        "description": "Perfil Infinity - Acesso premium com recursos avançados",
+        "rule_activation": {
+            "unlimited_access": True,
+            "premium_features": True,
+            "priority_support": False,
+            "monthly_limit": 1000
         },
-        {
-            "id": 3,
-            "type": ProfileTypeEnum.admin,
-            "description": "Perfil Admin - Acesso administrativo completo",
-            "rule_activation": {
-                "admin_access": True,
-                "user_management": True,
-                "system_settings": True,
-                "analytics": True
-            },
-            "plan_price": 0,
-            "active": True
+        "plan_price": 99,
+        "active": True
+    },
+    {
+        "id": 3,
+        "type": ProfileTypeEnum.admin,
+        "description": "Perfil Admin - Acesso administrativo completo",
+        "rule_activation": {
+            "admin_access": True,
+            "user_management": True,
+            "system_settings": True,
+            "analytics": True
         },
-        {
-            "id": 4,
-            "type": ProfileTypeEnum.standalone_profile,
-            "description": "Perfil Standalone - Acesso individual com prazo de expiração",
-            "rule_activation": {
-                "limited_access": True,
-                "basic_features": True,
-                "expiration_date": True
-            },
-            "plan_price": 29,
-            "active": True
+        "plan_price": 0,
+        "active": True
+    },
+    {
+        "id": 4,
+        "type": ProfileTypeEnum.standalone_profile,
+        "description": "Perfil Standalone - Acesso individual com prazo de expiração",
+        "rule_activation": {
+            "limited_access": True,
+            "basic_features": True,
+            "expiration_date": True
+        },
+        "plan_price": 29,
+        "active": True
+    }
+]
+
+# Versão do seed: muda sempre que o conteúdo de PROFILES_DATA muda
+PROFILES_SEED_HASH = hashlib.sha256(
+    json.dumps(PROFILES_DATA, sort_keys=True, default=str).encode("utf-8")
+).hexdigest()
+
+# Chave do advisory lock que serializa o seed entre workers
+SEED_LOCK_KEY = 7_340_001
+
+
+def seed_profiles(db: Session, force: bool = False) -> bool:
+    """
+    Seed idempotente da tabela profiles.
+    Só grava quando o hash de PROFILES_DATA difere do registrado em seed_versions (ou com force);
+    caso contrário custa uma única consulta. Retorna True quando o seed foi aplicado.
+    """
+    # Serializa workers que sobem ao mesmo tempo; liberado no commit
+    db.execute(select(func.pg_advisory_xact_lock(SEED_LOCK_KEY)))
+    
+    applied_hash = db.scalar(select(SeedVersion.content_hash).where(SeedVersion.name == PROFILES))
+    if applied_hash == PROFILES_SEED_HASH and not force:
+        db.commit()
+        return False
+    
+    # Criar ou atualizar todos os perfis em um único statement
+    statement = pg_insert(Profile).values(PROFILES_DATA)
+    db.execute(statement.on_conflict_do_update(
+        index_elements=[Profile.id],
+        set_={
+            **{key: statement.excluded[key] for key in PROFILES_DATA[0] if key != "id"},
+            "updated_at": func.now()
         }
-    ]
+    ))
     
-    for profile_data in profiles_data:
-        # Verificar se o perfil já existe
-        existing_profile = db.query(Profile).filter(Profile.id == profile_data["id"]).first()
-        
-        if existing_profile:
-            # Atualizar perfil existente
-            for key, value in profile_data.items():
-                setattr(existing_profile, key, value)
-        else:
-            # Criar novo perfil
-            profile = Profile(**profile_data)
-            db.add(profile)
+    version = pg_insert(SeedVersion).values(name=PROFILES, content_hash=PROFILES_SEED_HASH)
+    db.execute(version.on_conflict_do_update(
+        index_elements=[SeedVersion.name],
+        set_={"content_hash": version.excluded.content_hash, "applied_at": func.now()}
+    ))
     
     db.commit()
+    invalidate_reference_cache(PROFILES)
     print("Profiles seeded successfully!")
+    return True
 
 
 def get_profiles_data():
     """Retorna os dados dos perfis para uso em outros contextos."""
-    return [
-        {
-            "id": 1,
-            "type": "eternity",
-            "description": "Perfil Eternity - Acesso completo e vitalício",
-            "rule_activation": {
-                "unlimited_access": True,
-                "premium_features": True,
-                "priority_support": True
-            },
-            "plan_price": 0,
-            "active": True
-        },
-        {
-            "id": 2,
-            "type": "infinity",
-            "description": "Perfil Infinity - Acesso premium com recursos avançados",
-            "rule_activation": {
-                "unlimited_access": True,
-                "premium_features": True,
-                "priority_support": False,
-                "monthly_limit": 1000
-            },
-            "plan_price": 99,
-            "active": True
-        },
-        {
-            "id": 3,
-            "type": "admin",
-            "description": "Perfil Admin - Acesso administrativo completo",
-            "rule_activation": {
-                "admin_access": True,
-                "user_management": True,
-                "system_settings": True,
-                "analytics": True
-            },
-            "plan_price": 0,
-            "active": True
-        },
-        {
-            "id": 4,
-            "type": "standalone_profile",
-            "description": "Perfil Standalone - Acesso individual com prazo de expiração",
-            "rule_activation": {
-                "limited_access": True,
-                "basic_features": True,
-                "expiration_date": True
-            },
-            "plan_price": 29,
-            "active": True
-        }
-    ]
+    return copy.deepcopy(PROFILES_DATA)
@@ -0,0 +1,587 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    Integer, String, and_, any_, or_, case, column, delete, func, insert, literal_column, select, true, update, bindparam
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from collections import defaultdict
+from typing import List, Dict, Set, Any, Optional
+from app.core.config import settings
+from app.models.member import Member
+from app.models.address import Address
+from app.models.contact_channel import ContactChannel
+from app.models.additional_info import AdditionalInfo
+from app.models.company import Company
+from app.models.performance import Performance
+from app.models.member_company import MemberCompany
+from app.services.reference_cache import ReferenceCache
+from app.services.upsert_normalizer import MergePolicyEnum, address_row, deduplicate_rows
+
+# Colunas gravadas pelo upsert (ON CONFLICT) de cada tabela
+MEMBER_COLUMNS = [
+    'name', 'position', 'biography', 'document', 'photo_url',
+    'status', 'expired_at', 'profile_id', 'address_id'
+]
+COMPANY_COLUMNS = ['name', 'document', 'founded_year', 'market_segmentation_id', 'address_id']
+ADDITIONAL_INFO_COLUMNS = ['hobby', 'role_duration', 'children_count']
+
+
+class BulkUpsertService:
+    """
+    Service responsável pelo upsert em lote (set-based) do endpoint populate-data.
+
+    Recebe as linhas já normalizadas por `upsert_normalizer` (uma passada por registro)
+    e colapsa os registros repetidos no payload pela política `merge_policy`.
+    As linhas são gravadas em grupos de `savepoint_size`, cada um em um savepoint, para que
+    um registro com erro não desfaça o payload inteiro.
+    Em vez de uma consulta por linha, resolve os registros existentes com poucas
+    consultas `IN (...)` e grava com inserts multi-linha com `RETURNING id`.
+    Membros e empresas com documento são gravados com `ON CONFLICT (document) DO UPDATE`,
+    apoiados nos índices únicos, para continuar corretos com vários workers concorrentes.
+    """
+
+    def __init__(self, db: AsyncSession, merge_policy: Optional[MergePolicyEnum] = None,
+                 savepoint_size: Optional[int] = None):
+        self.db = db
+        self.merge_policy = MergePolicyEnum(merge_policy or settings.upsert_merge_policy)
+        self.savepoint_size = settings.upsert_savepoint_size if savepoint_size is None else savepoint_size
+        self.references = ReferenceCache(db)
+        self.created_count: Dict[str, int] = {}
+        self.updated_count: Dict[str, int] = {}
+        self.errors: List[str] = []
+        self.processed_company_ids: List[int] = []
+        self.created_member_ids: List[int] = []
+
+    async def _existing_ids(self, model_class, ids: Set[int]) -> Set[int]:
+        """Retorna, em uma única consulta, quais IDs existem na tabela."""
+        ids = {value for value in ids if value}
+        if not ids:
+            return set()
+        result = await self.db.scalars(select(model_class.id).where(model_class.id.in_(ids)))
+        return set(result.all())
+
+    async def _insert_returning_ids(self, model_class, rows: List[dict]) -> List[int]:
+        """Insere várias linhas em um único statement e retorna os IDs na ordem dos parâmetros."""
+        if not rows:
+            return []
+        statement = insert(model_class).returning(model_class.id, sort_by_parameter_order=True)
+        return list((await self.db.scalars(statement, rows)).all())
+
+    async def _insert_many(self, model_class, rows: List[dict]) -> None:
+        """Insere várias linhas sem necessidade de retornar os IDs."""
+        if rows:
+            await self.db.execute(insert(model_class), rows)
+
+    @staticmethod
+    def _full_row(model_class, columns: List[str], values: dict) -> dict:
+        """
+        Linha com todas as colunas (padrão do modelo nas não informadas), já que o insert
+        multi-linha exige as mesmas chaves em todas as linhas.
+        """
+        table = model_class.__table__
+        return {
+            name: values[name] if name in values else (table.c[name].default.arg if table.c[name].default else None)
+            for name in columns
+        }
+
+    async def _address_ids_by_hash(self, hashes: List[str]) -> Dict[str, int]:
+        """IDs dos endereços já gravados com os hashes informados, em uma única consulta."""
+        if not hashes:
+            return {}
+        result = await self.db.execute(
+            select(Address.content_hash, Address.id).where(Address.content_hash.in_(hashes))
+        )
+        return dict(result.all())
+
+    async def _insert_addresses(self, entries: List[dict]) -> None:
+        """
+        Resolve os endereços das entradas novas e preenche `address_id` nos valores.
+        Endereços iguais (mesmo `content_hash`) são reutilizados, no payload e no banco;
+        os que faltam são criados em um único `INSERT ... ON CONFLICT DO NOTHING`.
+        """
+        rows: Dict[str, dict] = {}
+        entry_hashes = []
+        for entry in entries:
+            if entry["address"]:
+                row = address_row(entry["address"])
+                rows.setdefault(row["content_hash"], row)
+                entry_hashes.append((entry, row["content_hash"]))
+        if not rows:
+            return
+
+        address_ids = await self._address_ids_by_hash(list(rows))
+        missing = [row for content_hash, row in rows.items() if content_hash not in address_ids]
+        if missing:
+            table = Address.__table__
+            statement = pg_insert(table).on_conflict_do_nothing(
+                index_elements=[table.c.content_hash]
+            ).returning(table.c.content_hash, table.c.id)
+            address_ids.update((await self.db.execute(statement, missing)).tuples().all())
+            # Criados por outra requisição concorrente entre a leitura e a escrita
+            address_ids.update(await self._address_ids_by_hash(
+                [row["content_hash"] for row in missing if row["content_hash"] not in address_ids]
+            ))
+
+        for entry, content_hash in entry_hashes:
+            entry["values"]["address_id"] = address_ids[content_hash]
+
+    @staticmethod
+    def _apply_changes(target, values: dict) -> int:
+        """Aplica os valores não nulos que diferem do atual; retorna quantos campos mudaram."""
+        changed = 0
+        for key, value in values.items():
+            if value is None:
+                continue
+            if isinstance(target, dict):
+                if target.get(key) != value:
+                    target[key] = value
+                    changed += 1
+            elif getattr(target, key) != value:
+                setattr(target, key, value)
+                changed += 1
+        return changed
+
+    async def _upsert_by_document(self, model_class, columns: List[str], rows: List[dict]) -> Dict[str, tuple]:
+        """
+        Grava as linhas com `INSERT ... ON CONFLICT (document) DO UPDATE` em um único statement.
+        Valores nulos não sobrescrevem os existentes. Retorna {document: (id, inserted)}.
+        """
+        if not rows:
+            return {}
+        table = model_class.__table__
+        statement = pg_insert(table)
+        changed = or_(*[
+            and_(statement.excluded[column].isnot(None), statement.excluded[column].is_distinct_from(table.c[column]))
+            for column in columns
+        ])
+        set_values = {
+            column: func.coalesce(statement.excluded[column], table.c[column])
+            for column in columns if column != 'document'
+        }
+        set_values['updated_at'] = case((changed, func.now()), else_=table.c.updated_at)
+        statement = statement.on_conflict_do_update(
+            index_elements=[table.c.document],
+            set_=set_values
+        ).returning(table.c.id, table.c.document, literal_column("xmax = 0").label("inserted"))
+        result = await self.db.execute(statement, [{column: row.get(column) for column in columns} for row in rows])
+        return {row.document: (row.id, row.inserted) for row in result}
+
+    def _deduplicate(self, entity: str, rows: List[dict]) -> List[dict]:
+        """
+        Colapsa os registros repetidos do payload (um único `ON CONFLICT DO UPDATE` não pode
+        afetar a mesma linha duas vezes) e reporta as duplicatas em `errors`.
+        """
+        rows, duplicates = deduplicate_rows(entity, rows, self.merge_policy)
+        self.errors.extend(duplicates)
+        return rows
+
+    def _snapshot(self) -> tuple:
+        """Estado dos contadores e listas do resultado, para desfazer um grupo que falhou."""
+        return (dict(self.created_count), dict(self.updated_count), len(self.errors),
+                len(self.processed_company_ids), len(self.created_member_ids))
+
+    def _restore(self, snapshot: tuple) -> None:
+        created_count, updated_count, errors, company_ids, member_ids = snapshot
+        self.created_count = created_count
+        self.updated_count = updated_count
+        del self.errors[errors:]
+        del self.processed_company_ids[company_ids:]
+        del self.created_member_ids[member_ids:]
+
+    async def _write_in_savepoint(self, label: str, write, rows: List[dict]) -> bool:
+        """
+        Executa `write(rows)` dentro de um savepoint (`begin_nested`). Em caso de erro desfaz só
+        este grupo, inclusive nos contadores, e retorna False; o erro de um registro isolado é
+        reportado em `errors`.
+        """
+        snapshot = self._snapshot()
+        try:
+            async with self.db.begin_nested():
+                await write(rows)
+            return True
+        except Exception as e:
+            self._restore(snapshot)
+            if len(rows) == 1:
+                row = rows[0]
+                identity = row.get("document") or row.get("values", row).get("name")
+                if identity:
+                    label = f"{label} {identity}"
+                self.errors.append(f"Erro ao gravar {label}: {str(e)}")
+            return False
+
+    async def _write_in_savepoints(self, label: str, write, rows: List[dict]) -> None:
+        """
+        Grava as linhas em grupos de `savepoint_size` registros, cada um em seu savepoint.
+        Um grupo que falha é repetido registro a registro, e só as linhas com erro são descartadas.
+        Com `savepoint_size = 0`, tudo é gravado de uma vez, sem savepoint.
+        """
+        if self.savepoint_size <= 0:
+            await write(rows)
+            return
+        for start in range(0, len(rows), self.savepoint_size):
+            group = rows[start:start + self.savepoint_size]
+            if await self._write_in_savepoint(label, write, group) or len(group) == 1:
+                continue
+            for row in group:
+                await self._write_in_savepoint(label, write, [row])
+
+    def _merge_by_document(self, entries: Dict[str, dict], columns: List[str], document: str,
+                           values: dict, existing, build_entry) -> int:
+        """
+        Registra a entrada do documento (único no payload após `_deduplicate`), partindo do
+        estado atual quando o registro já existe. Retorna quantos campos foram alterados.
+        """
+        if existing is None:
+            entries[document] = build_entry(dict(values))
+            return 0
+        entry = entries[document] = build_entry({column: getattr(existing, column) for column in columns})
+        entry["existing"] = existing
+        return self._apply_changes(entry["values"], values)
+
+    # ==================== COMPANIES ====================
+
+    async def upsert_companies(self, companies: List[dict]) -> None:
+        """
+        Cria ou atualiza empresas, identificadas pelo CNPJ normalizado ou pelo nome.
+        Recebe as linhas de `normalize_company` (valores, documento e endereço).
+        """
+        self.created_count["companies"] = 0
+        self.updated_count["companies"] = 0
+        await self._write_in_savepoints("empresa", self._write_companies, self._deduplicate("companies", companies))
+
+    async def _write_companies(self, companies: List[dict]) -> None:
+        """Grava um grupo de empresas já sem duplicatas."""
+        # Resolver empresas existentes e FKs com consultas em lote
+        documents = {row["document"] for row in companies if row["document"]}
+        names = {row["values"].get("name") for row in companies if not row["document"] and row["values"].get("name")}
+        by_document: Dict[str, Company] = {}
+        by_name: Dict[str, Company] = {}
+        if documents:
+            for company in await self.db.scalars(select(Company).where(Company.document.in_(documents))):
+                by_document[company.document] = company
+        if names:
+            for company in await self.db.scalars(
+                select(Company).where(Company.name.in_(names)).order_by(Company.id)
+            ):
+                by_name.setdefault(company.name, company)
+        valid_segmentation_ids = await self.references.existing_market_segmentation_ids(
+            {row["values"].get('market_segmentation_id') for row in companies}
+        )
+
+        document_entries: Dict[str, dict] = {}
+        new_by_name: List[dict] = []
+        for row in companies:
+            company_dict, normalized_doc, address_dict = row["values"], row["document"], row["address"]
+            name = company_dict.get('name')
+            try:
+                # Validar foreign keys
+                segmentation_id = company_dict.get('market_segmentation_id')
+                if segmentation_id and segmentation_id not in valid_segmentation_ids:
+                    self.errors.append(f"Market segmentation ID {segmentation_id} não existe")
+                    continue
+
+                if normalized_doc:
+                    # CNPJ válido: gravado via ON CONFLICT (document)
+                    company_dict['document'] = normalized_doc
+                    self.updated_count["companies"] += self._merge_by_document(
+                        document_entries, COMPANY_COLUMNS, normalized_doc, company_dict,
+                        by_document.get(normalized_doc),
+                        lambda values: {"values": values, "address": address_dict, "existing": None}
+                    )
+                    continue
+
+                # Sem CNPJ: identificar pelo nome
+                existing = by_name.get(name) if name else None
+                if existing:
+                    self.updated_count["companies"] += self._apply_changes(existing, company_dict)
+                    if existing.id not in self.processed_company_ids:
+                        self.processed_company_ids.append(existing.id)
+                else:
+                    new_by_name.append({"values": company_dict, "address": address_dict})
+            except Exception as e:
+                self.errors.append(f"Erro ao processar empresa {name}: {str(e)}")
+
+        # Endereço apenas para empresas novas
+        new_entries = [entry for entry in document_entries.values() if entry["existing"] is None] + new_by_name
+        await self._insert_addresses(new_entries)
+
+        upserted = await self._upsert_by_document(Company, COMPANY_COLUMNS, [entry["values"] for entry in document_entries.values()])
+        for document, entry in document_entries.items():
+            company_id, inserted = upserted[document]
+            if inserted:
+                self.created_count["companies"] += 1
+            elif entry["existing"] is None:
+                # Criada por outra requisição concorrente entre a leitura e a escrita
+                self.updated_count["companies"] += 1
+            if company_id not in self.processed_company_ids:
+                self.processed_company_ids.append(company_id)
+
+        company_ids = await self._insert_returning_ids(Company, [entry["values"] for entry in new_by_name])
+        for company_id in company_ids:
+            if company_id not in self.processed_company_ids:
+                self.processed_company_ids.append(company_id)
+        self.created_count["companies"] += len(company_ids)
+
+    # ==================== MEMBERS ====================
+
+    async def upsert_members(self, members: List[dict]) -> None:
+        """
+        Cria ou atualiza membros (identificados pelo CPF) e vincula às empresas processadas.
+        Recebe as linhas de `normalize_member` (valores, documento, endereço, contatos e informações adicionais).
+        """
+        self.created_count["members"] = 0
+        self.updated_count["members"] = 0
+        await self._write_in_savepoints("membro", self._write_members, self._deduplicate("members", members))
+
+    async def _write_members(self, members: List[dict]) -> None:
+        """Grava um grupo de membros já sem duplicatas, com contatos, informações adicionais e vínculos."""
+        documents = {row["document"] for row in members if row["document"]}
+        by_document: Dict[str, Member] = {}
+        if documents:
+            for member in await self.db.scalars(select(Member).where(Member.document.in_(documents))):
+                by_document[member.document] = member
+        valid_profile_ids = await self.references.existing_profile_ids(
+            {row["values"].get('profile_id') for row in members}
+        )
+
+        document_entries: Dict[str, dict] = {}
+        new_without_document: List[dict] = []
+        for row in members:
+            member_dict = row["values"]
+            try:
+                # Validar foreign keys
+                profile_id = member_dict.get('profile_id')
+                if profile_id and profile_id not in valid_profile_ids:
+                    self.errors.append(f"Profile ID {profile_id} não existe")
+                    continue
+
+                def build_entry(values, row=row):
+                    return {**row, "values": values, "existing": None}
+
+                if row["document"]:
+                    self.updated_count["members"] += self._merge_by_document(
+                        document_entries, MEMBER_COLUMNS, row["document"], member_dict,
+                        by_document.get(row["document"]), build_entry
+                    )
+                else:
+                    new_without_document.append(build_entry(member_dict))
+            except Exception as e:
+                self.errors.append(f"Erro ao processar membro {member_dict.get('name')}: {str(e)}")
+
+        # Endereço apenas para membros novos
+        await self._insert_addresses(
+            [entry for entry in document_entries.values() if entry["existing"] is None] + new_without_document
+        )
+
+        created_entries: List[tuple] = []
+        updated_entries: List[tuple] = []
+        upserted = await self._upsert_by_document(Member, MEMBER_COLUMNS, [entry["values"] for entry in document_entries.values()])
+        for document, entry in document_entries.items():
+            member_id, inserted = upserted[document]
+            if inserted:
+                created_entries.append((entry, member_id))
+            else:
+                if entry["existing"] is None:
+                    # Criado por outra requisição concorrente entre a leitura e a escrita
+                    self.updated_count["members"] += 1
+                updated_entries.append((entry, member_id))
+
+        member_ids = await self._insert_returning_ids(Member, [entry["values"] for entry in new_without_document])
+        created_entries.extend(zip(new_without_document, member_ids))
+        self.created_count["members"] += len(created_entries)
+        self.created_member_ids.extend(member_id for _, member_id in created_entries)
+
+        # Canais de contato e informações adicionais dos membros novos e existentes
+        await self._sync_contact_channels(created_entries, updated_entries)
+        await self._sync_additional_infos(created_entries, updated_entries)
+
+        await self._link_members_to_companies(
+            [member_id for _, member_id in updated_entries] + [member_id for _, member_id in created_entries]
+        )
+
+    async def _sync_contact_channels(self, created: List[tuple], existing: List[tuple]) -> None:
+        """
+        Substitui os canais de contato dos membros que informaram algum canal não vazio pelos do payload.
+        Os canais gravados são lidos em uma única consulta e comparados por membro: canais iguais
+        (tipo e conteúdo) ficam intactos, os do mesmo tipo têm o conteúdo atualizado e os demais são
+        inseridos ou removidos, com um statement por operação.
+        """
+        incoming = {
+            member_id: entry["contact_channels"] for entry, member_id in created + existing
+            if entry["contact_channels"] is not None
+        }
+        if not incoming:
+            return
+        for counts, key in ((self.created_count, "contact_channels"), (self.updated_count, "contact_channels"),
+                            (self.updated_count, "contact_channels_removed")):
+            counts.setdefault(key, 0)
+
+        stored: Dict[int, list] = defaultdict(list)
+        existing_ids = [member_id for _, member_id in existing if member_id in incoming]
+        if existing_ids:
+            result = await self.db.execute(
+                select(ContactChannel.id, ContactChannel.member_id, ContactChannel.type, ContactChannel.content)
+                .where(ContactChannel.member_id == any_(bindparam("member_ids", existing_ids, type_=ARRAY(Integer))))
+                .order_by(ContactChannel.id)
+            )
+            for row in result:
+                stored[row.member_id].append(row)
+
+        inserts, updates, deletes = [], [], []
+        for member_id, channels in incoming.items():
+            remaining = stored.get(member_id, [])
+            pending = []
+            for channel in channels:
+                if channel.get('type') is None:
+                    self.errors.append(f"Canal de contato sem tipo ignorado (membro {member_id})")
+                    continue
+                same = next((row for row in remaining
+                             if row.type == channel['type'] and row.content == channel.get('content')), None)
+                if same is not None:
+                    remaining.remove(same)
+                else:
+                    pending.append(channel)
+            for channel in pending:
+                same_type = next((row for row in remaining if row.type == channel['type']), None)
+                if same_type is not None:
+                    remaining.remove(same_type)
+                    updates.append((same_type.id, channel.get('content')))
+                else:
+                    inserts.append({"type": channel['type'], "content": channel.get('content'), "member_id": member_id})
+            deletes.extend(row.id for row in remaining)
+
+        if deletes:
+            await self.db.execute(
+                delete(ContactChannel)
+                .where(ContactChannel.id == any_(bindparam("channel_ids", deletes, type_=ARRAY(Integer))))
+                .execution_options(synchronize_session=False)
+            )
+        if updates:
+            changes = func.unnest(
+                bindparam("ids", [channel_id for channel_id, _ in updates], type_=ARRAY(Integer)),
+                bindparam("contents", [content for _, content in updates], type_=ARRAY(String))
+            ).table_valued(column("id", Integer), column("content", String)).render_derived(name="changes")
+            await self.db.execute(
+                update(ContactChannel)
+                .where(ContactChannel.id == changes.c.id)
+                .values(content=changes.c.content, updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        await self._insert_many(ContactChannel, inserts)
+
+        self.created_count["contact_channels"] += len(inserts)
+        self.updated_count["contact_channels"] += len(updates)
+        self.updated_count["contact_channels_removed"] += len(deletes)
+
+    async def _sync_additional_infos(self, created: List[tuple], existing: List[tuple]) -> None:
+        """
+        Grava as informações adicionais informadas: cria a linha dos membros que ainda não têm e
+        atualiza, em um único `UPDATE ... FROM unnest`, apenas as que mudaram (nulos não apagam valores).
+        """
+        incoming = {
+            member_id: entry["additional_info"] for entry, member_id in created + existing
+            if entry["additional_info"]
+        }
+        if not incoming:
+            return
+        self.created_count.setdefault("additional_infos", 0)
+        self.updated_count.setdefault("additional_infos", 0)
+
+        stored: Dict[int, Any] = {}
+        existing_ids = [member_id for _, member_id in existing if member_id in incoming]
+        if existing_ids:
+            result = await self.db.execute(
+                select(AdditionalInfo.id, AdditionalInfo.member_id,
+                       *[getattr(AdditionalInfo, name) for name in ADDITIONAL_INFO_COLUMNS])
+                .where(AdditionalInfo.member_id == any_(bindparam("member_ids", existing_ids, type_=ARRAY(Integer))))
+                .order_by(AdditionalInfo.id)
+            )
+            for row in result:
+                stored.setdefault(row.member_id, row)
+
+        inserts, updates = [], []
+        for member_id, values in incoming.items():
+            current = stored.get(member_id)
+            if current is None:
+                inserts.append({**self._full_row(AdditionalInfo, ADDITIONAL_INFO_COLUMNS, values), "member_id": member_id})
+                continue
+            state = {name: getattr(current, name) for name in ADDITIONAL_INFO_COLUMNS}
+            if self._apply_changes(state, values):
+                updates.append({"id": current.id, **state})
+
+        if updates:
+            changes = func.unnest(
+                bindparam("ids", [row["id"] for row in updates], type_=ARRAY(Integer)),
+                bindparam("hobbies", [row["hobby"] for row in updates], type_=ARRAY(String)),
+                bindparam("role_durations", [row["role_duration"] for row in updates], type_=ARRAY(Integer)),
+                bindparam("children_counts", [row["children_count"] for row in updates], type_=ARRAY(Integer))
+            ).table_valued(
+                column("id", Integer), column("hobby", String),
+                column("role_duration", Integer), column("children_count", Integer)
+            ).render_derived(name="changes")
+            await self.db.execute(
+                update(AdditionalInfo)
+                .where(AdditionalInfo.id == changes.c.id)
+                .values(**{name: changes.c[name] for name in ADDITIONAL_INFO_COLUMNS}, updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        await self._insert_many(AdditionalInfo, inserts)
+
+        self.created_count["additional_infos"] += len(inserts)
+        self.updated_count["additional_infos"] += len(updates)
+
+    async def _link_members_to_companies(self, member_ids: List[int]) -> None:
+        """
+        Vincula os membros às empresas processadas com um único `INSERT ... SELECT`
+        sobre o produto cartesiano dos IDs; pares já existentes são ignorados pelo
+        índice único (member_id, company_id).
+        """
+        if not member_ids or not self.processed_company_ids:
+            return
+        members = func.unnest(
+            bindparam("member_ids", member_ids, type_=ARRAY(Integer))
+        ).table_valued("member_id").render_derived(name="linked_members")
+        companies = func.unnest(
+            bindparam("company_ids", self.processed_company_ids, type_=ARRAY(Integer))
+        ).table_valued("company_id").render_derived(name="linked_companies")
+        pairs = select(members.c.member_id, companies.c.company_id, func.now()).select_from(
+            members.join(companies, true())
+        )
+        table = MemberCompany.__table__
+        statement = pg_insert(table).from_select(
+            [table.c.member_id, table.c.company_id, table.c.created_at], pairs
+        ).on_conflict_do_nothing(index_elements=[table.c.member_id, table.c.company_id])
+        await self.db.execute(statement)
+
+    # ==================== PERFORMANCES ====================
+
+    async def insert_performances(self, perf_dicts: List[dict]) -> None:
+        """
+        Cria as performances validando as empresas referenciadas em uma única consulta.
+        Recebe os valores de `normalize_performance`.
+        """
+        self.created_count["performances"] = 0
+        self.updated_count["performances"] = 0
+        await self._write_in_savepoints("performance", self._write_performances, perf_dicts)
+
+    async def _write_performances(self, perf_dicts: List[dict]) -> None:
+        """Grava um grupo de performances."""
+        valid_company_ids = await self._existing_ids(Company, {perf.get('company_id') for perf in perf_dicts})
+        rows = []
+        for perf_dict in perf_dicts:
+            company_id = perf_dict.get('company_id')
+            if company_id and company_id not in valid_company_ids:
+                self.errors.append(f"Company ID {company_id} não existe")
+                continue
+            rows.append(perf_dict)
+
+        await self._insert_many(Performance, rows)
+        self.created_count["performances"] += len(rows)
+
+    def result(self) -> Dict[str, Any]:
+        """Monta o resultado no formato de resposta do populate-data."""
+        return {
+            "created_count": self.created_count,
+            "updated_count": self.updated_count,
+            "errors": self.errors,
+            "created_member_ids": self.created_member_ids,
+        }
@@ -0,0 +1,81 @@
+import enum
+import threading
+import time
+from typing import Dict, Hashable, Optional, Tuple
+from sqlalchemy import func, select, text, Select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+
+
+class CountModeEnum(str, enum.Enum):
+    exact = "exact"          # SELECT count(*) a cada requisição
+    cached = "cached"        # count(*) exato reaproveitado por um TTL
+    estimated = "estimated"  # estimativa do planner / pg_class.reltuples
+
+
+# Cache em memória do processo: chave do filtro -> (total, expira_em)
+_count_cache: Dict[Hashable, Tuple[int, float]] = {}
+_count_cache_lock = threading.Lock()
+
+
+class MemberCountService:
+    """Service responsável por calcular o total das listagens de membros conforme a estratégia escolhida."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def invalidate() -> None:
+        """Descarta os totais em cache; chamado pelos fluxos que criam ou removem membros."""
+        with _count_cache_lock:
+            _count_cache.clear()
+
+    async def count(self, statement: Select, key: Hashable,
+                    mode: Optional[CountModeEnum] = None) -> Tuple[int, CountModeEnum]:
+        """
+        Retorna o total da consulta e a estratégia efetivamente usada.
+        Sem `mode`, usa a estratégia configurada em `Settings.member_count_mode`.
+        """
+        mode = CountModeEnum(mode or settings.member_count_mode)
+
+        if mode == CountModeEnum.estimated:
+            estimate = await self._estimate(statement, key)
+            if estimate is not None:
+                return estimate, mode
+            # Tabela ainda sem estatísticas: cair para o total exato em cache
+            mode = CountModeEnum.cached
+
+        if mode == CountModeEnum.cached:
+            now = time.monotonic()
+            with _count_cache_lock:
+                cached = _count_cache.get(key)
+            if cached and cached[1] > now:
+                return cached[0], mode
+            total = await self._exact(statement)
+            with _count_cache_lock:
+                _count_cache[key] = (total, now + settings.member_count_cache_ttl)
+            return total, mode
+
+        return await self._exact(statement), CountModeEnum.exact
+
+    async def _exact(self, statement: Select) -> int:
+        """SELECT count(*) sobre a consulta da listagem."""
+        result = await self.db.execute(select(func.count()).select_from(statement.order_by(None).subquery()))
+        return result.scalar_one()
+
+    async def _estimate(self, statement: Select, key: Hashable) -> Optional[int]:
+        """Estimativa sem varrer a tabela: reltuples para a tabela inteira, EXPLAIN para filtros."""
+        if key == "all":
+            reltuples = (await self.db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'members'::regclass")
+            )).scalar()
+            # reltuples = -1 (ou 0 em versões antigas) enquanto a tabela nunca foi analisada
+            return int(reltuples) if reltuples and reltuples > 0 else None
+
+        sql = str(statement.compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"literal_binds": True}
+        ))
+        plan = (await self.db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
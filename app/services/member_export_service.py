@@ -0,0 +1,78 @@
+import csv
+import enum
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.member import Member, MemberStatusEnum
+
+
+class ExportFormatEnum(str, enum.Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormatEnum.ndjson: "application/x-ndjson",
+    ExportFormatEnum.csv: "text/csv"
+}
+
+EXPORT_COLUMNS = [
+    'id', 'name', 'position', 'biography', 'document', 'photo_url', 'address_id',
+    'status', 'expired_at', 'profile_id', 'created_at', 'updated_at'
+]
+
+
+def _plain(value):
+    """Converte enums e datas para valores serializáveis em JSON/CSV."""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class MemberExportService:
+    """Service responsável por exportar a base de membros em streaming."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _batches(self, status: Optional[MemberStatusEnum], profile_id: Optional[int]) -> AsyncIterator[list]:
+        """Lê os membros por um cursor no servidor, em lotes de member_export_batch_size linhas."""
+        statement = select(*[getattr(Member, column) for column in EXPORT_COLUMNS]).order_by(Member.id)
+        if status is not None:
+            statement = statement.where(Member.status == status)
+        if profile_id is not None:
+            statement = statement.where(Member.profile_id == profile_id)
+
+        result = await self.db.stream(
+            statement.execution_options(yield_per=settings.member_export_batch_size)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+    async def export(self, export_format: ExportFormatEnum, status: Optional[MemberStatusEnum] = None,
+                     profile_id: Optional[int] = None) -> AsyncIterator[str]:
+        """Gera o conteúdo da exportação lote a lote; a memória usada não depende do total de membros."""
+        if export_format == ExportFormatEnum.csv:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+            async for rows in self._batches(status, profile_id):
+                writer.writerows([[_plain(value) for value in row] for row in rows])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue()
+            return
+
+        async for rows in self._batches(status, profile_id):
+            yield "".join(
+                json.dumps(dict(zip(EXPORT_COLUMNS, [_plain(value) for value in row])), ensure_ascii=False) + "\n"
+                for row in rows
+            )
@@ -0,0 +1,137 @@
+import enum
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.dto.upsert_data_dto import MemberUpsertDTO, CompanyUpsertDTO
+from app.services.bulk_upsert_service import BulkUpsertService
+from app.services.upsert_normalizer import normalize_records
+from app.services.member_count_service import MemberCountService
+from app.services.member_response_cache import invalidate_member_response_cache
+
+
+class ImportEntityEnum(str, enum.Enum):
+    members = "members"
+    companies = "companies"
+
+
+IMPORT_DTOS = {
+    ImportEntityEnum.members: MemberUpsertDTO,
+    ImportEntityEnum.companies: CompanyUpsertDTO
+}
+
+# Limite de mensagens de erro guardadas na importação; o total de erros continua sendo contado
+MAX_IMPORT_ERRORS = 1000
+
+
+async def iter_ndjson_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Divide um corpo NDJSON recebido em pedaços em (número da linha, linha), ignorando linhas vazias."""
+    line_number = 0
+    pending = b""
+    async for data in stream:
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if pending.strip():
+        yield line_number + 1, pending
+
+
+class MemberImportService:
+    """
+    Service responsável pela importação em streaming de arquivos NDJSON de membros ou empresas.
+    Cada chunk usa uma sessão própria, aberta só para gravá-lo: enquanto o corpo é lido,
+    nenhuma conexão do pool fica presa.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _format_error(line_number: int, error: ValidationError) -> str:
+        """Resume o primeiro erro de validação de uma linha."""
+        detail = error.errors()[0]
+        location = ".".join(str(part) for part in detail["loc"])
+        return f"Linha {line_number}: {detail['msg']}" + (f" ({location})" if location else "")
+
+    async def _apply_chunk(self, entity: ImportEntityEnum, records: List[Any]) -> Dict[str, Any]:
+        """Aplica um chunk em sua própria sessão e transação; uma falha desfaz apenas este chunk."""
+        rows = normalize_records(entity.value, records)
+        if not rows:
+            return {"failed": False, "created": 0, "updated": 0, "errors": []}
+        async with self.session_factory() as db:
+            bulk = BulkUpsertService(db)
+            try:
+                if entity == ImportEntityEnum.companies:
+                    await bulk.upsert_companies(rows)
+                else:
+                    await bulk.upsert_members(rows)
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                return {"failed": True, "created": 0, "updated": 0, "errors": [f"Erro ao aplicar chunk: {str(e)}"]}
+
+        return {
+            "failed": False,
+            "created": bulk.created_count.get(entity.value, 0),
+            "updated": bulk.updated_count.get(entity.value, 0),
+            "errors": bulk.errors
+        }
+
+    async def import_ndjson(self, stream: AsyncIterator[bytes], entity: ImportEntityEnum, chunk_size: int) -> Dict[str, Any]:
+        """
+        Lê o NDJSON linha a linha, valida cada registro com o DTO de upsert e grava
+        a cada chunk_size linhas, cada chunk em sua transação. Retorna só os totais e até
+        MAX_IMPORT_ERRORS mensagens de erro, então a memória fica limitada ao tamanho do chunk.
+        """
+        dto_class = IMPORT_DTOS[entity]
+        totals = {"lines": 0, "records": 0, "invalid": 0, "created": 0, "updated": 0,
+                  "chunks": 0, "failed_chunks": 0, "error_count": 0}
+        errors: List[str] = []
+
+        def report(message: str) -> None:
+            totals["error_count"] += 1
+            if len(errors) < MAX_IMPORT_ERRORS:
+                errors.append(message)
+
+        records, invalid, first_line = [], 0, None
+
+        async def flush(last_line: int):
+            totals["chunks"] += 1
+            totals["records"] += len(records)
+            totals["invalid"] += invalid
+            if not records:
+                return
+            result = await self._apply_chunk(entity, records)
+            totals["created"] += result["created"]
+            totals["updated"] += result["updated"]
+            totals["failed_chunks"] += result["failed"]
+            # Erros da gravação não têm número de linha: identifica o chunk pelas linhas que ele cobre
+            for message in result["errors"]:
+                report(f"Linhas {first_line}-{last_line}: {message}")
+
+        last_line = 0
+        async for line_number, line in iter_ndjson_lines(stream):
+            totals["lines"] += 1
+            last_line = line_number
+            if first_line is None:
+                first_line = line_number
+            try:
+                records.append(dto_class.model_validate_json(line))
+            except ValidationError as e:
+                invalid += 1
+                report(self._format_error(line_number, e))
+
+            # O chunk fecha por linhas lidas, então linhas inválidas também não acumulam memória
+            if len(records) + invalid >= chunk_size:
+                await flush(line_number)
+                records, invalid, first_line = [], 0, None
+
+        if first_line is not None:
+            await flush(last_line)
+
+        MemberCountService.invalidate()
+        invalidate_member_response_cache()
+
+        return {"entity": entity.value, "chunk_size": chunk_size, **totals, "errors": errors}
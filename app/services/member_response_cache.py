@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Hashable, Optional, Tuple
+from app.core.config import settings
+
+CachedResponse = Tuple[bytes, str, Optional[datetime]]  # (corpo JSON, ETag, Last-Modified)
+
+# Cache em memória do processo: chave -> (resposta, expira_em), do menos para o mais recentemente usado
+_response_cache: "OrderedDict[Hashable, Tuple[CachedResponse, float]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+_response_cache_generation = 0
+
+
+def invalidate_member_response_cache() -> None:
+    """
+    Descarta as respostas de membros em cache neste processo; chamado pelos fluxos que
+    criam, alteram ou removem membros. Outros workers enxergam a mudança quando o TTL expira.
+    """
+    global _response_cache_generation
+    with _response_cache_lock:
+        _response_cache_generation += 1
+        _response_cache.clear()
+
+
+class MemberResponseCache:
+    """
+    Cache LRU com TTL das respostas JSON já serializadas de GET /members e GET /members/{id}.
+    Desativado com `member_response_cache_ttl = 0`.
+    """
+
+    def __init__(self):
+        self.generation = _response_cache_generation
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.member_response_cache_ttl > 0
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Resposta em cache ainda válida para a chave; também marca a geração da leitura."""
+        if not self.enabled():
+            return None
+        now = time.monotonic()
+        with _response_cache_lock:
+            self.generation = _response_cache_generation
+            cached = _response_cache.get(key)
+            if cached is None:
+                return None
+            if cached[1] <= now:
+                del _response_cache[key]
+                return None
+            _response_cache.move_to_end(key)
+            return cached[0]
+
+    def put(self, key: Hashable, response: CachedResponse) -> None:
+        """Guarda a resposta, descartando as menos usadas acima de `member_response_cache_max_entries`."""
+        if not self.enabled():
+            return
+        with _response_cache_lock:
+            # Não grava se houve invalidação depois da leitura do banco
+            if self.generation != _response_cache_generation:
+                return
+            _response_cache[key] = (response, time.monotonic() + settings.member_response_cache_ttl)
+            _response_cache.move_to_end(key)
+            while len(_response_cache) > settings.member_response_cache_max_entries:
+                _response_cache.popitem(last=False)
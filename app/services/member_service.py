@@ -1,45 +1,51 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, and_, or_, func, literal, select
+from sqlalchemy.types import REAL
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
 from typing import Optional, Tuple, List
 from app.models.member import Member
-from app.models.address import Address
-from app.models.contact_channel import ContactChannel
-from app.models.additional_info import AdditionalInfo
 from app.models.company import Company
-from app.models.market_segmentation import MarketSegmentation
-from app.models.performance import Performance
 from app.models.member_company import MemberCompany
-from app.models.profile import Profile
-from app.dto.member_dto import MemberCreateDTO, MemberUpdateDTO
+from app.models.market_segmentation import MarketSegmentation
+from app.dto.member_dto import MemberCreateDTO, MemberUpdateDTO, MemberSearchDTO, MemberResponseDTO, NameMatchEnum
 from app.dto.upsert_data_dto import UpsertDataRequestDTO
 from app.dto.market_segmentation_dto import MarketSegmentationCreateDTO, MarketSegmentationUpdateDTO
-from app.seeds.profiles_seed import seed_profiles
+from app.seeds.profiles_seed import seed_profiles, PROFILES_DATA
+from app.services.bulk_upsert_service import BulkUpsertService
+from app.services.upsert_normalizer import MergePolicyEnum, normalize_payload
+from app.services.member_count_service import MemberCountService, CountModeEnum
+from app.services.member_response_cache import invalidate_member_response_cache
+from app.services.reference_cache import (
+    ReferenceCache,
+    invalidate_reference_cache,
+    MARKET_SEGMENTATIONS
+)
 from datetime import datetime
 
+# Colunas de MemberResponseDTO, lidas como tuplas na listagem (sem carregar entidades ORM)
+MEMBER_RESPONSE_COLUMNS = [getattr(Member, field) for field in MemberResponseDTO.model_fields]
+
 
 class MemberService:
     """Service responsável pela lógica de negócio relacionada aos membros."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
+        self.counter = MemberCountService(db)
+        self.references = ReferenceCache(db)
     
-    def _validate_foreign_key(self, model_class, field_name, value):
-        """Valida se uma foreign key existe na tabela."""
-        if value is None or value == 0:
-            return False
-        return self.db.query(model_class).filter(getattr(model_class, field_name) == value).first() is not None
-    
-    def _safe_commit(self):
+    async def _safe_commit(self):
         """Faz commit seguro com tratamento de erros."""
         try:
-            self.db.commit()
+            await self.db.commit()
             return True
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise Exception(f"Erro de integridade: {str(e)}")
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise Exception(f"Erro ao salvar dados: {str(e)}")
     
     async def populate_initial_data(self) -> dict:
@@ -48,11 +54,11 @@ class MemberService:
         Atualmente popula a tabela profiles com dados padrão.
         """
         try:
-            # Executar seed dos profiles
-            seed_profiles(self.db)
+            # Reaplicar o seed dos profiles (código síncrono executado pela ponte do AsyncSession)
+            applied = await self.db.run_sync(seed_profiles, True)
             
             return {
-                "profiles_updated": True,
+                "profiles_updated": applied,
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             }
         except Exception as e:
@@ -60,28 +66,61 @@ class MemberService:
     
     async def get_member_by_id(self, member_id: int) -> Optional[Member]:
         """Busca um membro pelo ID."""
-        return self.db.query(Member).filter(Member.id == member_id).first()
+        return await self.db.get(Member, member_id)
+    
+    @staticmethod
+    def _complete_options() -> list:
+        """
+        Estratégias de carga do membro completo.
+        Relações para um usam JOIN na query principal e coleções usam selectinload,
+        então o número de queries é fixo independente da quantidade de membros.
+        """
+        return [
+            joinedload(Member.address),
+            joinedload(Member.profile),
+            joinedload(Member.additional_info),
+            selectinload(Member.contact_channels),
+            selectinload(Member.performance_events),
+            selectinload(Member.member_companies).joinedload(MemberCompany.company).options(
+                joinedload(Company.address),
+                joinedload(Company.market_segmentation),
+                selectinload(Company.performances)
+            )
+        ]
+    
+    async def get_complete_member(self, member_id: int) -> Optional[Member]:
+        """Busca um membro pelo ID com todos os relacionamentos carregados."""
+        members = await self.get_complete_members([member_id])
+        return members[0] if members else None
+    
+    async def get_complete_members(self, member_ids: List[int]) -> List[Member]:
+        """Busca vários membros com todos os relacionamentos, na ordem dos IDs informados."""
+        result = await self.db.scalars(
+            select(Member).where(Member.id.in_(member_ids)).options(*self._complete_options())
+        )
+        members_by_id = {member.id: member for member in result}
+        return [members_by_id[member_id] for member_id in dict.fromkeys(member_ids) if member_id in members_by_id]
     
     async def create_member(self, member_data: MemberCreateDTO) -> Member:
         """Cria um novo membro."""
         try:
-            # Verificar se já existe um membro com o mesmo documento
-            existing_member = self.db.query(Member).filter(
-                Member.document == member_data.document
-            ).first()
+            # Criar novo membro; o índice único de documento resolve o conflito em um único statement
+            statement = pg_insert(Member).values(**member_data.dict()).on_conflict_do_nothing(
+                index_elements=[Member.document]
+            ).returning(Member)
+            member = (await self.db.scalars(statement)).first()
             
-            if existing_member:
+            if not member:
                 raise ValueError("Já existe um membro com este documento")
             
-            # Criar novo membro
-            member = Member(**member_data.dict())
-            self.db.add(member)
-            self.db.commit()
-            self.db.refresh(member)
+            await self.db.commit()
+            self.counter.invalidate()
+            invalidate_member_response_cache()
+            await self.db.refresh(member)
             
             return member
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise Exception(f"Erro ao criar membro: {str(e)}")
     
     async def update_member(self, member_id: int, member_data: MemberUpdateDTO) -> Optional[Member]:
@@ -93,9 +132,9 @@ class MemberService:
             
             # Verificar se o documento está sendo alterado e se já existe outro membro com ele
             if member_data.document and member_data.document != member.document:
-                existing_member = self.db.query(Member).filter(
-                    and_(Member.document == member_data.document, Member.id != member_id)
-                ).first()
+                existing_member = (await self.db.scalars(
+                    select(Member).where(and_(Member.document == member_data.document, Member.id != member_id))
+                )).first()
                 
                 if existing_member:
                     raise ValueError("Já existe outro membro com este documento")
@@ -107,12 +146,15 @@ class MemberService:
             
             member.updated_at = datetime.utcnow()
             
-            self.db.commit()
-            self.db.refresh(member)
+            await self.db.commit()
+            # Status e perfil alteram os totais filtrados
+            self.counter.invalidate()
+            invalidate_member_response_cache()
+            await self.db.refresh(member)
             
             return member
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise Exception(f"Erro ao atualizar membro: {str(e)}")
     
     async def delete_member(self, member_id: int) -> bool:
@@ -122,341 +164,221 @@ class MemberService:
             if not member:
                 return False
             
-            self.db.delete(member)
-            self.db.commit()
+            await self.db.delete(member)
+            await self.db.commit()
+            self.counter.invalidate()
+            invalidate_member_response_cache()
             
             return True
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise Exception(f"Erro ao remover membro: {str(e)}")
     
-    async def list_members(self, skip: int = 0, limit: int = 100) -> Tuple[List[Member], int]:
-        """Lista membros com paginação."""
+    async def _paginate(self, statement, skip: int, limit: int, after_id: Optional[int],
+                        rows: bool = False) -> Tuple[List[Member], Optional[int]]:
+        """
+        Aplica a paginação ordenada por ID.
+        Com `after_id` usa keyset (`id > after_id`), cujo custo independe da profundidade da página;
+        sem ele mantém o OFFSET. Retorna a página e o ID a partir do qual a próxima começa.
+        Com `rows`, retorna as linhas das colunas selecionadas em vez de entidades.
+        """
+        statement = statement.order_by(Member.id)
+        if after_id is not None:
+            statement = statement.where(Member.id > after_id)
+        else:
+            statement = statement.offset(skip)
+        
+        # Buscar um registro a mais para saber se existe próxima página
+        result = await self.db.execute(statement.limit(limit + 1))
+        members = list(result.all() if rows else result.scalars().all())
+        if len(members) > limit:
+            members = members[:limit]
+            return members, members[-1].id
+        return members, None
+    
+    async def list_members(self, skip: int = 0, limit: int = 100,
+                           after_id: Optional[int] = None,
+                           count_mode: Optional[CountModeEnum] = None) -> Tuple[List[Row], int, Optional[int], CountModeEnum]:
+        """Lista membros com paginação; cada membro é uma linha com as colunas de MemberResponseDTO."""
         try:
             # Buscar membros com paginação
-            members = self.db.query(Member).offset(skip).limit(limit).all()
+            members, next_after_id = await self._paginate(
+                select(*MEMBER_RESPONSE_COLUMNS), skip, limit, after_id, rows=True
+            )
             
             # Contar total de membros
-            total = self.db.query(Member).count()
+            total, count_mode = await self.counter.count(select(Member), "all", count_mode)
             
-            return members, total
+            return members, total, next_after_id, count_mode
         except Exception as e:
             raise Exception(f"Erro ao listar membros: {str(e)}")
     
-    async def get_members_by_status(self, status: str, skip: int = 0, limit: int = 100) -> Tuple[List[Member], int]:
+    async def search_members(self, search: MemberSearchDTO, after_id: Optional[int] = None,
+                             after_score: Optional[float] = None) -> Tuple[List[Member], Optional[Tuple[int, Optional[float]]]]:
+        """
+        Busca membros por nome (prefixo ou similaridade de trigramas) combinando filtros de status e perfil.
+        Prefixo é ordenado por ID; fuzzy por relevância e ID. Ambos usam keyset quando `after_id` é informado.
+        Retorna a página e a posição (ID, score) a partir da qual a próxima começa.
+        """
+        try:
+            filters = []
+            if search.status is not None:
+                filters.append(Member.status == search.status)
+            if search.profile_id is not None:
+                filters.append(Member.profile_id == search.profile_id)
+            term = (search.name or "").strip()
+            
+            if term and search.match == NameMatchEnum.fuzzy:
+                # O operador % usa o índice GIN de trigramas; similarity() define a ordem
+                score = func.similarity(Member.name, term)
+                statement = select(Member, score.label("score")).where(Member.name.op("%")(term), *filters)
+                if after_id is not None:
+                    last_score = literal(after_score, REAL)
+                    statement = statement.where(or_(score < last_score, and_(score == last_score, Member.id > after_id)))
+                else:
+                    statement = statement.offset(search.skip)
+                
+                rows = (await self.db.execute(
+                    statement.order_by(score.desc(), Member.id).limit(search.limit + 1)
+                )).all()
+                members = [row.Member for row in rows[:search.limit]]
+                if len(rows) > search.limit:
+                    last = rows[search.limit - 1]
+                    return members, (last.Member.id, last.score)
+                return members, None
+            
+            statement = select(Member).where(*filters)
+            if term:
+                # Escapar curingas do LIKE (a barra invertida é o escape padrão do PostgreSQL)
+                escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                statement = statement.where(Member.name.ilike(f"{escaped}%"))
+            
+            members, next_after_id = await self._paginate(statement, search.skip, search.limit, after_id)
+            return members, (next_after_id, None) if next_after_id is not None else None
+        except Exception as e:
+            raise Exception(f"Erro ao buscar membros: {str(e)}")
+    
+    async def get_members_by_status(self, status: str, skip: int = 0, limit: int = 100,
+                                    after_id: Optional[int] = None,
+                                    count_mode: Optional[CountModeEnum] = None) -> Tuple[List[Member], int, Optional[int], CountModeEnum]:
         """Lista membros por status com paginação."""
         try:
             # Buscar membros por status com paginação
-            members = self.db.query(Member).filter(
-                Member.status == status
-            ).offset(skip).limit(limit).all()
+            members, next_after_id = await self._paginate(
+                select(Member).where(Member.status == status), skip, limit, after_id
+            )
             
             # Contar total de membros com este status
-            total = self.db.query(Member).filter(Member.status == status).count()
+            total, count_mode = await self.counter.count(
+                select(Member).where(Member.status == status), ("status", status), count_mode
+            )
             
-            return members, total
+            return members, total, next_after_id, count_mode
         except Exception as e:
             raise Exception(f"Erro ao listar membros por status: {str(e)}")
     
-    async def get_members_by_profile(self, profile_id: int, skip: int = 0, limit: int = 100) -> Tuple[List[Member], int]:
+    async def get_members_by_profile(self, profile_id: int, skip: int = 0, limit: int = 100,
+                                     after_id: Optional[int] = None,
+                                     count_mode: Optional[CountModeEnum] = None) -> Tuple[List[Member], int, Optional[int], CountModeEnum]:
         """Lista membros por perfil com paginação."""
         try:
             # Buscar membros por perfil com paginação
-            members = self.db.query(Member).filter(
-                Member.profile_id == profile_id
-            ).offset(skip).limit(limit).all()
+            members, next_after_id = await self._paginate(
+                select(Member).where(Member.profile_id == profile_id), skip, limit, after_id
+            )
             
             # Contar total de membros com este perfil
-            total = self.db.query(Member).filter(Member.profile_id == profile_id).count()
+            total, count_mode = await self.counter.count(
+                select(Member).where(Member.profile_id == profile_id), ("profile", profile_id), count_mode
+            )
             
-            return members, total
+            return members, total, next_after_id, count_mode
         except Exception as e:
             raise Exception(f"Erro ao listar membros por perfil: {str(e)}")
     
-    async def upsert_data(self, request_data: UpsertDataRequestDTO) -> dict:
+    async def upsert_data(self, request_data: UpsertDataRequestDTO,
+                          merge_policy: Optional[MergePolicyEnum] = None) -> dict:
         """
         Cria ou atualiza dados do sistema.
         Suporta upsert de todas as tabelas relacionadas.
-        Campos únicos duplicados são ignorados.
+        Registros repetidos no payload são combinados pela `merge_policy` (padrão em Settings).
         Objetos vazios são desconsiderados.
         """
         try:
-            created_count = {}
-            updated_count = {}
-            errors = []
-            processed_company_ids: List[int] = []
-            created_member_ids: List[int] = []  # Adicionar esta linha
+            bulk = BulkUpsertService(self.db, merge_policy)
             
-            # Filtrar apenas objetos não vazios
-            filtered_data = request_data.get_non_empty_objects()
+            # Normalizar em uma passada: descarta objetos vazios e monta as linhas de cada entidade
+            filtered_data = normalize_payload(request_data)
             
-            # Executar seed dos profiles primeiro (sempre)
-            seed_profiles(self.db)
-            created_count["profiles"] = 4  # 4 profiles padrão
+            # Profiles padrão são garantidos pelo seed versionado no startup (sem custo aqui)
+            bulk.created_count["profiles"] = len(PROFILES_DATA)
             
             # Market Segmentations: removido deste endpoint. Use endpoint dedicado.
             
             # Upsert Companies
             if filtered_data.get("companies"):
-                created_count["companies"] = 0
-                updated_count["companies"] = 0
-                
-                for company_data in filtered_data["companies"]:
-                    try:
-                        # Normalizar documento (ignorar placeholders como "string", "0" ou vazio)
-                        normalized_doc = None
-                        if getattr(company_data, 'document', None):
-                            doc_str = str(company_data.document).strip()
-                            if doc_str and doc_str.lower() not in {"string"} and doc_str not in {"0"}:
-                                normalized_doc = doc_str
-
-                        # Verificar se já existe por CNPJ válido, senão tentar por nome
-                        existing = None
-                        if normalized_doc:
-                            existing = self.db.query(Company).filter(Company.document == normalized_doc).first()
-                        elif getattr(company_data, 'name', None):
-                            existing = self.db.query(Company).filter(Company.name == company_data.name).first()
-                        
-                        if existing:
-                            # Atualizar se necessário
-                            company_dict = company_data.dict(exclude_unset=True, exclude={'address'})
-                            # Sobrescrever documento com o normalizado
-                            if 'document' in company_dict:
-                                company_dict['document'] = normalized_doc
-                            
-                            # Validar foreign keys antes de atualizar
-                            if 'market_segmentation_id' in company_dict and company_dict['market_segmentation_id']:
-                                if not self._validate_foreign_key(MarketSegmentation, 'id', company_dict['market_segmentation_id']):
-                                    errors.append(f"Market segmentation ID {company_dict['market_segmentation_id']} não existe")
-                                    continue
-                            
-                            for key, value in company_dict.items():
-                                if value is not None and getattr(existing, key) != value:
-                                    setattr(existing, key, value)
-                                    updated_count["companies"] += 1
-
-                            # Adicionar ID da empresa processada
-                            if existing.id not in processed_company_ids:
-                                processed_company_ids.append(existing.id)
-                        else:
-                            # Criar novo (já filtrado, então sempre tem dados)
-                            company_dict = company_data.dict(exclude_unset=True, exclude={'address'})
-                            # Sobrescrever documento com o normalizado
-                            if 'document' in company_dict:
-                                company_dict['document'] = normalized_doc
-                            
-                            # Validar foreign keys antes de criar
-                            if 'market_segmentation_id' in company_dict and company_dict['market_segmentation_id']:
-                                if not self._validate_foreign_key(MarketSegmentation, 'id', company_dict['market_segmentation_id']):
-                                    errors.append(f"Market segmentation ID {company_dict['market_segmentation_id']} não existe")
-                                    continue
-                            
-                            # Criar endereço se fornecido
-                            address_id = None
-                            if company_data.address:
-                                address_dict = company_data.address.dict(exclude_unset=True)
-                                if address_dict:
-                                    address = Address(**address_dict)
-                                    self.db.add(address)
-                                    self.db.flush()
-                                    address_id = address.id
-                            
-                            if address_id:
-                                company_dict['address_id'] = address_id
-                            company = Company(**company_dict)
-                            self.db.add(company)
-                            # Garantir ID disponível para vinculação
-                            self.db.flush()
-                            if company.id and company.id not in processed_company_ids:
-                                processed_company_ids.append(company.id)
-                            created_count["companies"] += 1
-                    except Exception as e:
-                        errors.append(f"Erro ao processar empresa {company_data.name}: {str(e)}")
+                await bulk.upsert_companies(filtered_data["companies"])
             
             # Upsert Members
             if filtered_data.get("members"):
-                created_count["members"] = 0
-                updated_count["members"] = 0
-                
-                for member_data in filtered_data["members"]:
-                    try:
-                        # Verificar se já existe por CPF
-                        existing = None
-                        if member_data.document:
-                            existing = self.db.query(Member).filter(
-                                Member.document == member_data.document
-                            ).first()
-                        
-                        if existing:
-                            # Atualizar se necessário
-                            member_dict = member_data.dict(exclude_unset=True, exclude={'address', 'contact_channels', 'additional_info'})
-                            
-                            # Validar foreign keys antes de atualizar
-                            if 'profile_id' in member_dict and member_dict['profile_id']:
-                                if not self._validate_foreign_key(Profile, 'id', member_dict['profile_id']):
-                                    errors.append(f"Profile ID {member_dict['profile_id']} não existe")
-                                    continue
-                            
-                            for key, value in member_dict.items():
-                                if value is not None and getattr(existing, key) != value:
-                                    setattr(existing, key, value)
-                                    updated_count["members"] += 1
-
-                            # Vincular membro às empresas processadas (evitar duplicatas)
-                            if processed_company_ids:
-                                for company_id in processed_company_ids:
-                                    existing_relation = self.db.query(MemberCompany).filter(
-                                        and_(
-                                            MemberCompany.member_id == existing.id,
-                                            MemberCompany.company_id == company_id
-                                        )
-                                    ).first()
-                                    if not existing_relation:
-                                        self.db.add(MemberCompany(
-                                            member_id=existing.id,
-                                            company_id=company_id,
-                                            created_at=datetime.utcnow()
-                                        ))
-                        else:
-                            # Criar novo (já filtrado, então sempre tem dados)
-                            member_dict = member_data.dict(exclude_unset=True, exclude={'address', 'contact_channels', 'additional_info'})
-                            
-                            # Validar foreign keys antes de criar
-                            if 'profile_id' in member_dict and member_dict['profile_id']:
-                                if not self._validate_foreign_key(Profile, 'id', member_dict['profile_id']):
-                                    errors.append(f"Profile ID {member_dict['profile_id']} não existe")
-                                    continue
-                            
-                            # Criar endereço se fornecido
-                            address_id = None
-                            if member_data.address:
-                                address_dict = member_data.address.dict(exclude_unset=True)
-                                if address_dict:
-                                    address = Address(**address_dict)
-                                    self.db.add(address)
-                                    self.db.flush()
-                                    address_id = address.id
-                            
-                            if address_id:
-                                member_dict['address_id'] = address_id
-                            member = Member(**member_dict)
-                            self.db.add(member)
-                            self.db.flush()
-                            created_count["members"] += 1
-                            created_member_ids.append(member.id)  # Adicionar esta linha
-                            
-                            # Criar canais de contato se fornecidos
-                            if member_data.contact_channels:
-                                for channel_data in member_data.contact_channels:
-                                    channel_dict = channel_data.dict(exclude_unset=True)
-                                    if channel_dict:
-                                        channel_dict['member_id'] = member.id
-                                        channel = ContactChannel(**channel_dict)
-                                        self.db.add(channel)
-                            
-                            # Criar informações adicionais se fornecidas
-                            if member_data.additional_info:
-                                additional_dict = member_data.additional_info.dict(exclude_unset=True)
-                                if additional_dict:
-                                    additional_dict['member_id'] = member.id
-                                    additional_info = AdditionalInfo(**additional_dict)
-                                    self.db.add(additional_info)
-
-                            # Vincular novo membro às empresas processadas (evitar duplicatas)
-                            if processed_company_ids:
-                                for company_id in processed_company_ids:
-                                    existing_relation = self.db.query(MemberCompany).filter(
-                                        and_(
-                                            MemberCompany.member_id == member.id,
-                                            MemberCompany.company_id == company_id
-                                        )
-                                    ).first()
-                                    if not existing_relation:
-                                        self.db.add(MemberCompany(
-                                            member_id=member.id,
-                                            company_id=company_id,
-                                            created_at=datetime.utcnow()
-                                        ))
-                    except Exception as e:
-                        errors.append(f"Erro ao processar membro {member_data.name}: {str(e)}")
+                await bulk.upsert_members(filtered_data["members"])
             
             # Upsert Performances
             if filtered_data.get("performances"):
-                created_count["performances"] = 0
-                updated_count["performances"] = 0
-                
-                for perf_data in filtered_data["performances"]:
-                    try:
-                        # Criar nova performance (já filtrado, então sempre tem dados)
-                        perf_dict = perf_data.dict(exclude_unset=True)
-                        
-                        # Validar foreign keys antes de criar
-                        if 'company_id' in perf_dict and perf_dict['company_id']:
-                            if not self._validate_foreign_key(Company, 'id', perf_dict['company_id']):
-                                errors.append(f"Company ID {perf_dict['company_id']} não existe")
-                                continue
-                        
-                        performance = Performance(**perf_dict)
-                        self.db.add(performance)
-                        created_count["performances"] += 1
-                    except Exception as e:
-                        errors.append(f"Erro ao processar performance: {str(e)}")
+                await bulk.insert_performances(filtered_data["performances"])
             
             # Commit seguro com tratamento de erros
-            self._safe_commit()
+            await self._safe_commit()
+            self.counter.invalidate()
+            invalidate_member_response_cache()
             
             return {
-                "created_count": created_count,
-                "updated_count": updated_count,
-                "errors": errors,
-                "created_member_ids": created_member_ids,  # Adicionar esta linha
+                **bulk.result(),
                 "timestamp": datetime.utcnow().isoformat() + "Z"
             }
             
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise Exception(f"Erro ao processar dados: {str(e)}")
     
     # ==================== MARKET SEGMENTATIONS ====================
     
-    def list_market_segmentations(self) -> List[MarketSegmentation]:
-        """Lista todas as segmentações de mercado."""
-        return self.db.query(MarketSegmentation).all()
+    async def list_market_segmentations(self) -> list:
+        """Lista todas as segmentações de mercado (servidas pelo cache de referência)."""
+        return await self.references.market_segmentations()
     
-    def get_market_segmentation(self, segmentation_id: int) -> Optional[MarketSegmentation]:
+    async def get_market_segmentation(self, segmentation_id: int) -> Optional[MarketSegmentation]:
         """Busca uma segmentação de mercado por ID."""
-        return self.db.query(MarketSegmentation).filter(MarketSegmentation.id == segmentation_id).first()
+        return await self.db.get(MarketSegmentation, segmentation_id)
     
-    def create_market_segmentation(self, segmentation_data: MarketSegmentationCreateDTO) -> MarketSegmentation:
+    async def create_market_segmentation(self, segmentation_data: MarketSegmentationCreateDTO) -> MarketSegmentation:
         """Cria uma nova segmentação de mercado."""
-        # Verificar se já existe por nome
-        existing = self.db.query(MarketSegmentation).filter(
-            MarketSegmentation.name == segmentation_data.name
-        ).first()
-        
-        if existing:
-            raise ValueError(f"Segmentação de mercado com nome '{segmentation_data.name}' já existe")
-        
-        segmentation = MarketSegmentation(
+        # Criar ignorando conflito de nome (índice único) em um único statement
+        statement = pg_insert(MarketSegmentation).values(
             name=segmentation_data.name,
             created_at=datetime.utcnow()
-        )
+        ).on_conflict_do_nothing(index_elements=[MarketSegmentation.name]).returning(MarketSegmentation)
+        segmentation = (await self.db.scalars(statement)).first()
+        
+        if not segmentation:
+            await self.db.rollback()
+            raise ValueError(f"Segmentação de mercado com nome '{segmentation_data.name}' já existe")
         
-        self.db.add(segmentation)
-        self._safe_commit()
+        await self._safe_commit()
+        invalidate_reference_cache(MARKET_SEGMENTATIONS)
         return segmentation
     
-    def update_market_segmentation(self, segmentation_id: int, segmentation_data: MarketSegmentationUpdateDTO) -> Optional[MarketSegmentation]:
+    async def update_market_segmentation(self, segmentation_id: int, segmentation_data: MarketSegmentationUpdateDTO) -> Optional[MarketSegmentation]:
         """Atualiza uma segmentação de mercado."""
-        segmentation = self.get_market_segmentation(segmentation_id)
+        segmentation = await self.get_market_segmentation(segmentation_id)
         if not segmentation:
             return None
         
         # Verificar se o novo nome já existe (se fornecido)
         if segmentation_data.name and segmentation_data.name != segmentation.name:
-            existing = self.db.query(MarketSegmentation).filter(
-                MarketSegmentation.name == segmentation_data.name
-            ).first()
+            existing = (await self.db.scalars(
+                select(MarketSegmentation).where(MarketSegmentation.name == segmentation_data.name)
+            )).first()
             
             if existing:
                 raise ValueError(f"Segmentação de mercado com nome '{segmentation_data.name}' já existe")
@@ -466,48 +388,44 @@ class MemberService:
             segmentation.name = segmentation_data.name
             segmentation.updated_at = datetime.utcnow()
         
-        self._safe_commit()
+        await self._safe_commit()
+        invalidate_reference_cache(MARKET_SEGMENTATIONS)
         return segmentation
     
-    def delete_market_segmentation(self, segmentation_id: int) -> bool:
+    async def delete_market_segmentation(self, segmentation_id: int) -> bool:
         """Remove uma segmentação de mercado."""
-        segmentation = self.get_market_segmentation(segmentation_id)
+        segmentation = await self.get_market_segmentation(segmentation_id)
         if not segmentation:
             return False
         
-        self.db.delete(segmentation)
-        self._safe_commit()
+        await self.db.delete(segmentation)
+        await self._safe_commit()
+        invalidate_reference_cache(MARKET_SEGMENTATIONS)
         return True
     
-    def create_multiple_market_segmentations(self, segmentations_data: List[MarketSegmentationCreateDTO]) -> dict:
+    async def create_multiple_market_segmentations(self, segmentations_data: List[MarketSegmentationCreateDTO]) -> dict:
         """Cria múltiplas segmentações de mercado."""
         created_segmentations = []
         errors = []
         
-        for seg_data in segmentations_data:
-            try:
-                # Verificar se já existe por nome
-                existing = self.db.query(MarketSegmentation).filter(
-                    MarketSegmentation.name == seg_data.name
-                ).first()
-                
-                if existing:
+        if segmentations_data:
+            # Inserir todas em um único statement; nomes já existentes são ignorados pelo ON CONFLICT
+            statement = pg_insert(MarketSegmentation).on_conflict_do_nothing(
+                index_elements=[MarketSegmentation.name]
+            ).returning(MarketSegmentation)
+            rows = [{"name": seg_data.name, "created_at": datetime.utcnow()} for seg_data in segmentations_data]
+            created_by_name = {seg.name: seg for seg in (await self.db.scalars(statement, rows)).all()}
+            
+            for seg_data in segmentations_data:
+                segmentation = created_by_name.pop(seg_data.name, None)
+                if segmentation is None:
                     errors.append(f"Segmentação '{seg_data.name}' já existe")
                     continue
-                
-                segmentation = MarketSegmentation(
-                    name=seg_data.name,
-                    created_at=datetime.utcnow()
-                )
-                
-                self.db.add(segmentation)
                 created_segmentations.append(segmentation)
-                
-            except Exception as e:
-                errors.append(f"Erro ao criar segmentação '{seg_data.name}': {str(e)}")
         
         if created_segmentations:
-            self._safe_commit()
+            await self._safe_commit()
+            invalidate_reference_cache(MARKET_SEGMENTATIONS)
         
         return {
             "created_segmentations": created_segmentations,
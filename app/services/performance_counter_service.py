@@ -0,0 +1,237 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Integer, any_, bindparam, column, func, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.performance import Performance
+from app.models.performance_event import PerformanceEvent, PerformanceEventTypeEnum
+
+logger = logging.getLogger(__name__)
+
+# Chave do advisory lock que serializa as reconciliações entre processos
+COUNTER_RECONCILE_LOCK_KEY = 7_340_003
+
+# Contadores de Performance derivados de performance_events (referrals_given não tem evento correspondente)
+COUNTER_FIELDS = ["count_closed_deals", "value_closed_deals", "referrals_received", "total_value_per_referral"]
+
+
+def array_param(name: str, values: List, item_type=Integer):
+    """Parâmetro array para `unnest`, para enviar um lote inteiro em um único statement."""
+    return bindparam(name, values, type_=ARRAY(item_type))
+
+
+def _counters_table(counters: Dict[int, List[int]]):
+    """Tabela derivada (unnest) com uma linha por performance e uma coluna por contador, ordenada por ID."""
+    ids = sorted(counters)
+    return func.unnest(
+        array_param("ids", ids),
+        *[array_param(field, [counters[i][position] for i in ids]) for position, field in enumerate(COUNTER_FIELDS)]
+    ).table_valued(
+        column("id", Integer),
+        *[column(field, Integer) for field in COUNTER_FIELDS]
+    ).render_derived(name="counters")
+
+
+class PerformanceCounterService:
+    """
+    Service responsável pelos contadores de Performance derivados de performance_events.
+
+    A ingestão soma os eventos aos contadores com `UPDATE ... SET x = x + delta`, uma linha por
+    performance e um statement por lote; a reconciliação percorre as performances em lotes por
+    ID, recalcula os contadores a partir dos eventos e corrige as divergentes em um `UPDATE` por lote.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply_events(self, events: List[Any]) -> int:
+        """
+        Soma os eventos aos contadores de cada performance. As linhas já devem estar travadas
+        pelo chamador (ver PerformanceEventService). Retorna quantas performances foram atualizadas.
+        """
+        deltas = defaultdict(lambda: [0, 0, 0, 0])
+        for event in events:
+            delta = deltas[event.performance_id]
+            if event.type == PerformanceEventTypeEnum.transaction:
+                delta[0] += 1
+                delta[1] += event.value or 0
+            else:
+                delta[2] += 1
+                delta[3] += event.value or 0
+        if not deltas:
+            return 0
+
+        totals = _counters_table(deltas)
+        await self.db.execute(
+            update(Performance)
+            .where(Performance.id == totals.c.id)
+            .values(
+                **{field: func.coalesce(getattr(Performance, field), 0) + totals.c[field] for field in COUNTER_FIELDS},
+                updated_at=func.now()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return len(deltas)
+
+    @staticmethod
+    def _expected_counters(performance_ids: List[int]):
+        """SELECT dos contadores esperados das performances informadas, agregando performance_events."""
+        transaction = PerformanceEvent.type == PerformanceEventTypeEnum.transaction
+        referral = PerformanceEvent.type == PerformanceEventTypeEnum.referral
+        value = PerformanceEvent.value
+        return select(
+            PerformanceEvent.performance_id.label("id"),
+            func.count().filter(transaction).label("count_closed_deals"),
+            func.coalesce(func.sum(value).filter(transaction), 0).label("value_closed_deals"),
+            func.count().filter(referral).label("referrals_received"),
+            func.coalesce(func.sum(value).filter(referral), 0).label("total_value_per_referral")
+        ).where(
+            PerformanceEvent.performance_id == any_(array_param("expected_ids", performance_ids))
+        ).group_by(PerformanceEvent.performance_id).subquery()
+
+    async def _drifted(self, performance_ids: List[int]) -> List[Any]:
+        """Performances, entre as informadas, com algum contador diferente do calculado pelos eventos."""
+        expected = self._expected_counters(performance_ids)
+        stored = {field: func.coalesce(getattr(Performance, field), 0) for field in COUNTER_FIELDS}
+        computed = {field: func.coalesce(expected.c[field], 0) for field in COUNTER_FIELDS}
+        return (await self.db.execute(
+            select(
+                Performance.id,
+                *[stored[field].label(f"stored_{field}") for field in COUNTER_FIELDS],
+                *[computed[field].label(f"expected_{field}") for field in COUNTER_FIELDS]
+            )
+            .outerjoin(expected, expected.c.id == Performance.id)
+            .where(
+                Performance.id == any_(array_param("performance_ids", performance_ids)),
+                or_(*[stored[field] != computed[field] for field in COUNTER_FIELDS])
+            )
+            .order_by(Performance.id)
+        )).all()
+
+    async def _fix(self, performance_ids: List[int]) -> List[Any]:
+        """
+        Trava só as performances divergentes, na mesma ordem da ingestão, e as corrige. A
+        divergência é recalculada depois do lock: lotes de eventos em andamento terminam antes
+        e os seguintes esperam, então a agregação enxerga exatamente os eventos já contados.
+        """
+        await self.db.execute(
+            select(Performance.id)
+            .where(Performance.id == any_(array_param("locked_ids", performance_ids)))
+            .order_by(Performance.id)
+            .with_for_update()
+        )
+        rows = await self._drifted(performance_ids)
+        if rows:
+            totals = _counters_table({
+                row.id: [getattr(row, f"expected_{field}") for field in COUNTER_FIELDS] for row in rows
+            })
+            await self.db.execute(
+                update(Performance)
+                .where(Performance.id == totals.c.id)
+                .values(**{field: totals.c[field] for field in COUNTER_FIELDS}, updated_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        return rows
+
+    async def reconcile(self, dry_run: bool = False, limit: int = 100,
+                        batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Recalcula os contadores a partir de performance_events e corrige os divergentes.
+        As performances são percorridas por ID em lotes de `batch_size` (padrão
+        `Settings.performance_counter_reconcile_batch_size`), cada lote em uma transação curta
+        que só trava as linhas corrigidas. Contador nulo equivale a zero. Retorna as
+        divergências encontradas (até `limit`) e, com `dry_run`, não altera nada.
+        """
+        batch_size = batch_size or settings.performance_counter_reconcile_batch_size
+        result = {"reconciled": True, "dry_run": dry_run, "checked": 0, "drifted": 0, "fixed": 0, "items": []}
+        try:
+            last_id = 0
+            while True:
+                # O advisory lock é por transação: cada lote o reobtém e, se outra reconciliação
+                # assumiu entre os lotes, esta para e deixa o restante para ela
+                locked = await self.db.scalar(select(func.pg_try_advisory_xact_lock(COUNTER_RECONCILE_LOCK_KEY)))
+                if not locked:
+                    await self.db.rollback()
+                    result["reconciled"] = result["checked"] > 0
+                    break
+
+                performance_ids = list((await self.db.scalars(
+                    select(Performance.id).where(Performance.id > last_id).order_by(Performance.id).limit(batch_size)
+                )).all())
+                if not performance_ids:
+                    await self.db.rollback()
+                    break
+                last_id = performance_ids[-1]
+                result["checked"] += len(performance_ids)
+
+                rows = await self._drifted(performance_ids)
+                if rows and not dry_run:
+                    rows = await self._fix([row.id for row in rows])
+                    await self.db.commit()
+                    result["fixed"] += len(rows)
+                else:
+                    await self.db.rollback()
+
+                result["drifted"] += len(rows)
+                for row in rows:
+                    for field in COUNTER_FIELDS:
+                        stored_value = getattr(row, f"stored_{field}")
+                        expected_value = getattr(row, f"expected_{field}")
+                        if stored_value != expected_value and len(result["items"]) < limit:
+                            result["items"].append({
+                                "performance_id": row.id,
+                                "field": field,
+                                "stored": stored_value,
+                                "expected": expected_value
+                            })
+
+            if result["drifted"]:
+                logger.warning(
+                    "Contadores de performance divergentes de performance_events: %s performances%s",
+                    result["drifted"], " (dry run)" if dry_run else " corrigidas"
+                )
+            return result
+        except Exception as e:
+            await self.db.rollback()
+            raise Exception(f"Erro ao reconciliar contadores de performance: {str(e)}")
+
+
+class PerformanceCounterReconciler:
+    """Tarefa asyncio que reconcilia os contadores de performance a cada intervalo neste processo."""
+
+    def __init__(self, session_factory: async_sessionmaker, interval: int):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Inicia a reconciliação periódica; a primeira roda após um intervalo."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancela a reconciliação periódica."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                async with self.session_factory() as db:
+                    await PerformanceCounterService(db).reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Erro ao reconciliar os contadores de performance")
+
+
+# Reconciliador deste processo; iniciado no startup da aplicação (app/main.py)
+performance_counter_reconciler = PerformanceCounterReconciler(
+    AsyncSessionLocal, settings.performance_counter_reconcile_interval
+)
@@ -0,0 +1,111 @@
+from typing import Any, Dict, List
+from sqlalchemy import Integer, String, any_, cast, column, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dto.performance_dto import PerformanceEventCreateDTO
+from app.models.member import Member
+from app.models.performance import Performance
+from app.models.performance_event import PerformanceEvent, PerformanceEventTypeEnum
+from app.services.performance_counter_service import PerformanceCounterService, array_param
+
+
+class PerformanceEventService:
+    """
+    Service responsável pela ingestão em lote de performance_events.
+
+    As referências são validadas com uma consulta por tabela, os eventos são gravados
+    com um único `INSERT ... SELECT FROM unnest(...)` e os contadores das performances
+    são atualizados na mesma transação (PerformanceCounterService).
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.counters = PerformanceCounterService(db)
+
+    async def _lock_performances(self, performance_ids: List[int]) -> set:
+        """
+        Retorna quais performances existem, travando-as em ordem de ID até o commit.
+        A ordem fixa evita deadlock entre lotes concorrentes que atualizam as mesmas performances.
+        """
+        ids = (await self.db.scalars(
+            select(Performance.id)
+            .where(Performance.id == any_(array_param("performance_ids", performance_ids)))
+            .order_by(Performance.id)
+            .with_for_update()
+        )).all()
+        return set(ids)
+
+    async def _existing_members(self, member_ids: List[int]) -> set:
+        """Retorna, em uma única consulta, quais membros existem."""
+        if not member_ids:
+            return set()
+        ids = (await self.db.scalars(
+            select(Member.id).where(Member.id == any_(array_param("member_ids", member_ids)))
+        )).all()
+        return set(ids)
+
+    async def _insert_events(self, events: List[PerformanceEventCreateDTO]) -> None:
+        """Grava os eventos em um único statement, com uma coluna array por campo."""
+        rows = func.unnest(
+            array_param("performance_ids", [event.performance_id for event in events]),
+            array_param("types", [event.type.value for event in events], String),
+            array_param("values", [event.value for event in events]),
+            array_param("member_ids", [event.member_id for event in events]),
+            array_param("event_ids", [event.event_id for event in events])
+        ).table_valued(
+            column("performance_id", Integer),
+            column("type", String),
+            column("value", Integer),
+            column("member_id", Integer),
+            column("event_id", Integer)
+        ).render_derived(name="events")
+        await self.db.execute(
+            insert(PerformanceEvent).from_select(
+                ["performance_id", "type", "value", "member_id", "event_id"],
+                select(
+                    rows.c.performance_id,
+                    cast(rows.c.type, PerformanceEvent.type.type),
+                    rows.c.value,
+                    rows.c.member_id,
+                    rows.c.event_id
+                )
+            )
+        )
+
+    async def ingest(self, events: List[PerformanceEventCreateDTO]) -> Dict[str, Any]:
+        """
+        Grava um lote de eventos e atualiza os contadores das performances em uma transação.
+        Eventos com referências inexistentes são rejeitados e listados em `errors`; os demais são gravados.
+        """
+        try:
+            valid_performances = await self._lock_performances(sorted({event.performance_id for event in events}))
+            valid_members = await self._existing_members(
+                sorted({event.member_id for event in events if event.member_id is not None})
+            )
+
+            accepted = []
+            errors = []
+            for index, event in enumerate(events):
+                if event.performance_id not in valid_performances:
+                    errors.append(f"Evento {index}: Performance ID {event.performance_id} não existe")
+                elif event.member_id is not None and event.member_id not in valid_members:
+                    errors.append(f"Evento {index}: Member ID {event.member_id} não existe")
+                elif event.type == PerformanceEventTypeEnum.referral and event.member_id is None:
+                    errors.append(f"Evento {index}: member_id é obrigatório em eventos referral")
+                else:
+                    accepted.append(event)
+
+            updated = 0
+            if accepted:
+                await self._insert_events(accepted)
+                updated = await self.counters.apply_events(accepted)
+            await self.db.commit()
+            return {
+                "received": len(events),
+                "inserted": len(accepted),
+                "rejected": len(errors),
+                "updated_performances": updated,
+                "errors": errors
+            }
+        except Exception as e:
+            await self.db.rollback()
+            raise Exception(f"Erro ao registrar eventos de performance: {str(e)}")
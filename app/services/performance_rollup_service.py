@@ -0,0 +1,287 @@
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from sqlalchemy import BigInteger, Date, and_, cast, delete, func, insert, literal, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.dto.performance_dto import RollupDimensionEnum, RollupMetricEnum
+from app.models.company import Company
+from app.models.market_segmentation import MarketSegmentation
+from app.models.member import Member
+from app.models.performance import Performance
+from app.models.performance_event import PerformanceEvent, PerformanceEventTypeEnum
+from app.models.performance_rollup import PerformanceRollup, PerformanceRollupDimensionEnum, PerformanceRollupGrainEnum
+
+logger = logging.getLogger(__name__)
+
+# Chave do advisory lock que serializa as atualizações entre processos
+ROLLUP_REFRESH_LOCK_KEY = 7_340_002
+
+ROLLUP_METRICS = {
+    RollupMetricEnum.count_closed_deals: PerformanceRollup.count_closed_deals,
+    RollupMetricEnum.value_closed_deals: PerformanceRollup.value_closed_deals,
+    RollupMetricEnum.referrals: PerformanceRollup.referrals,
+    RollupMetricEnum.total_value_per_referral: PerformanceRollup.value_referrals
+}
+
+ROLLUP_COLUMNS = [
+    PerformanceRollup.dimension, PerformanceRollup.grain, PerformanceRollup.period_start, PerformanceRollup.entity_id,
+    PerformanceRollup.count_closed_deals, PerformanceRollup.value_closed_deals,
+    PerformanceRollup.referrals, PerformanceRollup.value_referrals
+]
+
+
+def _next_month(day: date) -> date:
+    """Primeiro dia do mês seguinte."""
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _window_filter(start_date: Optional[date], end_date: Optional[date]):
+    """
+    Seleciona os buckets que cobrem [start_date, end_date]: meses inteiros pela granularidade
+    mensal e as pontas do período pela diária, para ler o mínimo de linhas.
+    """
+    # Meses inteiros dentro do período: [full_from, full_to)
+    full_from = start_date if start_date is None or start_date.day == 1 else _next_month(start_date)
+    full_to = None
+    if end_date is not None:
+        full_to = end_date + timedelta(days=1) if (end_date + timedelta(days=1)).day == 1 else end_date.replace(day=1)
+
+    day_bucket = PerformanceRollup.grain == PerformanceRollupGrainEnum.day
+    if full_from is not None and full_to is not None and full_from >= full_to:
+        return and_(day_bucket, PerformanceRollup.period_start.between(start_date, end_date))
+
+    months = [PerformanceRollup.grain == PerformanceRollupGrainEnum.month]
+    edges = []
+    if full_from is not None:
+        months.append(PerformanceRollup.period_start >= full_from)
+        if start_date < full_from:
+            edges.append(PerformanceRollup.period_start.between(start_date, full_from - timedelta(days=1)))
+    if full_to is not None:
+        months.append(PerformanceRollup.period_start < full_to)
+        if full_to <= end_date:
+            edges.append(PerformanceRollup.period_start.between(full_to, end_date))
+    if not edges:
+        return and_(*months)
+    return or_(and_(*months), and_(day_bucket, or_(*edges)))
+
+
+class PerformanceRollupService:
+    """
+    Service responsável pelos totais de performance por membro, empresa e segmentação.
+    As consultas leem a tabela performance_rollups (totais por dia e por mês) em vez de
+    agregar performance_events a cada requisição.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def rollup(self, dimension: RollupDimensionEnum, start_date: Optional[date] = None,
+                     end_date: Optional[date] = None,
+                     order_by: RollupMetricEnum = RollupMetricEnum.value_closed_deals,
+                     limit: int = 100, entity_id: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Totais do período agrupados pela dimensão, ordenados pela métrica (decrescente)."""
+        try:
+            totals = {metric: cast(func.sum(column), BigInteger).label(metric.value)
+                      for metric, column in ROLLUP_METRICS.items()}
+
+            source = PerformanceRollupDimensionEnum.member if dimension == RollupDimensionEnum.members \
+                else PerformanceRollupDimensionEnum.company
+            key = PerformanceRollup.entity_id
+            statement = select(key.label("id"), *totals.values()).where(
+                PerformanceRollup.dimension == source,
+                _window_filter(start_date, end_date)
+            )
+
+            if dimension == RollupDimensionEnum.market_segmentations:
+                # Soma os totais por empresa e reagrupa pela segmentação atual de cada empresa
+                names = MarketSegmentation
+                per_company = statement.group_by(key).subquery()
+                totals = {metric: cast(func.sum(per_company.c[metric.value]), BigInteger).label(metric.value)
+                          for metric in ROLLUP_METRICS}
+                key = Company.market_segmentation_id
+                statement = select(key.label("id"), *totals.values()).join_from(
+                    per_company, Company, Company.id == per_company.c.id
+                ).where(key.isnot(None))
+            else:
+                names = Member if dimension == RollupDimensionEnum.members else Company
+            if entity_id is not None:
+                statement = statement.where(key == entity_id)
+
+            # Agrega e limita antes de buscar os nomes, para o join ler só as linhas da página
+            ranked = statement.group_by(key).order_by(totals[order_by].desc(), key).limit(limit).subquery()
+            rows = (await self.db.execute(
+                select(ranked, names.name)
+                .outerjoin(names, names.id == ranked.c.id)
+                .order_by(ranked.c[order_by.value].desc(), ranked.c.id)
+            )).all()
+
+            given = dimension == RollupDimensionEnum.members
+            return [
+                {
+                    "id": row.id,
+                    "name": row.name,
+                    "count_closed_deals": row.count_closed_deals,
+                    "value_closed_deals": row.value_closed_deals,
+                    "referrals_given": row.referrals if given else None,
+                    "referrals_received": None if given else row.referrals,
+                    "total_value_per_referral": row.total_value_per_referral
+                }
+                for row in rows
+            ]
+        except Exception as e:
+            raise Exception(f"Erro ao consultar totais de performance: {str(e)}")
+
+    @staticmethod
+    def _daily_totals(dimension: PerformanceRollupDimensionEnum, since: Optional[date]):
+        """SELECT dos totais diários de performance_events por membro ou empresa, a partir de `since`."""
+        day = cast(func.timezone("UTC", PerformanceEvent.created_at), Date)
+        transaction = PerformanceEvent.type == PerformanceEventTypeEnum.transaction
+        referral = PerformanceEvent.type == PerformanceEventTypeEnum.referral
+        if dimension == PerformanceRollupDimensionEnum.member:
+            key = PerformanceEvent.member_id
+            statement = select(PerformanceEvent)
+        else:
+            key = Performance.company_id
+            statement = select(PerformanceEvent).join(Performance, Performance.id == PerformanceEvent.performance_id)
+
+        statement = statement.with_only_columns(
+            literal(dimension, PerformanceRollup.dimension.type),
+            literal(PerformanceRollupGrainEnum.day, PerformanceRollup.grain.type),
+            day,
+            key,
+            func.count().filter(transaction),
+            func.coalesce(func.sum(PerformanceEvent.value).filter(transaction), 0),
+            func.count().filter(referral),
+            func.coalesce(func.sum(PerformanceEvent.value).filter(referral), 0)
+        ).where(key.isnot(None))
+        if since is not None:
+            statement = statement.where(
+                PerformanceEvent.created_at >= datetime.combine(since, time.min, tzinfo=timezone.utc)
+            )
+        return statement.group_by(day, key)
+
+    @staticmethod
+    def _monthly_totals(dimension: PerformanceRollupDimensionEnum, since: Optional[date], entity_ids=None):
+        """SELECT dos totais mensais somando os totais diários já gravados, a partir de `since`."""
+        month = cast(func.date_trunc("month", PerformanceRollup.period_start), Date)
+        statement = select(
+            PerformanceRollup.dimension,
+            literal(PerformanceRollupGrainEnum.month, PerformanceRollup.grain.type),
+            month,
+            PerformanceRollup.entity_id,
+            func.sum(PerformanceRollup.count_closed_deals),
+            func.sum(PerformanceRollup.value_closed_deals),
+            func.sum(PerformanceRollup.referrals),
+            func.sum(PerformanceRollup.value_referrals)
+        ).where(PerformanceRollup.dimension == dimension, PerformanceRollup.grain == PerformanceRollupGrainEnum.day)
+        if since is not None:
+            statement = statement.where(PerformanceRollup.period_start >= since)
+        if entity_ids is not None:
+            statement = statement.where(PerformanceRollup.entity_id.in_(entity_ids))
+        return statement.group_by(PerformanceRollup.dimension, month, PerformanceRollup.entity_id)
+
+    async def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Atualiza performance_rollups em uma transação. Na atualização incremental, apenas os dias a
+        partir do último dia já agregado (menos um, para eventos gravados perto da meia-noite) são
+        recalculados, e os meses que os contêm só para os membros e empresas com eventos nesses dias;
+        `full` reconstrói tudo (ex.: após eventos retroativos).
+        Leitores continuam vendo os totais anteriores até o commit.
+        """
+        try:
+            locked = await self.db.scalar(select(func.pg_try_advisory_xact_lock(ROLLUP_REFRESH_LOCK_KEY)))
+            if not locked:
+                await self.db.rollback()
+                return {"refreshed": False, "full": full, "since": None}
+
+            # Uma reconstrução completa pode passar do statement_timeout das requisições
+            await self.db.execute(text("SET LOCAL statement_timeout = 0"))
+            recalculated = []
+            for dimension in PerformanceRollupDimensionEnum:
+                since = None
+                if not full:
+                    latest = await self.db.scalar(
+                        select(func.max(PerformanceRollup.period_start)).where(
+                            PerformanceRollup.dimension == dimension,
+                            PerformanceRollup.grain == PerformanceRollupGrainEnum.day
+                        )
+                    )
+                    since = latest - timedelta(days=1) if latest else None
+                month_since = since.replace(day=1) if since else None
+                recalculated.append(since)
+
+                days = delete(PerformanceRollup).where(
+                    PerformanceRollup.dimension == dimension,
+                    PerformanceRollup.grain == PerformanceRollupGrainEnum.day
+                )
+                months = delete(PerformanceRollup).where(
+                    PerformanceRollup.dimension == dimension,
+                    PerformanceRollup.grain == PerformanceRollupGrainEnum.month
+                )
+                touched = None
+                if since is not None:
+                    days = days.where(PerformanceRollup.period_start >= since)
+                    touched = select(PerformanceRollup.entity_id).where(
+                        PerformanceRollup.dimension == dimension,
+                        PerformanceRollup.grain == PerformanceRollupGrainEnum.day,
+                        PerformanceRollup.period_start >= since
+                    )
+                    months = months.where(
+                        PerformanceRollup.period_start >= month_since,
+                        PerformanceRollup.entity_id.in_(touched)
+                    )
+
+                await self.db.execute(days)
+                await self.db.execute(
+                    insert(PerformanceRollup).from_select(ROLLUP_COLUMNS, self._daily_totals(dimension, since))
+                )
+                await self.db.execute(months)
+                await self.db.execute(
+                    insert(PerformanceRollup).from_select(
+                        ROLLUP_COLUMNS, self._monthly_totals(dimension, month_since, touched)
+                    )
+                )
+            await self.db.commit()
+            rebuilt = None in recalculated
+            return {"refreshed": True, "full": rebuilt, "since": None if rebuilt else min(recalculated)}
+        except Exception as e:
+            await self.db.rollback()
+            raise Exception(f"Erro ao atualizar totais de performance: {str(e)}")
+
+
+class PerformanceRollupRefresher:
+    """Tarefa asyncio que atualiza os totais de performance a cada intervalo neste processo."""
+
+    def __init__(self, session_factory: async_sessionmaker, interval: int):
+        self.session_factory = session_factory
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Inicia a atualização periódica; a primeira roda imediatamente."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancela a atualização periódica."""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self.session_factory() as db:
+                    await PerformanceRollupService(db).refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Erro ao atualizar os totais de performance")
+            await asyncio.sleep(self.interval)
+
+
+# Atualizador deste processo; iniciado no startup da aplicação (app/main.py)
+performance_rollup_refresher = PerformanceRollupRefresher(AsyncSessionLocal, settings.performance_rollup_refresh_interval)
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Any, Dict, List, Set, Tuple
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.models.market_segmentation import MarketSegmentation
+from app.models.profile import Profile
+
+PROFILES = "profiles"
+MARKET_SEGMENTATIONS = "market_segmentations"
+
+# Cache em memória do processo: tabela -> (linhas, expira_em)
+_reference_cache: Dict[str, Tuple[Any, float]] = {}
+_reference_cache_lock = threading.Lock()
+
+_QUERIES = {
+    PROFILES: select(Profile.id, Profile.type, Profile.active).order_by(Profile.id),
+    MARKET_SEGMENTATIONS: select(
+        MarketSegmentation.id,
+        MarketSegmentation.name,
+        MarketSegmentation.created_at,
+        MarketSegmentation.updated_at
+    ).order_by(MarketSegmentation.id)
+}
+
+
+_reference_cache_generation = 0
+
+
+def invalidate_reference_cache(*tables: str) -> None:
+    """
+    Descarta as tabelas informadas (ou todas) do cache deste processo.
+    Outros workers enxergam a mudança quando o TTL expira.
+    """
+    global _reference_cache_generation
+    with _reference_cache_lock:
+        _reference_cache_generation += 1
+        for table in tables or list(_reference_cache):
+            _reference_cache.pop(table, None)
+
+
+class ReferenceCache:
+    """Cache com TTL das tabelas de referência (profiles e market_segmentation), pequenas e quase estáticas."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _rows(self, table: str, refresh: bool = False) -> List[Any]:
+        now = time.monotonic()
+        with _reference_cache_lock:
+            cached = _reference_cache.get(table)
+            generation = _reference_cache_generation
+        if cached and cached[1] > now and not refresh:
+            return cached[0]
+
+        rows = list((await self.db.execute(_QUERIES[table])).all())
+        with _reference_cache_lock:
+            # Não grava se houve invalidação durante a leitura
+            if generation == _reference_cache_generation:
+                _reference_cache[table] = (rows, now + settings.reference_cache_ttl)
+        return rows
+
+    async def _existing(self, table: str, ids: Set[int]) -> Set[int]:
+        """
+        Retorna quais IDs existem. Um ID ausente do cache força uma releitura,
+        para que registros criados por outro worker não sejam rejeitados até o TTL expirar.
+        """
+        ids = {value for value in ids if value}
+        known = {row.id for row in await self._rows(table)}
+        if ids - known:
+            known = {row.id for row in await self._rows(table, refresh=True)}
+        return ids & known
+
+    async def existing_profile_ids(self, ids: Set[int]) -> Set[int]:
+        """Quais dos IDs informados são profiles existentes."""
+        return await self._existing(PROFILES, ids)
+
+    async def existing_market_segmentation_ids(self, ids: Set[int]) -> Set[int]:
+        """Quais dos IDs informados são segmentações de mercado existentes."""
+        return await self._existing(MARKET_SEGMENTATIONS, ids)
+
+    async def market_segmentations(self) -> List[Any]:
+        """Segmentações de mercado (id, name, created_at, updated_at) ordenadas por ID."""
+        return await self._rows(MARKET_SEGMENTATIONS)
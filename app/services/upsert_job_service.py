@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.dto.upsert_data_dto import UpsertDataRequestDTO
+from app.models.upsert_job import UpsertJob, UpsertJobStatusEnum
+from app.services.bulk_upsert_service import BulkUpsertService
+from app.services.upsert_normalizer import normalize_records
+from app.services.member_count_service import MemberCountService
+from app.services.member_response_cache import invalidate_member_response_cache
+
+logger = logging.getLogger(__name__)
+
+# Ordem de processamento: empresas antes dos membros, para que os membros sejam vinculados a elas
+JOB_ENTITIES = ["companies", "members", "performances"]
+
+# Limite de mensagens de erro guardadas no job
+MAX_JOB_ERRORS = 1000
+
+
+def _merge_counts(total: Dict[str, int], partial: Dict[str, int]) -> Dict[str, int]:
+    """Soma os contadores de um chunk aos contadores acumulados do job."""
+    merged = dict(total)
+    for key, value in partial.items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+class UpsertJobService:
+    """Service responsável pelos jobs assíncronos do populate-data, com estado na tabela upsert_jobs."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    @staticmethod
+    def _chunks(payload: Dict[str, Any], chunk_size: int) -> List[Tuple[str, int, int]]:
+        """Divide o payload em chunks (entidade, início, fim) na ordem de processamento."""
+        chunks = []
+        for entity in JOB_ENTITIES:
+            total = len(payload.get(entity) or [])
+            chunks.extend((entity, start, min(start + chunk_size, total)) for start in range(0, total, chunk_size))
+        return chunks
+
+    async def create_job(self, request_data: UpsertDataRequestDTO, chunk_size: Optional[int] = None) -> UpsertJob:
+        """Registra o payload como um job na fila e retorna imediatamente."""
+        chunk_size = chunk_size or settings.upsert_job_chunk_size
+        filtered_data = request_data.get_non_empty_objects()
+        # exclude_unset preserva a semântica do upsert: campos não informados não são sobrescritos
+        payload = {
+            entity: [item.model_dump(mode="json", exclude_unset=True) for item in items]
+            for entity, items in filtered_data.items()
+        }
+
+        job = UpsertJob(
+            id=str(uuid.uuid4()),
+            status=UpsertJobStatusEnum.queued,
+            payload=payload,
+            chunk_size=chunk_size,
+            total_chunks=len(self._chunks(payload, chunk_size)),
+            processed_chunks=0,
+            failed_chunks=0,
+            created_count={},
+            updated_count={},
+            errors=[],
+            company_ids=[]
+        )
+        try:
+            self.db.add(job)
+            await self.db.commit()
+            return job
+        except Exception as e:
+            await self.db.rollback()
+            raise Exception(f"Erro ao criar job: {str(e)}")
+
+    async def get_job(self, job_id: str) -> Optional[UpsertJob]:
+        """Busca um job pelo ID."""
+        return await self.db.get(UpsertJob, job_id)
+
+    async def claim_next_job(self) -> Optional[str]:
+        """
+        Reserva o próximo job da fila com FOR UPDATE SKIP LOCKED, seguro entre workers e processos.
+        Jobs em execução sem heartbeat há mais de upsert_job_stale_after segundos são retomados.
+        """
+        stale_before = func.now() - func.make_interval(0, 0, 0, 0, 0, 0, settings.upsert_job_stale_after)
+        candidate = (
+            select(UpsertJob.id)
+            .where(or_(
+                UpsertJob.status == UpsertJobStatusEnum.queued,
+                (UpsertJob.status == UpsertJobStatusEnum.running) & (UpsertJob.updated_at < stale_before)
+            ))
+            .order_by(UpsertJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        job_id = await self.db.scalar(
+            update(UpsertJob)
+            .where(UpsertJob.id == candidate)
+            .values(
+                status=UpsertJobStatusEnum.running,
+                started_at=func.coalesce(UpsertJob.started_at, func.now()),
+                updated_at=func.now()
+            )
+            .returning(UpsertJob.id)
+        )
+        await self.db.commit()
+        return job_id
+
+    async def heartbeat(self, job_id: str) -> None:
+        """Renova o updated_at de um job em execução, para que não seja retomado como abandonado."""
+        await self.db.execute(
+            update(UpsertJob)
+            .where(UpsertJob.id == job_id, UpsertJob.status == UpsertJobStatusEnum.running)
+            .values(updated_at=func.now())
+        )
+        await self.db.commit()
+
+    async def _advance(self, job_id: str, expected_chunks: int, values: Dict[str, Any]) -> bool:
+        """
+        Compare-and-set do progresso: só avança se processed_chunks ainda for `expected_chunks`.
+        Retorna False se outro worker retomou o job e já gravou esse chunk.
+        """
+        advanced = await self.db.scalar(
+            update(UpsertJob)
+            .where(
+                UpsertJob.id == job_id,
+                UpsertJob.status == UpsertJobStatusEnum.running,
+                UpsertJob.processed_chunks == expected_chunks
+            )
+            .values(**values, updated_at=func.now())
+            .returning(UpsertJob.id)
+            .execution_options(synchronize_session=False)
+        )
+        return advanced is not None
+
+    async def run_job(self, job_id: str) -> None:
+        """
+        Processa os chunks pendentes do job. Cada chunk é gravado na mesma transação que avança
+        o progresso com compare-and-set em processed_chunks; se outro worker retomou o job e já
+        gravou o chunk, a transação é desfeita e este worker abandona o job.
+        """
+        job = await self.db.get(UpsertJob, job_id)
+        processed = job.processed_chunks
+        try:
+            request_data = UpsertDataRequestDTO(**job.payload)
+            chunks = self._chunks(job.payload, job.chunk_size)
+            # Progresso mantido localmente: o objeto do job expira a cada rollback de chunk
+            progress = {
+                "failed_chunks": job.failed_chunks,
+                "created_count": job.created_count,
+                "updated_count": job.updated_count,
+                "errors": job.errors,
+                "company_ids": job.company_ids
+            }
+
+            for entity, start, end in chunks[processed:]:
+                bulk = BulkUpsertService(self.db)
+                bulk.processed_company_ids = list(progress["company_ids"])
+                items = normalize_records(entity, getattr(request_data, entity)[start:end])
+                chunk_progress = dict(progress)
+                try:
+                    if entity == "companies":
+                        await bulk.upsert_companies(items)
+                    elif entity == "members":
+                        await bulk.upsert_members(items)
+                    else:
+                        await bulk.insert_performances(items)
+                    chunk_errors = bulk.errors
+                except Exception as e:
+                    await self.db.rollback()
+                    bulk = BulkUpsertService(self.db)
+                    bulk.processed_company_ids = list(progress["company_ids"])
+                    chunk_errors = [f"Erro no chunk {entity}[{start}:{end}]: {str(e)}"]
+                    chunk_progress["failed_chunks"] += 1
+
+                chunk_progress["created_count"] = _merge_counts(progress["created_count"], bulk.created_count)
+                chunk_progress["updated_count"] = _merge_counts(progress["updated_count"], bulk.updated_count)
+                chunk_progress["company_ids"] = bulk.processed_company_ids
+                if chunk_errors and len(progress["errors"]) < MAX_JOB_ERRORS:
+                    chunk_progress["errors"] = (progress["errors"] + chunk_errors)[:MAX_JOB_ERRORS]
+
+                if not await self._advance(job_id, processed, {**chunk_progress, "processed_chunks": processed + 1}):
+                    await self.db.rollback()
+                    logger.warning("Job %s retomado por outro worker; chunk %s descartado", job_id, processed)
+                    return
+                await self.db.commit()
+                processed += 1
+                progress = chunk_progress
+                MemberCountService.invalidate()
+                invalidate_member_response_cache()
+
+            await self._advance(job_id, processed, {"status": UpsertJobStatusEnum.completed, "finished_at": func.now()})
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            await self.db.execute(
+                update(UpsertJob)
+                .where(UpsertJob.id == job_id, UpsertJob.processed_chunks == processed)
+                .values(
+                    status=UpsertJobStatusEnum.failed,
+                    errors=UpsertJob.errors.op("||")(func.jsonb_build_array(f"Erro ao processar job: {str(e)}")),
+                    finished_at=func.now()
+                )
+            )
+            await self.db.commit()
+
+
+class UpsertJobWorkerPool:
+    """Pool de workers asyncio que consome a fila de jobs do populate-data neste processo."""
+
+    def __init__(self, session_factory: async_sessionmaker, size: int, poll_interval: float,
+                 heartbeat_interval: Optional[float] = None):
+        self.session_factory = session_factory
+        self.size = size
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval or settings.upsert_job_heartbeat_interval
+        self._tasks: List[asyncio.Task] = []
+        # Criado em start(): no Python 3.9 o Event fica preso ao loop corrente na criação,
+        # e o pool do módulo é importado antes do loop do worker (ex.: gunicorn + UvicornWorker)
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Inicia os workers no loop em execução."""
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.size)]
+
+    async def stop(self) -> None:
+        """Cancela os workers; jobs interrompidos são retomados depois pelo heartbeat."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Acorda os workers deste processo logo após um novo job ser criado."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """
+        Renova o heartbeat do job em uma sessão própria, a intervalos fixos e independente dos
+        commits dos chunks: um chunk demorado não faz o job parecer abandonado.
+        """
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as db:
+                    await UpsertJobService(db).heartbeat(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Erro ao renovar o heartbeat do job %s", job_id)
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                async with self.session_factory() as db:
+                    service = UpsertJobService(db)
+                    job_id = await service.claim_next_job()
+                    if job_id:
+                        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+                        try:
+                            await service.run_job(job_id)
+                        finally:
+                            heartbeat.cancel()
+                            await asyncio.gather(heartbeat, return_exceptions=True)
+                        continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Erro no worker de jobs do populate-data")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+# Pool deste processo; iniciado no startup da aplicação (app/main.py)
+upsert_job_pool = UpsertJobWorkerPool(
+    AsyncSessionLocal, settings.upsert_job_workers, settings.upsert_job_poll_interval,
+    settings.upsert_job_heartbeat_interval
+)
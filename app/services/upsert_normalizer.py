@@ -0,0 +1,217 @@
+import enum
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel
+from app.dto.upsert_data_dto import (
+    AddressUpsertDTO,
+    CompanyUpsertDTO,
+    MemberUpsertDTO,
+    PerformanceUpsertDTO,
+    UpsertDataRequestDTO
+)
+
+MEMBER_RELATED_FIELDS = frozenset({'address', 'contact_channels', 'additional_info'})
+COMPANY_RELATED_FIELDS = frozenset({'address'})
+
+# Placeholders enviados no lugar de CPF/CNPJ (ex.: valor padrão do Swagger)
+DOCUMENT_PLACEHOLDERS = {"string", "0"}
+
+# Colunas do endereço com o valor padrão do DTO para os campos não informados (country = "Brazil")
+ADDRESS_DEFAULTS = {name: field.default for name, field in AddressUpsertDTO.model_fields.items()}
+
+
+class MergePolicyEnum(str, enum.Enum):
+    """Como combinar registros repetidos (mesmo CPF/CNPJ ou nome) de um mesmo payload."""
+    last_wins = "last_wins"  # a última ocorrência substitui as anteriores
+    first_wins = "first_wins"  # a primeira ocorrência é mantida e as demais descartadas
+    coalesce = "coalesce"  # campo a campo: valores não nulos das ocorrências seguintes sobrepõem os anteriores
+
+
+def fields_set(model: Optional[BaseModel], exclude: frozenset = frozenset()) -> Dict[str, Any]:
+    """
+    Campos informados no payload, equivalente a `.dict(exclude_unset=True)` para modelos planos,
+    lendo `model_fields_set` em vez de serializar o modelo.
+    """
+    if model is None:
+        return {}
+    return {name: getattr(model, name) for name in model.model_fields_set if name not in exclude}
+
+
+def normalize_document(document: Optional[str]) -> Optional[str]:
+    """Normaliza o CPF/CNPJ ignorando placeholders como "string", "0" ou vazio."""
+    if not document:
+        return None
+    doc_str = str(document).strip()
+    if doc_str and doc_str.lower() not in DOCUMENT_PLACEHOLDERS:
+        return doc_str
+    return None
+
+
+def _normalize_text(value: Any) -> str:
+    """Texto para comparação: sem espaços repetidos e sem diferença de maiúsculas."""
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        value = value.value
+    return " ".join(str(value).split()).casefold()
+
+
+def address_hash(address: Dict[str, Any]) -> str:
+    """
+    Hash (SHA-256) do conteúdo normalizado do endereço, com os padrões do DTO nos campos
+    não informados e o CEP apenas com dígitos. Endereços com o mesmo hash são o mesmo endereço.
+    """
+    parts = []
+    for name, default in ADDRESS_DEFAULTS.items():
+        value = _normalize_text(address.get(name, default))
+        if name == "postal_code":
+            value = "".join(char for char in value if char.isdigit())
+        parts.append(value)
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def address_row(address: Dict[str, Any]) -> Dict[str, Any]:
+    """Linha completa da tabela addresses (padrões do DTO nos campos não informados) com o hash."""
+    row = {**ADDRESS_DEFAULTS, **address}
+    row["content_hash"] = address_hash(row)
+    return row
+
+
+def _with_document(values: Dict[str, Any]) -> Optional[str]:
+    """Normaliza o documento nos valores (se informado) e o retorna."""
+    document = normalize_document(values.get('document'))
+    if 'document' in values:
+        values['document'] = document
+    return document
+
+
+def normalize_company(company: CompanyUpsertDTO) -> Optional[dict]:
+    """Linha de empresa pronta para o BulkUpsertService, ou None se nenhum campo foi preenchido."""
+    values = fields_set(company, COMPANY_RELATED_FIELDS)
+    address = fields_set(company.address)
+    if not any(values.values()) and not any(address.values()):
+        return None
+    return {"values": values, "document": _with_document(values), "address": address}
+
+
+def normalize_member(member: MemberUpsertDTO) -> Optional[dict]:
+    """
+    Linha de membro com endereço, contatos e informações adicionais, ou None se vazio.
+    `contact_channels` é None quando não foi informado ou só tem canais vazios (ex.: `[]` ou `[{}]`):
+    nesse caso os canais gravados não são alterados.
+    """
+    values = fields_set(member, MEMBER_RELATED_FIELDS)
+    address = fields_set(member.address)
+    contact_channels = [
+        channel for channel in map(fields_set, member.contact_channels or []) if any(channel.values())
+    ] or None
+    additional_info = fields_set(member.additional_info)
+    if not (any(values.values()) or any(address.values()) or any(additional_info.values())
+            or any(any(channel.values()) for channel in contact_channels or [])):
+        return None
+    return {
+        "values": values,
+        "document": _with_document(values),
+        "address": address,
+        "contact_channels": contact_channels,
+        "additional_info": additional_info
+    }
+
+
+def normalize_performance(performance: PerformanceUpsertDTO) -> Optional[dict]:
+    """Valores da performance, ou None se vazia."""
+    values = fields_set(performance)
+    return values if any(values.values()) else None
+
+
+NORMALIZERS = {
+    "companies": normalize_company,
+    "members": normalize_member,
+    "performances": normalize_performance
+}
+
+
+def normalize_records(entity: str, records: Iterable[BaseModel]) -> List[dict]:
+    """Normaliza os registros de uma entidade em uma única passada, descartando os vazios."""
+    normalize = NORMALIZERS[entity]
+    return [row for row in map(normalize, records) if row is not None]
+
+
+def normalize_payload(request_data: UpsertDataRequestDTO) -> Dict[str, List[dict]]:
+    """Linhas normalizadas de cada entidade do payload; entidades sem registros não vazios ficam de fora."""
+    result = {}
+    for entity in NORMALIZERS:
+        rows = normalize_records(entity, getattr(request_data, entity) or [])
+        if rows:
+            result[entity] = rows
+    return result
+
+
+def _merge_key(entity: str, row: dict) -> Optional[Tuple[str, str]]:
+    """Identidade do registro no payload: CPF/CNPJ normalizado ou, para empresas sem CNPJ, o nome normalizado."""
+    if row["document"]:
+        return ("CPF" if entity == "members" else "CNPJ", row["document"])
+    name = _normalize_text(row["values"].get("name"))
+    if entity == "companies" and name:
+        return ("nome", name)
+    return None
+
+
+def _coalesce(target: Dict[str, Any], values: Dict[str, Any]) -> Dict[str, Any]:
+    """Cópia de `target` com os valores não nulos de `values` por cima (nulos não apagam valores)."""
+    merged = dict(target)
+    for key, value in values.items():
+        if value is not None or key not in merged:
+            merged[key] = value
+    return merged
+
+
+def _coalesce_rows(first: dict, row: dict) -> dict:
+    """Combina duas linhas normalizadas campo a campo; os canais de contato são unidos sem repetição."""
+    merged = {**first, "values": _coalesce(first["values"], row["values"]),
+              "address": _coalesce(first["address"], row["address"])}
+    if "additional_info" in first:
+        merged["additional_info"] = _coalesce(first["additional_info"], row["additional_info"])
+    if "contact_channels" in first:
+        channels = first["contact_channels"]
+        merged["contact_channels"] = row["contact_channels"] if channels is None else channels + [
+            channel for channel in row["contact_channels"] or [] if channel not in channels
+        ]
+    return merged
+
+
+def deduplicate_rows(entity: str, rows: List[dict], policy: MergePolicyEnum) -> Tuple[List[dict], List[str]]:
+    """
+    Colapsa os registros repetidos do payload antes de qualquer SQL: membros pelo CPF e
+    empresas pelo CNPJ normalizado ou, sem CNPJ, pelo nome. Retorna as linhas únicas (na
+    posição da primeira ocorrência) e uma mensagem por registro duplicado.
+    """
+    if entity not in ("companies", "members"):
+        return rows, []
+    unique: List[dict] = []
+    positions: Dict[Tuple[str, str], int] = {}
+    occurrences: Dict[Tuple[str, str], int] = {}
+    for row in rows:
+        key = _merge_key(entity, row)
+        if key is None:
+            unique.append(row)
+            continue
+        position = positions.get(key)
+        if position is None:
+            positions[key] = len(unique)
+            occurrences[key] = 1
+            unique.append(row)
+            continue
+        occurrences[key] += 1
+        if policy == MergePolicyEnum.last_wins:
+            unique[position] = row
+        elif policy == MergePolicyEnum.coalesce:
+            unique[position] = _coalesce_rows(unique[position], row)
+
+    label = "empresa" if entity == "companies" else "membro"
+    messages = [
+        f"Registro duplicado no payload: {label} com {kind} {value} ({count} ocorrências), "
+        f"combinado pela política {policy.value}"
+        for (kind, value), count in occurrences.items() if count > 1
+    ]
+    return unique, messages
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark de concorrência da API.
+
+Dispara requisições pesadas de populate-data junto com leituras rápidas
+(GET /members/{id} e GET /members) contra uma instância em execução e mede
+a latência das leituras e a vazão total. Com uma camada de banco bloqueante,
+as leituras ficam presas atrás das gravações no mesmo worker; com a camada
+assíncrona elas continuam sendo atendidas.
+
+Uso:
+    python benchmarks/concurrency_benchmark.py --base-url http://localhost:8000 \
+        --writers 4 --members-per-write 2000 --readers 50 --reads-per-reader 20
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import httpx
+
+API_PREFIX = "/members-book-service/v1/members"
+
+
+def build_payload(batch: int, size: int) -> dict:
+    """Monta um payload de populate-data com documentos únicos por lote."""
+    return {
+        "members": [
+            {
+                "name": f"Benchmark {batch}-{i}",
+                "document": f"{batch:03d}{i:08d}",
+                "status": "active",
+                "contact_channels": [{"type": "email", "content": f"bench{batch}-{i}@example.com"}],
+            }
+            for i in range(size)
+        ]
+    }
+
+
+async def writer(client: httpx.AsyncClient, batch: int, size: int, timings: list, failures: list) -> None:
+    started = time.perf_counter()
+    response = await client.put(f"{API_PREFIX}/populate-data", json=build_payload(batch, size))
+    if response.is_error:
+        failures.append(response.status_code)
+        return
+    timings.append(time.perf_counter() - started)
+
+
+async def reader(client: httpx.AsyncClient, member_ids: list, reads: int, timings: list, failures: list) -> None:
+    for _ in range(reads):
+        started = time.perf_counter()
+        if member_ids and random.random() < 0.5:
+            response = await client.get(f"{API_PREFIX}/{random.choice(member_ids)}")
+        else:
+            response = await client.get(f"{API_PREFIX}/", params={"limit": 20, "count_mode": "cached"})
+        if response.is_error:
+            failures.append(response.status_code)
+            continue
+        timings.append(time.perf_counter() - started)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, timings: list) -> None:
+    if not timings:
+        print(f"{name}: sem amostras")
+        return
+    print(
+        f"{name}: n={len(timings)} "
+        f"p50={percentile(timings, 50) * 1000:.1f}ms "
+        f"p95={percentile(timings, 95) * 1000:.1f}ms "
+        f"max={max(timings) * 1000:.1f}ms "
+        f"mean={statistics.mean(timings) * 1000:.1f}ms"
+    )
+
+
+async def main(args) -> None:
+    limits = httpx.Limits(max_connections=args.writers + args.readers)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=600, limits=limits) as client:
+        # Garantir alguns membros para as leituras por ID
+        seed = await client.get(f"{API_PREFIX}/", params={"limit": 100})
+        seed.raise_for_status()
+        member_ids = [member["id"] for member in seed.json()["members"]]
+
+        write_timings: list = []
+        read_timings: list = []
+        failures: list = []
+        batch_offset = random.randint(100, 899)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *[writer(client, batch_offset + i, args.members_per_write, write_timings, failures)
+              for i in range(args.writers)],
+            *[reader(client, member_ids, args.reads_per_reader, read_timings, failures)
+              for _ in range(args.readers)],
+        )
+        elapsed = time.perf_counter() - started
+
+    total_requests = len(write_timings) + len(read_timings) + len(failures)
+    print(f"tempo total: {elapsed:.2f}s  vazão: {total_requests / elapsed:.1f} req/s")
+    report("leituras", read_timings)
+    report("populate-data", write_timings)
+    print(f"falhas: {len(failures)} {sorted(set(failures))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--members-per-write", type=int, default=2000)
+    parser.add_argument("--readers", type=int, default=50)
+    parser.add_argument("--reads-per-reader", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
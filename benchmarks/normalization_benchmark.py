@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark da normalização do payload de POST /members/populate-data.
+
+Compara, sobre o mesmo payload já validado (por padrão 50 mil membros com endereço,
+contatos e informações adicionais), o caminho anterior (filtro de vazios com `.dict()`
+por objeto aninhado em `get_non_empty_objects` e nova serialização de cada registro no
+BulkUpsertService) com a passada única de `upsert_normalizer.normalize_payload`.
+Não acessa o banco.
+
+Uso:
+    python benchmarks/normalization_benchmark.py --members 50000 --repeat 10
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+from concurrency_benchmark import report
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.dto.upsert_data_dto import UpsertDataRequestDTO  # noqa: E402
+from app.services.upsert_normalizer import normalize_payload  # noqa: E402
+
+MEMBER_RELATED_FIELDS = {'address', 'contact_channels', 'additional_info'}
+
+# O caminho anterior usa `.dict()`, depreciado no Pydantic 2
+warnings.filterwarnings("ignore", category=DeprecationWarning)
+
+
+def build_payload(members: int, companies: int) -> dict:
+    """Payload sintético no formato aceito por UpsertDataRequestDTO."""
+    return {
+        "companies": [
+            {
+                "name": f"Empresa {i}",
+                "document": f"{i:014d}",
+                "address": {"city": "São Paulo", "state": "SP", "street": f"Rua {i}"}
+            }
+            for i in range(companies)
+        ],
+        "members": [
+            {
+                "name": f"Membro {i}",
+                "document": f"{i:011d}",
+                "position": "Diretor",
+                "status": "active",
+                "address": {"city": "Campinas", "state": "SP", "street": f"Rua {i}", "number": str(i)},
+                "contact_channels": [
+                    {"type": "phone", "content": f"1199{i:07d}"},
+                    {"type": "email", "content": f"membro{i}@example.com"}
+                ],
+                "additional_info": {"hobby": "Corrida", "role_duration": i % 240}
+            }
+            for i in range(members)
+        ]
+    }
+
+
+def previous_path(request_data: UpsertDataRequestDTO) -> dict:
+    """Caminho anterior: filtro com `.dict()` por objeto e nova serialização de cada registro no upsert."""
+    non_empty = {}
+    if request_data.companies:
+        non_empty["companies"] = [
+            comp for comp in request_data.companies
+            if any(comp.dict(exclude_unset=True, exclude={'address'}).values()) or
+               (comp.address and any(comp.address.dict(exclude_unset=True).values()))
+        ]
+    if request_data.members:
+        non_empty["members"] = [
+            member for member in request_data.members
+            if any(member.dict(exclude_unset=True, exclude=MEMBER_RELATED_FIELDS).values()) or
+               (member.address and any(member.address.dict(exclude_unset=True).values())) or
+               (member.contact_channels and any(
+                   any(ch.dict(exclude_unset=True).values()) for ch in member.contact_channels
+               )) or
+               (member.additional_info and any(member.additional_info.dict(exclude_unset=True).values()))
+        ]
+
+    rows = {"companies": [], "members": []}
+    for company in non_empty.get("companies", []):
+        rows["companies"].append((
+            company.dict(exclude_unset=True, exclude={'address'}),
+            company.address.dict(exclude_unset=True) if company.address else {}
+        ))
+    for member in non_empty.get("members", []):
+        rows["members"].append((
+            member.dict(exclude_unset=True, exclude=MEMBER_RELATED_FIELDS),
+            member.address.dict(exclude_unset=True) if member.address else {},
+            [channel.dict(exclude_unset=True) for channel in member.contact_channels or []],
+            member.additional_info.dict(exclude_unset=True) if member.additional_info else {}
+        ))
+    return rows
+
+
+def main(args) -> None:
+    started = time.perf_counter()
+    request_data = UpsertDataRequestDTO(**build_payload(args.members, args.companies))
+    print(f"{args.members} membros e {args.companies} empresas validados em "
+          f"{(time.perf_counter() - started) * 1000:.0f}ms (igual para os dois caminhos)")
+
+    previous_timings, current_timings = [], []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        previous = previous_path(request_data)
+        previous_timings.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        current = normalize_payload(request_data)
+        current_timings.append(time.perf_counter() - started)
+
+    same = [
+        (row["values"], row["address"], row["contact_channels"], row["additional_info"])
+        for row in current["members"]
+    ] == previous["members"]
+    print(f"mesmas linhas de membros que o caminho anterior: {same}")
+    report("anterior (.dict() por objeto)", previous_timings)
+    report("atual (normalize_payload)", current_timings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=50000)
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=10)
+    main(parser.parse_args())
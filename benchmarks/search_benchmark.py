@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca de membros (GET /members/search).
+
+Opcionalmente popula a tabela members com nomes sintéticos direto no banco
+(--seed N, usando DATABASE_URL) e mede a latência de buscas por prefixo e
+por similaridade, com e sem filtros, incluindo a segunda página via cursor.
+
+Uso:
+    python benchmarks/search_benchmark.py --seed 1000000
+    python benchmarks/search_benchmark.py --base-url http://localhost:8000 --repeat 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import httpx
+
+from concurrency_benchmark import API_PREFIX, report
+
+FIRST_NAMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "Joao",
+    "Juliana", "Lucas", "Mariana", "Maria", "Marcos", "Natalia", "Otavio", "Paula", "Rafael", "Sofia"
+]
+LAST_NAMES = [
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa"
+]
+
+SCENARIOS = [
+    ("prefixo curto", {"name": "Mar", "match": "prefix"}),
+    ("prefixo longo", {"name": "Mariana Sil", "match": "prefix"}),
+    ("prefixo + status", {"name": "Juliana Co", "match": "prefix", "status": "active"}),
+    ("fuzzy", {"name": "Mariana Slva", "match": "fuzzy"}),
+    ("fuzzy + status + perfil", {"name": "Rafal Olivera", "match": "fuzzy", "status": "active", "profile_id": 2}),
+    ("só filtros", {"status": "canceled", "profile_id": 3}),
+]
+
+
+def seed(total: int) -> None:
+    """Insere `total` membros sintéticos em lotes com generate_series."""
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+    from sqlalchemy import text
+    from app.db.database import engine
+
+    batch = 100_000
+    with engine.begin() as conn:
+        start = conn.execute(text("SELECT coalesce(max(id), 0) FROM members")).scalar()
+    for offset in range(0, total, batch):
+        with engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO members (name, document, status, profile_id)
+                SELECT (:first_names)[1 + floor(random() * cardinality(:first_names))::int] || ' '
+                       || (:last_names)[1 + floor(random() * cardinality(:last_names))::int] || ' '
+                       || (:last_names)[1 + floor(random() * cardinality(:last_names))::int],
+                       'S' || lpad(g::text, 10, '0'),
+                       (ARRAY['pending', 'active', 'inactive', 'canceled'])[1 + floor(random() * 4)::int]::memberstatusenum,
+                       1 + floor(random() * 4)::int
+                FROM generate_series(:first_id, :last_id) AS g
+            """), {
+                "first_names": FIRST_NAMES,
+                "last_names": LAST_NAMES,
+                "first_id": start + offset + 1,
+                "last_id": start + min(offset + batch, total)
+            })
+        print(f"seed: {min(offset + batch, total)}/{total}")
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE members"))
+
+
+def main(args) -> None:
+    if args.seed:
+        seed(args.seed)
+
+    with httpx.Client(base_url=args.base_url, timeout=60) as client:
+        for name, params in SCENARIOS:
+            params = {**params, "limit": args.limit}
+            first_page, next_page = [], []
+            results = 0
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.get(f"{API_PREFIX}/search", params=params)
+                response.raise_for_status()
+                first_page.append(time.perf_counter() - started)
+                body = response.json()
+                results = len(body["members"])
+                if body["next_cursor"]:
+                    started = time.perf_counter()
+                    client.get(f"{API_PREFIX}/search", params={**params, "cursor": body["next_cursor"]}).raise_for_status()
+                    next_page.append(time.perf_counter() - started)
+            report(f"{name} (página 1, {results} resultados)", first_page)
+            report(f"{name} (página 2)", next_page)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--seed", type=int, default=0, help="Quantidade de membros sintéticos a inserir antes de medir")
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--limit", type=int, default=20)
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização da listagem de membros (GET /members).
+
+Compara, no mesmo processo e contra o banco de DATABASE_URL, o caminho anterior
+(entidades ORM -> MemberResponseDTO.from_orm por linha -> MemberListResponseDTO ->
+validação e serialização do response_model pelo FastAPI) com o caminho atual
+(colunas lidas como tuplas -> bytes JSON via pydantic-core, sem validação).
+Mede a página completa (consulta + serialização) e apenas a serialização.
+
+Uso:
+    python benchmarks/serialization_benchmark.py --limit 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from concurrency_benchmark import report
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from app.core.serialization import dump_json  # noqa: E402
+from app.db.database import AsyncSessionLocal  # noqa: E402
+from app.dto.member_dto import MemberListResponseDTO, MemberResponseDTO  # noqa: E402
+from app.models.member import Member  # noqa: E402
+from app.services.member_count_service import CountModeEnum  # noqa: E402
+from app.services.member_service import MemberService  # noqa: E402
+
+RESPONSE_FIELD = create_response_field(name="Response_list_members", type_=MemberListResponseDTO)
+
+
+async def orm_body(members: list, total: int, limit: int) -> bytes:
+    """Caminho anterior: três passagens de validação por membro e jsonable_encoder + json.dumps."""
+    result = {
+        "members": [MemberResponseDTO.from_orm(member) for member in members],
+        "total": total,
+        "skip": 0,
+        "limit": limit,
+        "next_cursor": None,
+        "count_mode": CountModeEnum.estimated
+    }
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=MemberListResponseDTO(**result),
+                                       is_coroutine=True)
+    return JSONResponse(content).body
+
+
+def rows_body(rows: list, total: int, limit: int) -> bytes:
+    """Caminho atual: tuplas de colunas direto para bytes JSON."""
+    return dump_json({
+        "members": [row._asdict() for row in rows],
+        "total": total,
+        "skip": 0,
+        "limit": limit,
+        "next_cursor": None,
+        "count_mode": CountModeEnum.estimated
+    })
+
+
+async def main(args) -> None:
+    async with AsyncSessionLocal() as db:
+        service = MemberService(db)
+        # Começa após membros sem status/nome, que o caminho anterior não consegue validar
+        after_id = await db.scalar(
+            select(Member.id).where(Member.status.is_(None) | Member.name.is_(None)).order_by(Member.id.desc()).limit(1)
+        ) or 0
+        statement = select(Member).where(Member.id > after_id).order_by(Member.id).limit(args.limit)
+
+        orm_total, rows_total, orm_serialize, rows_serialize = [], [], [], []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            members = list((await db.scalars(statement)).all())
+            serialize_started = time.perf_counter()
+            old = await orm_body(members, 0, args.limit)
+            orm_serialize.append(time.perf_counter() - serialize_started)
+            orm_total.append(time.perf_counter() - started)
+            db.expunge_all()
+
+            started = time.perf_counter()
+            rows, _, _, _ = await service.list_members(0, args.limit, after_id, CountModeEnum.estimated)
+            serialize_started = time.perf_counter()
+            new = rows_body(rows, 0, args.limit)
+            rows_serialize.append(time.perf_counter() - serialize_started)
+            rows_total.append(time.perf_counter() - started)
+
+        print(f"{len(rows)} membros por página, corpo {len(new)} bytes, idêntico ao anterior: {old == new}")
+        report("anterior (ORM + DTOs + response_model): página", orm_total)
+        report("anterior (ORM + DTOs + response_model): serialização", orm_serialize)
+        report("atual (colunas + dump_json): página", rows_total)
+        report("atual (colunas + dump_json): serialização", rows_serialize)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Verifica com EXPLAIN se as consultas dos services usam índices.
+
+Executa os caminhos de leitura de MemberService, MemberExportService e
+BulkUpsertService contra o banco de DATABASE_URL, dentro de uma transação
+desfeita no final, e captura cada SELECT emitido. Depois roda EXPLAIN de cada
+um com enable_seqscan = off: se ainda assim o plano tiver Seq Scan, ou um Index
+Scan sem Index Cond (leitura do índice inteiro), nenhum índice atende aos filtros
+da consulta. Como o planner é forçado, o resultado não depende do volume de
+dados do banco usado.
+
+Uso:
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py --verbose
+
+Sai com código 1 se alguma consulta não usar índice.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+from datetime import date, timedelta
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import event, func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession  # noqa: E402
+
+from app.db.database import AsyncSessionLocal, async_engine  # noqa: E402
+from app.dto.member_dto import MemberSearchDTO, NameMatchEnum  # noqa: E402
+from app.dto.performance_dto import RollupDimensionEnum  # noqa: E402
+from app.dto.upsert_data_dto import CompanyUpsertDTO, MemberUpsertDTO  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.member import Member, MemberStatusEnum  # noqa: E402
+from app.services.bulk_upsert_service import BulkUpsertService  # noqa: E402
+from app.services.member_export_service import MemberExportService  # noqa: E402
+from app.services.member_count_service import CountModeEnum  # noqa: E402
+from app.services.member_service import MemberService  # noqa: E402
+from app.services.performance_rollup_service import PerformanceRollupService  # noqa: E402
+from app.services.upsert_normalizer import normalize_company, normalize_member  # noqa: E402
+
+# Tabelas de referência pequenas, lidas inteiras de propósito (e mantidas em cache pela aplicação)
+FULL_SCAN_ALLOWED = {"profiles", "market_segmentation"}
+
+
+def plan_nodes(plan: Dict[str, Any]):
+    """Percorre os nós do plano em profundidade."""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def full_scans(plan: Dict[str, Any]) -> List[str]:
+    """Tabelas lidas por inteiro: Seq Scan ou Index Scan sem condição de índice."""
+    tables = set()
+    for node in plan_nodes(plan):
+        if node["Node Type"] == "Seq Scan" or (
+            node["Node Type"] in ("Index Scan", "Index Only Scan") and "Index Cond" not in node
+        ):
+            tables.add(node["Relation Name"])
+    return sorted(tables - FULL_SCAN_ALLOWED)
+
+
+async def sample_keys(db: AsyncSession) -> Tuple[int, str, int, str]:
+    """IDs e chaves reais do banco (ou valores fictícios se estiver vazio) para montar as consultas."""
+    member_id = await db.scalar(select(func.min(Member.id))) or 1
+    document = await db.scalar(select(Member.document).where(Member.id == member_id)) or "00000000000"
+    company = (await db.execute(select(Company.id, Company.name).order_by(Company.id).limit(1))).first()
+    company_id, company_name = company if company else (1, "Empresa")
+    return member_id, document, company_id, company_name
+
+
+async def exercise(db: AsyncSession, member_id: int, document: str, company_id: int, company_name: str) -> None:
+    """Chama os métodos dos services que consultam o banco."""
+    service = MemberService(db)
+    await service.get_member_by_id(member_id)
+    await service.get_complete_members([member_id, member_id + 1])
+    # O total exato da tabela inteira é sempre uma leitura completa; a estimativa usa pg_class
+    await service.list_members(limit=20, after_id=member_id, count_mode=CountModeEnum.estimated)
+    await service.get_members_by_status(MemberStatusEnum.active.value, limit=20, after_id=member_id)
+    await service.get_members_by_profile(1, limit=20, after_id=member_id)
+    for search in (
+        MemberSearchDTO(name="Mar", match=NameMatchEnum.prefix, status=MemberStatusEnum.active, limit=20),
+        MemberSearchDTO(name="Maria Silva", match=NameMatchEnum.fuzzy, profile_id=1, limit=20),
+        MemberSearchDTO(status=MemberStatusEnum.active, profile_id=1, limit=20)
+    ):
+        await service.search_members(search, after_id=member_id, after_score=0.5)
+
+    export = MemberExportService(db)
+    async for _ in export._batches(MemberStatusEnum.active, 1):
+        break
+
+    rollups = PerformanceRollupService(db)
+    today = date.today()
+    for dimension in RollupDimensionEnum:
+        # O ranking de segmentações agrupa todas as empresas por definição; só a consulta por ID é verificada
+        if dimension != RollupDimensionEnum.market_segmentations:
+            await rollups.rollup(dimension, today - timedelta(days=45), today, limit=20)
+        await rollups.rollup(dimension, today - timedelta(days=45), today, entity_id=1)
+
+    # Caminhos de escrita: os SELECTs de apoio são capturados e tudo é desfeito no final
+    bulk = BulkUpsertService(db)
+    await bulk.upsert_companies([normalize_company(CompanyUpsertDTO(name=company_name))])
+    await bulk.upsert_members([normalize_member(MemberUpsertDTO(name="Plano", document=document))])
+    await bulk.insert_performances([{"company_id": company_id}])
+
+
+async def main(args) -> int:
+    captured: Dict[str, Tuple[str, Any]] = {}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.setdefault(statement, (statement, parameters))
+
+    async with AsyncSessionLocal() as db:
+        keys = await sample_keys(db)
+        event.listen(async_engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await exercise(db, *keys)
+        finally:
+            event.remove(async_engine.sync_engine, "before_cursor_execute", capture)
+
+        connection = await db.connection()
+        await connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        failures = 0
+        for statement, parameters in captured.values():
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            plan = (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+            scanned = full_scans(plan)
+            indexes = sorted({node["Index Name"] for node in plan_nodes(plan) if "Index Name" in node})
+            failures += bool(scanned)
+
+            status = "FALHA" if scanned else "OK"
+            detail = f"leitura completa de {', '.join(scanned)}" if scanned else ", ".join(indexes) or "sem tabelas"
+            sql = " ".join(statement.split())
+            print(f"{status:<6} {detail}\n       {sql if args.verbose else sql[:160]}")
+        await db.rollback()
+
+    print(f"\n{len(captured)} consultas verificadas, {failures} sem índice")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--verbose", action="store_true", help="Mostra o SQL completo de cada consulta")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.models.additional_info import AdditionalInfo
+from app.models.member import Member
+from app.services.bulk_upsert_service import ADDITIONAL_INFO_COLUMNS, MEMBER_COLUMNS, BulkUpsertService
+from app.services.upsert_normalizer import MergePolicyEnum
+
+
+class FakeSavepoint:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        self.db.savepoints += 1
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.db.rollbacks += 1
+        return False
+
+
+class FakeSession:
+    """Sessão mínima: só conta os savepoints abertos e desfeitos."""
+
+    def __init__(self):
+        self.savepoints = 0
+        self.rollbacks = 0
+
+    def begin_nested(self):
+        return FakeSavepoint(self)
+
+
+def build_service(savepoint_size: int):
+    db = FakeSession()
+    return db, BulkUpsertService(db, merge_policy=MergePolicyEnum.last_wins, savepoint_size=savepoint_size)
+
+
+def writer(service, bad_documents):
+    """Simula `_write_members`: conta e registra os criados, falhando nos documentos informados."""
+    async def write(rows):
+        for row in rows:
+            service.created_count["members"] += 1
+            service.created_member_ids.append(int(row["document"]))
+            if row["document"] in bad_documents:
+                raise ValueError("violação de constraint")
+    return write
+
+
+# ==================== SAVEPOINTS ====================
+
+def test_failing_group_is_retried_row_by_row():
+    db, service = build_service(savepoint_size=3)
+    service.created_count["members"] = 0
+    rows = [{"document": str(i), "values": {"name": f"Membro {i}"}} for i in range(7)]
+
+    asyncio.run(service._write_in_savepoints("membro", writer(service, {"4"}), rows))
+
+    assert service.created_count == {"members": 6}
+    assert service.created_member_ids == [0, 1, 2, 3, 5, 6]
+    assert service.errors == ["Erro ao gravar membro 4: violação de constraint"]
+    # 3 grupos + 3 linhas do grupo repetido; desfeitos o grupo e a linha com erro
+    assert db.savepoints == 6
+    assert db.rollbacks == 2
+
+
+def test_single_row_error_uses_name_when_there_is_no_document():
+    db, service = build_service(savepoint_size=10)
+
+    async def write(rows):
+        raise ValueError("falhou")
+
+    asyncio.run(service._write_in_savepoints("empresa", write, [{"document": None, "values": {"name": "Acme"}}]))
+
+    assert service.errors == ["Erro ao gravar empresa Acme: falhou"]
+    assert db.savepoints == 1
+
+
+def test_failed_group_restores_counters_and_previous_errors():
+    db, service = build_service(savepoint_size=2)
+    service.created_count["members"] = 0
+    service.errors.append("erro anterior")
+
+    asyncio.run(service._write_in_savepoints("membro", writer(service, {"0", "1"}), [
+        {"document": "0", "values": {}}, {"document": "1", "values": {}}
+    ]))
+
+    assert service.created_count == {"members": 0}
+    assert service.created_member_ids == []
+    assert service.errors == [
+        "erro anterior",
+        "Erro ao gravar membro 0: violação de constraint",
+        "Erro ao gravar membro 1: violação de constraint",
+    ]
+
+
+def test_without_savepoints_errors_propagate():
+    db, service = build_service(savepoint_size=0)
+    service.created_count["members"] = 0
+
+    with pytest.raises(ValueError):
+        asyncio.run(service._write_in_savepoints("membro", writer(service, {"1"}), [
+            {"document": "0", "values": {}}, {"document": "1", "values": {}}
+        ]))
+    assert db.savepoints == 0
+
+
+# ==================== CONTAGEM ====================
+
+def test_new_document_is_not_counted_as_update():
+    _, service = build_service(savepoint_size=0)
+    entries = {}
+    changed = service._merge_by_document(entries, ["name", "position"], "123", {"name": "Ana"}, None,
+                                         lambda values: {"values": values})
+    assert changed == 0
+    assert entries["123"] == {"values": {"name": "Ana"}}
+
+
+def test_existing_document_counts_only_changed_fields():
+    _, service = build_service(savepoint_size=0)
+    existing = SimpleNamespace(name="Ana", position="CTO", biography="Bio")
+    entries = {}
+    changed = service._merge_by_document(
+        entries, ["name", "position", "biography"], "123",
+        {"name": "Ana", "position": "CEO", "biography": None}, existing, lambda values: {"values": values}
+    )
+    assert changed == 1
+    assert entries["123"]["values"] == {"name": "Ana", "position": "CEO", "biography": "Bio"}
+    assert entries["123"]["existing"] is existing
+    # O registro carregado não é alterado: as mudanças ficam na entrada
+    assert existing.position == "CTO"
+
+
+def test_apply_changes_ignores_nulls_and_equal_values():
+    target = SimpleNamespace(name="Ana", position="CTO")
+    assert BulkUpsertService._apply_changes(target, {"name": "Ana", "position": None}) == 0
+    assert BulkUpsertService._apply_changes(target, {"name": "Ana Maria", "position": "CEO"}) == 2
+    assert (target.name, target.position) == ("Ana Maria", "CEO")
+
+
+def test_full_row_fills_model_defaults():
+    assert BulkUpsertService._full_row(AdditionalInfo, ADDITIONAL_INFO_COLUMNS, {"hobby": "xadrez"}) == {
+        "hobby": "xadrez", "role_duration": None, "children_count": 0
+    }
+    row = BulkUpsertService._full_row(Member, MEMBER_COLUMNS, {"name": "Ana"})
+    assert list(row) == MEMBER_COLUMNS
+    assert row["name"] == "Ana"
@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta, timezone
+
+from app.core.http_cache import conditional_response, etag_matches, make_etag, not_modified_since
+
+UPDATED_AT = datetime(2026, 10, 17, 12, 30, 15, 250000, tzinfo=timezone.utc)
+HTTP_DATE = "Sat, 17 Oct 2026 12:30:15 GMT"
+
+
+def test_etag_is_weak_and_depends_on_every_part():
+    etag = make_etag(1, UPDATED_AT)
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag(1, UPDATED_AT)
+    assert etag != make_etag(1, UPDATED_AT + timedelta(seconds=1))
+    assert etag != make_etag(2, UPDATED_AT)
+
+
+def test_etag_matching_is_weak_and_accepts_lists():
+    etag = make_etag(1)
+    opaque = etag[2:]
+    assert etag_matches(etag, etag)
+    assert etag_matches(opaque, etag)
+    assert etag_matches(f'"other", {opaque}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_not_modified_since_uses_second_resolution():
+    assert not_modified_since(HTTP_DATE, UPDATED_AT)
+    assert not not_modified_since("Sat, 17 Oct 2026 12:30:14 GMT", UPDATED_AT)
+    assert not not_modified_since("not a date", UPDATED_AT)
+    assert not not_modified_since(HTTP_DATE, None)
+
+
+def test_matching_if_none_match_returns_304_with_validators():
+    etag = make_etag(1, UPDATED_AT)
+    response = conditional_response(b"{}", etag, UPDATED_AT, etag, None)
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["ETag"] == etag
+    assert response.headers["Last-Modified"] == HTTP_DATE
+    assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_stale_if_none_match_ignores_if_modified_since():
+    etag = make_etag(1, UPDATED_AT)
+    response = conditional_response(b'{"id":1}', etag, UPDATED_AT, '"stale"', HTTP_DATE)
+    assert response.status_code == 200
+    assert response.body == b'{"id":1}'
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_if_modified_since_alone_returns_304():
+    response = conditional_response(b"{}", make_etag(1), UPDATED_AT, None, HTTP_DATE)
+    assert response.status_code == 304
+
+
+def test_without_body_returns_none_unless_not_modified():
+    etag = make_etag(1)
+    assert conditional_response(None, etag, None, '"stale"', None) is None
+    assert conditional_response(None, etag, None, etag, None).status_code == 304
@@ -0,0 +1,97 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.member import Member
+from app.services import member_count_service
+from app.services.member_count_service import CountModeEnum, MemberCountService
+
+STATEMENT = select(Member.id)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    MemberCountService.invalidate()
+    fake = FakeClock()
+    monkeypatch.setattr(member_count_service, "time", SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(settings, "member_count_cache_ttl", 30)
+    yield fake
+    MemberCountService.invalidate()
+
+
+def build_service(totals, estimate=None):
+    """Service cujo count(*) devolve os valores de `totals` em sequência."""
+    service = MemberCountService(db=None)
+    service.exact_calls = 0
+    remaining = iter(totals)
+
+    async def exact(statement):
+        service.exact_calls += 1
+        return next(remaining)
+
+    async def estimated(statement, key):
+        return estimate
+
+    service._exact = exact
+    service._estimate = estimated
+    return service
+
+
+def count(service, key="all", mode=None):
+    return asyncio.run(service.count(STATEMENT, key, mode))
+
+
+def test_exact_mode_counts_every_time():
+    service = build_service([10, 11])
+    assert count(service, mode=CountModeEnum.exact) == (10, CountModeEnum.exact)
+    assert count(service, mode=CountModeEnum.exact) == (11, CountModeEnum.exact)
+
+
+def test_cached_total_is_reused_until_the_ttl_expires(clock):
+    service = build_service([10, 12])
+    assert count(service, mode=CountModeEnum.cached) == (10, CountModeEnum.cached)
+    clock.now += 29
+    assert count(service, mode=CountModeEnum.cached) == (10, CountModeEnum.cached)
+    clock.now += 1
+    assert count(service, mode=CountModeEnum.cached) == (12, CountModeEnum.cached)
+    assert service.exact_calls == 2
+
+
+def test_cache_is_shared_between_instances_and_kept_per_filter():
+    assert count(build_service([10]), mode=CountModeEnum.cached)[0] == 10
+    assert count(build_service([99]), mode=CountModeEnum.cached)[0] == 10
+    assert count(build_service([3]), key=("status", "active"), mode=CountModeEnum.cached)[0] == 3
+
+
+def test_invalidate_forces_a_new_count():
+    service = build_service([10, 11])
+    count(service, mode=CountModeEnum.cached)
+    MemberCountService.invalidate()
+    assert count(service, mode=CountModeEnum.cached)[0] == 11
+
+
+def test_estimated_mode_falls_back_to_cached_count_without_statistics():
+    assert count(build_service([], estimate=1_000_000), mode=CountModeEnum.estimated) == (
+        1_000_000, CountModeEnum.estimated
+    )
+    service = build_service([42, 43], estimate=None)
+    assert count(service, mode=CountModeEnum.estimated) == (42, CountModeEnum.cached)
+    assert count(service, mode=CountModeEnum.estimated) == (42, CountModeEnum.cached)
+
+
+def test_mode_defaults_to_settings(monkeypatch):
+    monkeypatch.setattr(settings, "member_count_mode", "cached")
+    service = build_service([10, 11])
+    count(service)
+    assert count(service) == (10, CountModeEnum.cached)
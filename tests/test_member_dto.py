@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from app.dto.member_dto import MemberCompleteResponseDTO, MemberResponseDTO
+from app.models.member import Member, MemberStatusEnum
+
+
+def member_without_document():
+    return Member(
+        id=1, name=None, document=None, status=MemberStatusEnum.active,
+        created_at=datetime(2026, 10, 17, tzinfo=timezone.utc)
+    )
+
+
+def test_member_without_document_or_name_is_serialized():
+    dto = MemberResponseDTO.from_orm(member_without_document())
+    assert (dto.document, dto.name) == (None, None)
+    assert '"document":null' in dto.model_dump_json()
+
+
+def test_complete_member_without_document_is_serialized():
+    dto = MemberCompleteResponseDTO.from_orm(member_without_document())
+    assert dto.document is None
+    assert dto.companies == [] and dto.contact_channels == []
+
+
+def test_schema_declares_document_and_name_nullable():
+    properties = MemberResponseDTO.model_json_schema()["properties"]
+    for field in ("name", "document"):
+        assert {"type": "null"} in properties[field]["anyOf"]
@@ -0,0 +1,112 @@
+import asyncio
+
+from app.dto.upsert_data_dto import MemberUpsertDTO
+from app.services import member_import_service
+from app.services.member_import_service import ImportEntityEnum, MemberImportService, iter_ndjson_lines
+
+
+async def chunked(*parts: bytes):
+    for part in parts:
+        yield part
+
+
+def read_lines(*parts: bytes):
+    async def collect():
+        return [item async for item in iter_ndjson_lines(chunked(*parts))]
+    return asyncio.run(collect())
+
+
+def test_lines_split_across_chunks_are_joined():
+    assert read_lines(b'{"name": "A', b'na"}\n{"na', b'me": "Bia"}\n') == [
+        (1, b'{"name": "Ana"}'), (2, b'{"name": "Bia"}')
+    ]
+
+
+def test_last_line_without_newline_is_read():
+    assert read_lines(b'{"name": "Ana"}\n{"name": "Bia"}') == [(1, b'{"name": "Ana"}'), (2, b'{"name": "Bia"}')]
+
+
+def test_blank_lines_are_skipped_but_counted():
+    lines = read_lines(b'\n{"name": "Ana"}\n  \n\n{"name": "Bia"}\n\n')
+    assert [number for number, _ in lines] == [2, 5]
+
+
+def test_crlf_lines_keep_numbering_and_parse():
+    lines = read_lines(b'{"name": "Ana"}\r\n\r', b'\n{"name": "Bia"}\r\n')
+    assert [number for number, _ in lines] == [1, 3]
+    assert [MemberUpsertDTO.model_validate_json(line).name for _, line in lines] == ["Ana", "Bia"]
+
+
+def test_empty_body_yields_nothing():
+    assert read_lines() == []
+    assert read_lines(b"", b"\n\n") == []
+
+
+# ==================== IMPORTAÇÃO ====================
+
+class FakeSession:
+    def __init__(self, log):
+        self.log = log
+
+    async def __aenter__(self):
+        self.log.append("open")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.log.append("close")
+        return False
+
+    async def commit(self):
+        self.log.append("commit")
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+class FakeBulkUpsertService:
+    """Conta os membros gravados; o documento "999" faz o chunk inteiro falhar."""
+
+    def __init__(self, db):
+        self.created_count, self.updated_count, self.errors = {}, {}, []
+
+    async def upsert_members(self, rows):
+        if any(row["document"] == "999" for row in rows):
+            raise ValueError("violação de constraint")
+        self.created_count["members"] = len(rows)
+        self.updated_count["members"] = 0
+        self.errors.append("Profile ID 7 não existe")
+
+
+def run_import(monkeypatch, body: bytes, chunk_size: int):
+    monkeypatch.setattr(member_import_service, "BulkUpsertService", FakeBulkUpsertService)
+    log = []
+    service = MemberImportService(lambda: FakeSession(log))
+    result = asyncio.run(service.import_ndjson(chunked(body), ImportEntityEnum.members, chunk_size))
+    return result, log
+
+
+def test_each_chunk_is_written_in_its_own_short_session(monkeypatch):
+    body = b"".join(b'{"name": "M%d", "document": "%d"}\n' % (i, i) for i in range(1, 6))
+    result, log = run_import(monkeypatch, body, chunk_size=2)
+    assert log == ["open", "commit", "close"] * 3
+    assert {key: result[key] for key in ("lines", "records", "created", "chunks", "failed_chunks")} == {
+        "lines": 5, "records": 5, "created": 5, "chunks": 3, "failed_chunks": 0
+    }
+    assert result["errors"][0] == "Linhas 1-2: Profile ID 7 não existe"
+
+
+def test_failed_chunk_is_rolled_back_and_reported(monkeypatch):
+    body = b'{"document": "1"}\n{"document": "2"}\n{"document": "999"}\n{"document": "3"}\n{"document": "4"}\n'
+    result, log = run_import(monkeypatch, body, chunk_size=2)
+    assert log == ["open", "commit", "close", "open", "rollback", "close", "open", "commit", "close"]
+    assert (result["created"], result["failed_chunks"]) == (3, 1)
+    assert "Linhas 3-4: Erro ao aplicar chunk: violação de constraint" in result["errors"]
+    assert "chunk" not in result
+
+
+def test_invalid_lines_do_not_open_sessions_and_errors_are_capped(monkeypatch):
+    monkeypatch.setattr(member_import_service, "MAX_IMPORT_ERRORS", 3)
+    result, log = run_import(monkeypatch, b'{"status": "unknown"}\n' * 5, chunk_size=2)
+    assert log == []
+    assert (result["invalid"], result["chunks"], result["error_count"]) == (5, 3, 5)
+    assert [message.split(":")[0] for message in result["errors"]] == ["Linha 1", "Linha 2", "Linha 3"]
@@ -0,0 +1,30 @@
+import pytest
+
+from app.core.pagination import decode_cursor, decode_score_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(1234)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == 1234
+
+
+def test_score_cursor_round_trip():
+    cursor = encode_cursor(42, 0.875)
+    assert decode_score_cursor(cursor) == (42, 0.875)
+    assert decode_cursor(cursor) == 42
+
+
+def test_no_last_id_means_no_next_page():
+    assert encode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(-1), "eyJmb28iOjF9"])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_score_cursor_requires_score():
+    with pytest.raises(ValueError):
+        decode_score_cursor(encode_cursor(42))
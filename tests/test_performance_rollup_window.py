@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select, text
+
+from app.models.performance_rollup import PerformanceRollup, PerformanceRollupGrainEnum
+from app.services.performance_rollup_service import _next_month, _window_filter
+
+FIRST_DAY = date(2025, 12, 1)
+LAST_DAY = date(2026, 5, 31)
+
+
+@pytest.fixture(scope="module")
+def buckets():
+    """Buckets diários e mensais de dez/2025 a mai/2026 em um SQLite, para avaliar o filtro."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE performance_rollups (grain VARCHAR, period_start DATE)"))
+        rows = []
+        day = FIRST_DAY
+        while day <= LAST_DAY:
+            rows.append({"grain": "day", "period_start": day.isoformat()})
+            if day.day == 1:
+                rows.append({"grain": "month", "period_start": day.isoformat()})
+            day += timedelta(days=1)
+        connection.execute(text("INSERT INTO performance_rollups VALUES (:grain, :period_start)"), rows)
+    return engine
+
+
+def selected(buckets, start_date, end_date):
+    statement = select(PerformanceRollup.grain, PerformanceRollup.period_start).where(
+        _window_filter(start_date, end_date)
+    )
+    with buckets.connect() as connection:
+        return connection.execute(statement).all()
+
+
+def covered_days(rows):
+    """Dias cobertos pelos buckets selecionados; um dia contado duas vezes aparece repetido."""
+    days = []
+    for grain, period_start in rows:
+        end = _next_month(period_start) if grain == PerformanceRollupGrainEnum.month else period_start + timedelta(days=1)
+        days.extend(period_start + timedelta(days=offset) for offset in range((end - period_start).days))
+    return sorted(days)
+
+
+def days_between(start_date, end_date):
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+@pytest.mark.parametrize("start_date, end_date, months, days", [
+    # Mesmo mês, sem mês inteiro: só buckets diários
+    (date(2026, 3, 10), date(2026, 3, 20), 0, 11),
+    (date(2026, 3, 1), date(2026, 3, 30), 0, 30),
+    # Mês inteiro: um único bucket mensal
+    (date(2026, 3, 1), date(2026, 3, 31), 1, 0),
+    # Virada do mês anterior: fim de fevereiro pelos dias, março inteiro pelo mês
+    (date(2026, 2, 15), date(2026, 3, 31), 1, 14),
+    (date(2026, 2, 28), date(2026, 3, 1), 0, 2),
+    (date(2025, 12, 31), date(2026, 1, 31), 1, 1),
+    # Início no meio do mês e fim no meio de outro
+    (date(2026, 1, 15), date(2026, 4, 10), 2, 17 + 10),
+])
+def test_bounded_window_covers_each_day_once(buckets, start_date, end_date, months, days):
+    rows = selected(buckets, start_date, end_date)
+    grains = [grain for grain, _ in rows]
+    assert grains.count(PerformanceRollupGrainEnum.month) == months
+    assert grains.count(PerformanceRollupGrainEnum.day) == days
+    assert covered_days(rows) == days_between(start_date, end_date)
+
+
+def test_since_mid_month_reads_days_then_whole_months(buckets):
+    rows = selected(buckets, date(2026, 3, 15), None)
+    assert covered_days(rows) == days_between(date(2026, 3, 15), LAST_DAY)
+    assert {period_start for grain, period_start in rows if grain == PerformanceRollupGrainEnum.day} == set(
+        days_between(date(2026, 3, 15), date(2026, 3, 31))
+    )
+
+
+def test_since_first_day_reads_only_months(buckets):
+    rows = selected(buckets, date(2026, 3, 1), None)
+    assert {grain for grain, _ in rows} == {PerformanceRollupGrainEnum.month}
+    assert covered_days(rows) == days_between(date(2026, 3, 1), LAST_DAY)
+
+
+def test_until_mid_month_reads_months_then_days(buckets):
+    rows = selected(buckets, None, date(2026, 2, 10))
+    assert covered_days(rows) == days_between(FIRST_DAY, date(2026, 2, 10))
+    assert sum(grain == PerformanceRollupGrainEnum.day for grain, _ in rows) == 10
+
+
+def test_without_dates_reads_every_month(buckets):
+    rows = selected(buckets, None, None)
+    assert len(rows) == 6
+    assert covered_days(rows) == days_between(FIRST_DAY, LAST_DAY)
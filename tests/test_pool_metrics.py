@@ -0,0 +1,67 @@
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from app.db.pool_metrics import PoolMetrics
+
+
+def build_engine(connect_delay: float = 0.0, pool_size: int = 1):
+    def creator():
+        time.sleep(connect_delay)
+        return sqlite3.connect(":memory:", check_same_thread=False)
+
+    engine = create_engine("sqlite://", creator=creator, poolclass=QueuePool, pool_size=pool_size, max_overflow=0)
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+    return engine, metrics
+
+
+def test_counts_connections_in_use():
+    engine, metrics = build_engine(pool_size=2)
+    first, second = engine.connect(), engine.connect()
+    assert (metrics.in_use, metrics.peak_in_use) == (2, 2)
+    first.close()
+    second.close()
+    with engine.connect():
+        pass
+    snapshot = metrics.snapshot()
+    assert (snapshot["in_use"], snapshot["peak_in_use"]) == (0, 2)
+    assert (snapshot["checkouts"], snapshot["connects"]) == (3, 2)
+    # Sem `measure_checkout`, nenhum checkout entra nas amostras de espera
+    assert snapshot["checkout_wait_ms"]["samples"] == 0
+
+
+def test_wait_excludes_opening_a_new_connection():
+    engine, metrics = build_engine(connect_delay=0.2)
+    with metrics.measure_checkout():
+        engine.connect().close()
+    assert metrics.connects == 1
+    assert len(metrics._waits) == 1
+    assert metrics.max_wait < 0.1
+
+
+def test_wait_measures_time_blocked_on_the_pool():
+    engine, metrics = build_engine()
+    held = engine.connect()
+    threading.Timer(0.2, held.close).start()
+    with metrics.measure_checkout():
+        engine.connect().close()
+    assert 0.15 < metrics.max_wait < 1
+    # Só o primeiro checkout do bloco é medido
+    with metrics.measure_checkout():
+        engine.connect().close()
+        engine.connect().close()
+    assert len(metrics._waits) == 2
+
+
+def test_snapshot_summarizes_recent_waits():
+    metrics = PoolMetrics(window=10)
+    for ms in range(1, 21):
+        metrics.record_wait(ms / 1000)
+    waits = metrics.snapshot()["checkout_wait_ms"]
+    # A janela guarda só as últimas amostras; máximo e total cobrem todas
+    assert waits == {"samples": 10, "mean": 15.5, "p95": 20.0, "max": 20.0, "total": 210.0}
+    assert metrics.snapshot()["pool"] is None
@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import reference_cache
+from app.services.reference_cache import (
+    MARKET_SEGMENTATIONS,
+    PROFILES,
+    ReferenceCache,
+    invalidate_reference_cache,
+)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Responde às consultas do cache com as linhas atuais de cada tabela."""
+
+    def __init__(self, tables, on_execute=None):
+        self.tables = tables
+        self.on_execute = on_execute
+        self.reads = []
+
+    async def execute(self, statement):
+        table = next(name for name, query in reference_cache._QUERIES.items() if query is statement)
+        self.reads.append(table)
+        rows = [SimpleNamespace(id=value) for value in self.tables[table]]
+        if self.on_execute:
+            self.on_execute()
+        return FakeResult(rows)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    invalidate_reference_cache()
+    fake = FakeClock()
+    monkeypatch.setattr(reference_cache, "time", SimpleNamespace(monotonic=fake.monotonic))
+    monkeypatch.setattr(settings, "reference_cache_ttl", 60)
+    yield fake
+    invalidate_reference_cache()
+
+
+def existing_profiles(db, ids):
+    return asyncio.run(ReferenceCache(db).existing_profile_ids(ids))
+
+
+def test_rows_are_reused_until_the_ttl_expires(clock):
+    db = FakeSession({PROFILES: [1, 2]})
+    assert existing_profiles(db, {1}) == {1}
+    db.tables[PROFILES] = [1, 3]
+    clock.now += 59
+    # Ainda em cache: o 2 removido continua aceito
+    assert existing_profiles(db, {2}) == {2}
+    assert db.reads == [PROFILES]
+    clock.now += 1
+    assert existing_profiles(db, {1, 3}) == {1, 3}
+    assert db.reads == [PROFILES, PROFILES]
+
+
+def test_unknown_id_forces_one_reload():
+    db = FakeSession({PROFILES: [1]})
+    assert existing_profiles(db, {1}) == {1}
+    # Criado por outro worker depois da leitura em cache
+    db.tables[PROFILES] = [1, 3]
+    assert existing_profiles(db, {1, 3}) == {1, 3}
+    assert existing_profiles(db, {3}) == {3}
+    assert existing_profiles(db, {1, 9}) == {1}
+    assert db.reads == [PROFILES, PROFILES, PROFILES]
+
+
+def test_empty_ids_are_ignored():
+    db = FakeSession({PROFILES: [1]})
+    assert existing_profiles(db, {None, 0, 1}) == {1}
+    assert db.reads == [PROFILES]
+
+
+def test_invalidation_is_per_table():
+    db = FakeSession({PROFILES: [1], MARKET_SEGMENTATIONS: [5]})
+    cache = ReferenceCache(db)
+    asyncio.run(cache.market_segmentations())
+    existing_profiles(db, {1})
+    invalidate_reference_cache(MARKET_SEGMENTATIONS)
+    asyncio.run(cache.market_segmentations())
+    existing_profiles(db, {1})
+    assert db.reads == [MARKET_SEGMENTATIONS, PROFILES, MARKET_SEGMENTATIONS]
+    invalidate_reference_cache()
+    existing_profiles(db, {1})
+    assert db.reads[-1] == PROFILES
+
+
+def test_read_racing_an_invalidation_is_not_cached():
+    db = FakeSession({PROFILES: [1]}, on_execute=invalidate_reference_cache)
+    assert existing_profiles(db, {1}) == {1}
+    db.on_execute = None
+    existing_profiles(db, {1})
+    assert db.reads == [PROFILES, PROFILES]
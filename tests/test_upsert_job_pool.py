@@ -0,0 +1,169 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import upsert_job_service
+from app.services.upsert_job_service import UpsertJobService, UpsertJobWorkerPool
+
+
+class FakeSession:
+    """Sessão falsa: o pool só a usa como context manager assíncrono."""
+
+    async def __aenter__(self):
+        return None
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeJobService:
+    """Fila de jobs em memória no lugar da tabela upsert_jobs."""
+    queue: list = []
+    processed: list = []
+    heartbeats: list = []
+    run_seconds: float = 0
+
+    def __init__(self, db):
+        self.db = db
+
+    async def claim_next_job(self):
+        return self.queue.pop(0) if self.queue else None
+
+    async def run_job(self, job_id):
+        await asyncio.sleep(self.run_seconds)
+        self.processed.append(job_id)
+
+    async def heartbeat(self, job_id):
+        self.heartbeats.append(job_id)
+
+
+def test_pool_survives_idle_polls_and_processes_job(monkeypatch):
+    monkeypatch.setattr(upsert_job_service, "UpsertJobService", FakeJobService)
+    monkeypatch.setattr(FakeJobService, "queue", [])
+    monkeypatch.setattr(FakeJobService, "processed", [])
+    # Construído fora do loop, como o pool do módulo (importado antes do loop do worker do gunicorn)
+    pool = UpsertJobWorkerPool(FakeSession, size=2, poll_interval=0.05)
+
+    async def scenario():
+        pool.start()
+        await asyncio.sleep(0.2)  # várias esperas ociosas que terminam por timeout
+        assert not any(task.done() for task in pool._tasks)
+
+        FakeJobService.queue.append("job-1")
+        pool.notify()
+        for _ in range(100):
+            if FakeJobService.processed:
+                break
+            await asyncio.sleep(0.01)
+        await pool.stop()
+
+    asyncio.run(scenario())
+    assert FakeJobService.processed == ["job-1"]
+
+
+def test_notify_before_start_is_ignored():
+    pool = UpsertJobWorkerPool(FakeSession, size=1, poll_interval=0.05)
+    pool.notify()
+
+
+def test_heartbeat_runs_while_job_is_processed(monkeypatch):
+    monkeypatch.setattr(upsert_job_service, "UpsertJobService", FakeJobService)
+    monkeypatch.setattr(FakeJobService, "queue", ["job-1"])
+    monkeypatch.setattr(FakeJobService, "processed", [])
+    monkeypatch.setattr(FakeJobService, "heartbeats", [])
+    monkeypatch.setattr(FakeJobService, "run_seconds", 0.2)
+    pool = UpsertJobWorkerPool(FakeSession, size=1, poll_interval=0.05, heartbeat_interval=0.03)
+
+    async def scenario():
+        pool.start()
+        for _ in range(100):
+            if FakeJobService.processed:
+                break
+            await asyncio.sleep(0.01)
+        beats = len(FakeJobService.heartbeats)
+        await asyncio.sleep(0.1)
+        await pool.stop()
+        return beats
+
+    beats = asyncio.run(scenario())
+    # Um chunk de 0,2 s sem commit ainda renova o heartbeat; terminado o job, os heartbeats param
+    assert FakeJobService.processed == ["job-1"]
+    assert beats >= 3
+    assert len(FakeJobService.heartbeats) == beats
+
+
+class FakeBulkUpsertService:
+    """Bulk upsert falso que só contabiliza os registros recebidos."""
+
+    def __init__(self, db):
+        self.processed_company_ids = []
+        self.created_count = {}
+        self.updated_count = {}
+        self.errors = []
+
+    async def upsert_companies(self, items):
+        self.created_count = {"companies": len(items)}
+
+
+class FakeJobDb:
+    """Sessão falsa de run_job: o compare-and-set do progresso responde com `advanced`."""
+
+    def __init__(self, job, advanced):
+        self.job = job
+        self.advanced = advanced
+        self.advances = []
+        self.calls = []
+
+    async def get(self, model, job_id):
+        return self.job
+
+    async def scalar(self, statement):
+        self.advances.append(statement.compile().params)
+        return self.job.id if self.advanced else None
+
+    async def execute(self, statement):
+        self.calls.append("execute")
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+
+def _job(processed_chunks=0):
+    return SimpleNamespace(
+        id="job-1",
+        payload={"companies": [{"name": "Empresa A"}, {"name": "Empresa B"}]},
+        chunk_size=1,
+        processed_chunks=processed_chunks,
+        failed_chunks=0,
+        created_count={},
+        updated_count={},
+        errors=[],
+        company_ids=[]
+    )
+
+
+def test_run_job_advances_progress_with_compare_and_set(monkeypatch):
+    monkeypatch.setattr(upsert_job_service, "BulkUpsertService", FakeBulkUpsertService)
+    db = FakeJobDb(_job(), advanced=True)
+
+    asyncio.run(UpsertJobService(db).run_job("job-1"))
+
+    expected = [params["processed_chunks_1"] for params in db.advances]
+    assert expected == [0, 1, 2]
+    assert db.advances[0]["processed_chunks"] == 1
+    assert db.advances[1]["created_count"] == {"companies": 2}
+    assert db.advances[2]["status"] == "completed"
+    assert db.calls == ["commit", "commit", "commit"]
+
+
+def test_run_job_discards_chunk_already_written_by_another_worker(monkeypatch):
+    monkeypatch.setattr(upsert_job_service, "BulkUpsertService", FakeBulkUpsertService)
+    db = FakeJobDb(_job(processed_chunks=1), advanced=False)
+
+    asyncio.run(UpsertJobService(db).run_job("job-1"))
+
+    # O chunk 1 foi gravado por quem retomou o job: desfaz e não marca o job como concluído nem falho
+    assert [params["processed_chunks_1"] for params in db.advances] == [1]
+    assert db.calls == ["rollback"]
@@ -0,0 +1,169 @@
+import pytest
+
+from app.dto.upsert_data_dto import CompanyUpsertDTO, MemberUpsertDTO, PerformanceUpsertDTO, UpsertDataRequestDTO
+from app.models.address import StateEnum
+from app.services.upsert_normalizer import (
+    MergePolicyEnum,
+    address_hash,
+    address_row,
+    deduplicate_rows,
+    normalize_company,
+    normalize_member,
+    normalize_payload,
+    normalize_performance,
+)
+
+OFFICE = {"street": "Av. Paulista", "number": "1000", "city": "São Paulo", "state": "SP", "postal_code": "01310-100"}
+
+
+def member_row(**fields):
+    return normalize_member(MemberUpsertDTO(**fields))
+
+
+# ==================== NORMALIZAÇÃO ====================
+
+def test_member_row_has_only_informed_fields():
+    row = member_row(
+        name="Ana", document=" 123 ", position=None,
+        address=OFFICE, additional_info={"hobby": "xadrez"},
+        contact_channels=[{"type": "email", "content": "ana@example.com"}]
+    )
+    assert row["values"] == {"name": "Ana", "document": "123", "position": None}
+    assert row["document"] == "123"
+    assert row["address"]["street"] == "Av. Paulista"
+    assert "country" not in row["address"]
+    assert row["additional_info"] == {"hobby": "xadrez"}
+    assert row["contact_channels"][0]["content"] == "ana@example.com"
+
+
+@pytest.mark.parametrize("document", ["string", "0", "  ", ""])
+def test_document_placeholders_are_dropped(document):
+    row = member_row(name="Ana", document=document)
+    assert row["document"] is None
+    assert row["values"]["document"] is None
+
+
+def test_empty_records_are_discarded():
+    assert member_row() is None
+    assert member_row(name=None, address={}, additional_info={}, contact_channels=[{}]) is None
+    assert normalize_company(CompanyUpsertDTO(address={})) is None
+    assert normalize_performance(PerformanceUpsertDTO()) is None
+
+
+def test_company_with_only_address_is_kept():
+    row = normalize_company(CompanyUpsertDTO(address=OFFICE))
+    assert row == {"values": {}, "document": None, "address": OFFICE}
+
+
+def test_company_document_placeholder_is_normalized():
+    row = normalize_company(CompanyUpsertDTO(name="Acme", document="STRING"))
+    assert row["document"] is None
+    assert row["values"] == {"name": "Acme", "document": None}
+
+
+def test_member_without_non_empty_channels_keeps_stored_channels():
+    for channels in ([], [{}], [{"type": None, "content": None}, {}]):
+        assert member_row(name="Ana", document="123", contact_channels=channels)["contact_channels"] is None
+    assert member_row(name="Ana", document="123")["contact_channels"] is None
+
+
+def test_member_channels_drop_blank_entries():
+    row = member_row(document="123", contact_channels=[{}, {"type": "email", "content": "ana@example.com"}])
+    assert [channel["content"] for channel in row["contact_channels"]] == ["ana@example.com"]
+
+
+def test_payload_leaves_out_entities_without_records():
+    payload = normalize_payload(UpsertDataRequestDTO(members=[{}, {"name": "Ana"}], companies=[{}], performances=[]))
+    assert list(payload) == ["members"]
+    assert len(payload["members"]) == 1
+
+
+# ==================== ENDEREÇOS ====================
+
+def test_address_hash_ignores_spacing_case_and_postal_code_format():
+    variant = {**OFFICE, "street": "  av.  PAULISTA ", "postal_code": "01310100", "state": StateEnum.SP}
+    assert address_hash(variant) == address_hash(OFFICE)
+
+
+def test_address_hash_applies_dto_defaults():
+    assert address_hash({**OFFICE, "country": "Brazil"}) == address_hash(OFFICE)
+    assert address_hash({**OFFICE, "country": "Portugal"}) != address_hash(OFFICE)
+
+
+def test_address_hash_distinguishes_content():
+    assert address_hash({**OFFICE, "number": "2000"}) != address_hash(OFFICE)
+    assert address_hash({**OFFICE, "complement": "Sala 1"}) != address_hash(OFFICE)
+
+
+def test_address_row_has_every_column_and_the_hash():
+    row = address_row(OFFICE)
+    assert row["country"] == "Brazil"
+    assert row["complement"] is None
+    assert row["content_hash"] == address_hash(OFFICE)
+
+
+# ==================== DUPLICATAS ====================
+
+def duplicated_members():
+    return [
+        member_row(document="123", name="Ana", position="CTO",
+                   contact_channels=[{"type": "email", "content": "ana@example.com"}]),
+        member_row(name="Sem CPF"),
+        member_row(document="123", name=None, biography="Bio", address=OFFICE,
+                   contact_channels=[{"type": "email", "content": "ana@example.com"}, {"type": "phone", "content": "1"}]),
+        member_row(name="Sem CPF"),
+        member_row(document="123", name="Ana Maria", position=None),
+    ]
+
+
+def test_last_wins_keeps_last_occurrence_at_first_position():
+    unique, messages = deduplicate_rows("members", duplicated_members(), MergePolicyEnum.last_wins)
+    assert [row["values"].get("name") for row in unique] == ["Ana Maria", "Sem CPF", "Sem CPF"]
+    assert messages == [
+        "Registro duplicado no payload: membro com CPF 123 (3 ocorrências), combinado pela política last_wins"
+    ]
+
+
+def test_first_wins_keeps_first_occurrence():
+    unique, messages = deduplicate_rows("members", duplicated_members(), MergePolicyEnum.first_wins)
+    assert unique[0]["values"] == {"document": "123", "name": "Ana", "position": "CTO"}
+    assert len(unique) == 3
+    assert len(messages) == 1
+
+
+def test_coalesce_merges_fields_and_unions_channels():
+    rows = duplicated_members()
+    unique, _ = deduplicate_rows("members", rows, MergePolicyEnum.coalesce)
+    merged = unique[0]
+    assert merged["values"] == {"document": "123", "name": "Ana Maria", "position": "CTO", "biography": "Bio"}
+    assert merged["address"] == OFFICE
+    assert [channel["type"].value for channel in merged["contact_channels"]] == ["email", "phone"]
+    # As linhas recebidas não são alteradas
+    assert rows[0]["values"] == {"document": "123", "name": "Ana", "position": "CTO"}
+
+
+def test_coalesce_takes_channels_from_later_occurrence_when_first_has_none():
+    rows = [member_row(document="123", name="Ana"),
+            member_row(document="123", contact_channels=[{"type": "phone", "content": "1"}])]
+    unique, _ = deduplicate_rows("members", rows, MergePolicyEnum.coalesce)
+    assert [channel["content"] for channel in unique[0]["contact_channels"]] == ["1"]
+
+
+def test_companies_merge_on_document_then_on_normalized_name():
+    rows = [normalize_company(CompanyUpsertDTO(**fields)) for fields in (
+        {"name": "Acme", "document": "111"},
+        {"name": "Outra", "document": "111"},
+        {"name": "Acme "},
+        {"name": "acme"},
+        {"name": "ACME  Ltda"},
+        {"name": "Acme Ltda"},
+    )]
+    unique, messages = deduplicate_rows("companies", rows, MergePolicyEnum.first_wins)
+    assert [row["values"]["name"] for row in unique] == ["Acme", "Acme ", "ACME  Ltda"]
+    assert len(messages) == 3
+    assert "empresa com CNPJ 111 (2 ocorrências)" in messages[0]
+
+
+def test_performances_are_not_deduplicated():
+    rows = [{"count_closed_deals": 1}, {"count_closed_deals": 1}]
+    assert deduplicate_rows("performances", rows, MergePolicyEnum.coalesce) == (rows, [])